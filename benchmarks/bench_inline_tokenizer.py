@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark the inline Markdown tokenizer used by
+re_research_2025/scripts/generate_manuscript_docx.py against the previous
+nested re.split implementation on a synthetic ~50k-word manuscript.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DOCX_SCRIPTS = PROJECT_ROOT / "re_research_2025" / "scripts"
+MANUSCRIPT = PROJECT_ROOT / "re_research_2025" / "manuscript_v2.md"
+
+sys.path.insert(0, str(DOCX_SCRIPTS))
+
+from generate_manuscript_docx import add_runs, tokenize_inline  # noqa: E402
+
+
+def legacy_parse(text: str) -> list[tuple[str, str]]:
+    """The triple-nested split that tokenize_inline replaced."""
+    runs: list[tuple[str, str]] = []
+    patterns = r'(\[\d+(?:,\s*\d+)*\])'
+    for part in re.split(patterns, text):
+        if re.match(patterns, part):
+            runs.append(("cite", part.strip('[]')))
+            continue
+        for subpart in re.split(r'(\*\*.+?\*\*)', part):
+            if subpart.startswith('**') and subpart.endswith('**'):
+                runs.append(("bold", subpart.strip('*')))
+                continue
+            for subsubpart in re.split(r'(\*.+?\*)', subpart):
+                if subsubpart.startswith('*') and subsubpart.endswith('*'):
+                    runs.append(("italic", subsubpart.strip('*')))
+                else:
+                    runs.append(("text", subsubpart))
+    return runs
+
+
+def build_corpus(target_words: int) -> list[str]:
+    """Repeat the manuscript's prose paragraphs until target_words is reached."""
+    seed_lines = [
+        line.strip()
+        for line in MANUSCRIPT.read_text(encoding="utf-8").splitlines()
+        if line.strip() and not line.startswith("#")
+    ]
+    seed_lines.append(
+        "Folate [1, 2] and **one-carbon *methyl donors* [3]** modulate ***DNMT1*** activity [4]."
+    )
+    lines: list[str] = []
+    words = 0
+    while words < target_words:
+        for line in seed_lines:
+            lines.append(line)
+            words += len(line.split())
+            if words >= target_words:
+                break
+    return lines
+
+
+def build_dense_corpus(target_words: int) -> list[str]:
+    """Long, citation- and emphasis-heavy paragraphs (~2k words each)."""
+    sentence = "Folate [1, 2] and **one-carbon *methyl donors* [3]** modulate *DNMT1* activity [4]. "
+    paragraph = sentence * 150
+    per_paragraph = len(paragraph.split())
+    return [paragraph] * max(1, target_words // per_paragraph)
+
+
+def best_of(repeats: int, func, lines: list[str]) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for line in lines:
+            func(line)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--words", type=int, default=50_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--docx", action="store_true", help="Also time emitting runs into a python-docx document")
+    args = parser.parse_args()
+
+    lines = build_corpus(args.words)
+
+    for label, corpus in (("manuscript prose", lines), ("markup-dense", build_dense_corpus(args.words))):
+        words = sum(len(line.split()) for line in corpus)
+        legacy = best_of(args.repeats, legacy_parse, corpus)
+        tokenizer = best_of(args.repeats, tokenize_inline, corpus)
+
+        print(f"Corpus ({label}): {words} words in {len(corpus)} paragraphs")
+        print(f"  legacy re.split     : {legacy * 1000:8.1f} ms")
+        print(f"  tokenize_inline     : {tokenizer * 1000:8.1f} ms  ({legacy / tokenizer:.1f}x)")
+
+    if args.docx:
+        from docx import Document
+
+        doc = Document()
+        start = time.perf_counter()
+        for line in lines:
+            add_runs(doc.add_paragraph(), tokenize_inline(line))
+        print(f"tokenize + add_runs (prose): {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
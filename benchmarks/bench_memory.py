@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+
+"""
+Peak RSS of the extraction path: per-row dicts versus StudyRecord tuples.
+
+A synthetic corpus is written to a temporary raw store, then each variant
+runs in a fresh interpreter that streams the store through its tree's
+extract_epigenetic_data and keeps every extracted row, as main() and the
+downstream stages do:
+
+- dicts:   scripts/ exported from BASELINE_REV (git archive), the last
+           revision whose extractor returned one dict per row
+- records: this tree, StudyRecord tuples with interned year/journal/
+           publication types
+
+Only the extracted rows are compact. The fetch path (ESummary records,
+EFetch abstracts, the raw store and the screening step) still passes one
+dict per article, and both variants read the store as dicts.
+
+    python benchmarks/bench_memory.py --size 100k
+
+Peak RSS comes from getrusage, so this runs on Linux and macOS only.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tarfile
+import tempfile
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+VARIANTS = ["dicts", "records"]
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+# Parent of the commit that introduced StudyRecord
+BASELINE_REV = "5eaa29c~1"
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def export_scripts(revision: str, destination: Path) -> Path:
+    """scripts/ as of revision, extracted under destination."""
+    archive = destination / "baseline.tar"
+    with archive.open("wb") as handle:
+        subprocess.run(["git", "archive", revision, "scripts"], cwd=PROJECT_ROOT, stdout=handle, check=True)
+    with tarfile.open(archive) as tar:
+        tar.extractall(destination)
+    return destination / "scripts"
+
+
+def run_variant(scripts: Path, store: Path) -> dict[str, float]:
+    """Runs in the child interpreter, with scripts/ of the variant's tree first on sys.path."""
+    import gc
+
+    sys.path.insert(0, str(scripts))
+    import fetch_pubmed_data
+    import raw_store
+
+    baseline = peak_rss_mb()
+    rows = fetch_pubmed_data.extract_epigenetic_data(raw_store.iter_articles(store))
+    gc.collect()
+    return {"rows": len(rows), "baseline_mb": round(baseline, 1), "peak_mb": round(peak_rss_mb(), 1)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", default="100k", help="Records: 10k, 100k, 1m or an integer")
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--variants", nargs="+", choices=VARIANTS, default=VARIANTS)
+    parser.add_argument("--baseline-rev", default=BASELINE_REV, help="Revision measured as the dicts variant")
+    parser.add_argument("--child", type=Path, help=argparse.SUPPRESS)
+    parser.add_argument("--store", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_variant(args.child, args.store)))
+        return
+
+    from raw_store import write_store
+    from synthetic_corpus import iter_articles
+
+    size = SIZES.get(args.size.lower()) or int(args.size)
+    with tempfile.TemporaryDirectory(prefix="epi-mem-") as tmp:
+        store = Path(tmp) / "articles.jsonl.gz"
+        write_store(iter_articles(size, seed=args.seed), store, batch_size=500, index=False)
+        scripts = {"records": PROJECT_ROOT / "scripts"}
+        if "dicts" in args.variants:
+            scripts["dicts"] = export_scripts(args.baseline_rev, Path(tmp))
+
+        print(f"{size} records (dicts: {args.baseline_rev}):")
+        results = {}
+        for variant in args.variants:
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", str(scripts[variant]), "--store", str(store)],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            results[variant] = json.loads(output.strip().splitlines()[-1])
+            row = results[variant]
+            print(
+                f"  {variant:<8} peak RSS {row['peak_mb']:8.1f} MB  "
+                f"(+{row['peak_mb'] - row['baseline_mb']:.1f} MB over interpreter and imports)"
+            )
+
+    if {"dicts", "records"} <= results.keys():
+        saved = results["dicts"]["peak_mb"] - results["records"]["peak_mb"]
+        print(f"  StudyRecord saves {saved:.1f} MB ({saved / results['dicts']['peak_mb']:.0%} of peak)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+
+"""
+Cold-start time of the MCP server: process launch to first list_tools reply.
+
+Each run starts mcp_pubmed_server.py the way the client does (a fresh
+interpreter per session, see mcp_config.json), performs the MCP handshake
+over stdio and times:
+
+- initialize:  launch -> initialize response
+- list_tools:  launch -> tools/list response
+
+A bare interpreter start (python -c pass) is measured alongside, so the
+server's own import and setup cost can be told apart from the machine.
+Every invocation appends its medians to a JSON Lines history so startup
+cost can be followed across revisions:
+
+    python benchmarks/bench_startup.py --runs 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import IO, Any
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SERVER = PROJECT_ROOT / "mcp_pubmed_server.py"
+HISTORY_PATH = Path(__file__).resolve().parent / "results" / "startup_history.jsonl"
+PROTOCOL_VERSION = "2024-11-05"
+
+
+def send(stream: IO[str], message: dict[str, Any]) -> None:
+    stream.write(json.dumps(message) + "\n")
+    stream.flush()
+
+
+def receive(stream: IO[str], request_id: int) -> dict[str, Any]:
+    """Read messages until the response to request_id arrives."""
+    for line in stream:
+        message = json.loads(line)
+        if message.get("id") == request_id:
+            if "error" in message:
+                raise RuntimeError(f"Server returned an error: {message['error']}")
+            return message
+    raise RuntimeError("Server exited before responding")
+
+
+def time_startup(server: Path) -> dict[str, float]:
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, str(server)],
+        cwd=PROJECT_ROOT,
+        env={**os.environ, "PYTHONPATH": "."},
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        bufsize=1,
+    )
+    try:
+        send(process.stdin, {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "initialize",
+            "params": {
+                "protocolVersion": PROTOCOL_VERSION,
+                "capabilities": {},
+                "clientInfo": {"name": "bench_startup", "version": "0"},
+            },
+        })
+        receive(process.stdout, 1)
+        initialized = time.perf_counter()
+
+        send(process.stdin, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+        send(process.stdin, {"jsonrpc": "2.0", "id": 2, "method": "tools/list", "params": {}})
+        tools = receive(process.stdout, 2)["result"]["tools"]
+        listed = time.perf_counter()
+    finally:
+        process.kill()
+        process.wait()
+
+    return {
+        "initialize_ms": (initialized - started) * 1000,
+        "list_tools_ms": (listed - started) * 1000,
+        "tools": len(tools),
+    }
+
+
+def time_interpreter() -> float:
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+    return (time.perf_counter() - started) * 1000
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def last_entry(history: Path) -> dict[str, Any] | None:
+    if not history.exists():
+        return None
+    lines = [line for line in history.read_text(encoding="utf-8").splitlines() if line.strip()]
+    return json.loads(lines[-1]) if lines else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--server", type=Path, default=SERVER)
+    parser.add_argument("--history", type=Path, default=HISTORY_PATH, help="JSON Lines file the result is appended to")
+    parser.add_argument("--no-history", action="store_true", help="Do not record this run")
+    args = parser.parse_args()
+
+    # One unrecorded run warms the filesystem cache and bytecode
+    time_startup(args.server)
+    runs = [time_startup(args.server) for _ in range(args.runs)]
+    interpreter = [time_interpreter() for _ in range(args.runs)]
+
+    entry = {
+        "started": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": args.runs,
+        "tools": runs[-1]["tools"],
+        "interpreter_ms": round(statistics.median(interpreter), 1),
+        "initialize_ms": round(statistics.median(run["initialize_ms"] for run in runs), 1),
+        "list_tools_ms": round(statistics.median(run["list_tools_ms"] for run in runs), 1),
+        "list_tools_min_ms": round(min(run["list_tools_ms"] for run in runs), 1),
+    }
+
+    print(f"MCP server cold start ({args.runs} runs, medians):")
+    print(f"  interpreter only   {entry['interpreter_ms']:8.1f} ms")
+    print(f"  initialize         {entry['initialize_ms']:8.1f} ms")
+    print(f"  first list_tools   {entry['list_tools_ms']:8.1f} ms  ({entry['tools']} tools)")
+
+    previous = last_entry(args.history)
+    if previous:
+        change = entry["list_tools_ms"] - previous["list_tools_ms"]
+        print(f"  vs {previous['revision']} ({previous['started']}): {previous['list_tools_ms']:.1f} ms ({change:+.1f} ms)")
+
+    if not args.no_history:
+        args.history.parent.mkdir(parents=True, exist_ok=True)
+        with args.history.open("a", encoding="utf-8") as outfile:
+            outfile.write(json.dumps(entry) + "\n")
+        print(f"Recorded in {args.history}")
+
+
+if __name__ == "__main__":
+    main()
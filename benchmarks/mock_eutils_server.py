@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+
+"""
+Local stand-in for the NCBI E-utilities used by the fetchers and MCP server.
+
+ESearch, ESummary and EFetch requests (GET or POST) are answered from
+fixtures, with optional fault injection so fetch concurrency, retry and
+caching behaviour can be measured deterministically without the network:
+
+- Recorded responses: files in --fixtures-dir named
+  <endpoint>-<sha1 of the normalised query>.<json|xml|txt>. None ship with
+  the repository; use --record to proxy unmatched requests to the real
+  service and save them there.
+- Otherwise responses are synthesised from an article store. The default
+  is data/pubmed_raw_python.json: all 616 records the recorded search
+  identified, before title screening. The fetcher's own raw store holds
+  only the screened records that had an abstract, so ESearch would report
+  fewer records than the search found.
+
+Fault injection is seeded: --latency-ms/--jitter-ms add delay, --rate-limit
+returns 429 above N requests per second (NCBI allows 3 without an API key),
+--error-rate returns a random 500/502/503 for that fraction of requests.
+GET /_stats reports request, throttle and error counts.
+
+    python benchmarks/mock_eutils_server.py --port 8765 --latency-ms 80 --rate-limit 3 --error-rate 0.05
+    EUTILS_BASE_URL=http://127.0.0.1:8765/entrez/eutils/ python scripts/fetch_pubmed_data.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+import urllib.request
+import xml.etree.ElementTree as ET
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qsl, urlsplit
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_FIXTURES = Path(__file__).resolve().parent / "fixtures" / "eutils"
+UPSTREAM = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
+ENDPOINTS = {"esearch.fcgi", "esummary.fcgi", "efetch.fcgi"}
+# Parameters that identify the caller rather than the request
+IGNORED_PARAMS = {"email", "tool", "api_key"}
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+
+from raw_store import LEGACY_RAW_PATH, load_articles  # noqa: E402
+from synthetic_corpus import efetch_element  # noqa: E402
+
+# Every record the recorded search identified, before screening (616)
+IDENTIFIED_ARTICLES = LEGACY_RAW_PATH
+
+
+def fixture_key(endpoint: str, params: dict[str, str]) -> str:
+    normalised = "&".join(f"{key}={params[key]}" for key in sorted(params) if key not in IGNORED_PARAMS)
+    return f"{endpoint.split('.')[0]}-{hashlib.sha1(normalised.encode('utf-8')).hexdigest()}"
+
+
+def content_type_for(params: dict[str, str]) -> tuple[str, str]:
+    retmode = params.get("retmode", "xml")
+    if retmode == "json":
+        return "application/json", "json"
+    if retmode == "text":
+        return "text/plain; charset=utf-8", "txt"
+    return "text/xml; charset=utf-8", "xml"
+
+
+class ArticleStore:
+    """Synthesises E-utilities responses from raw-article dicts."""
+
+    def __init__(self, articles: list[dict[str, str]]) -> None:
+        self.order = [article["pmid"] for article in articles]
+        self.by_pmid = {article["pmid"]: article for article in articles}
+
+    @classmethod
+    def load(cls, path: Path) -> "ArticleStore":
+        return cls(load_articles(path))
+
+    def esearch(self, params: dict[str, str]) -> bytes:
+        retstart = int(params.get("retstart", 0))
+        retmax = int(params.get("retmax", 20))
+        idlist = self.order[retstart:retstart + retmax]
+        return json.dumps(
+            {
+                "header": {"type": "esearch", "version": "0.3"},
+                "esearchresult": {
+                    "count": str(len(self.order)),
+                    "retmax": str(len(idlist)),
+                    "retstart": str(retstart),
+                    "idlist": idlist,
+                    "querytranslation": params.get("term", ""),
+                },
+            }
+        ).encode("utf-8")
+
+    def esummary(self, params: dict[str, str]) -> bytes:
+        result: dict[str, object] = {"uids": []}
+        for pmid in filter(None, params.get("id", "").split(",")):
+            article = self.by_pmid.get(pmid)
+            if article is None:
+                result[pmid] = {"uid": pmid, "error": "cannot get document summary"}
+                continue
+            result["uids"].append(pmid)  # type: ignore[union-attr]
+            result[pmid] = {
+                "uid": pmid,
+                "pubdate": article.get("pubdate", ""),
+                "title": article.get("title", ""),
+                "fulljournalname": article.get("journal", ""),
+                "authors": [
+                    {"name": name.strip(), "authtype": "Author"}
+                    for name in article.get("authors", "").split(";")
+                    if name.strip()
+                ],
+                "articleids": [{"idtype": "pubmed", "value": pmid}]
+                + ([{"idtype": "doi", "value": article["doi"]}] if article.get("doi") else []),
+                "pubtype": article.get("publication_types") or ["Journal Article"],
+            }
+        return json.dumps({"header": {"type": "esummary", "version": "0.3"}, "result": result}).encode("utf-8")
+
+    def efetch(self, params: dict[str, str]) -> bytes:
+        articles = [self.by_pmid[pmid] for pmid in params.get("id", "").split(",") if pmid in self.by_pmid]
+        if params.get("retmode") == "text":
+            return "\n\n".join(article.get("abstract", "") for article in articles).encode("utf-8")
+        root = ET.Element("PubmedArticleSet")
+        root.extend(efetch_element(article) for article in articles)
+        return b'<?xml version="1.0" ?>\n' + ET.tostring(root, encoding="utf-8")
+
+
+class MockState:
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.store = ArticleStore.load(args.articles)
+        self.fixtures_dir: Path = args.fixtures_dir
+        self.record = args.record
+        self.latency = args.latency_ms / 1000
+        self.jitter = args.jitter_ms / 1000
+        self.rate_limit = args.rate_limit
+        self.error_rate = args.error_rate
+        self.rng = random.Random(args.seed)
+        self.lock = threading.Lock()
+        self.window: collections.deque[float] = collections.deque()
+        self.stats: collections.Counter[str] = collections.Counter()
+
+    def draw(self) -> tuple[float, bool, int]:
+        """Seeded per-request decisions: delay, whether to fail, and with which status."""
+        with self.lock:
+            delay = self.latency + (self.rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            fail = self.rng.random() < self.error_rate
+            status = self.rng.choice((500, 502, 503))
+        return delay, fail, status
+
+    def throttled(self) -> bool:
+        if not self.rate_limit:
+            return False
+        now = time.monotonic()
+        with self.lock:
+            while self.window and now - self.window[0] >= 1.0:
+                self.window.popleft()
+            if len(self.window) >= self.rate_limit:
+                return True
+            self.window.append(now)
+            return False
+
+    def recorded(self, endpoint: str, params: dict[str, str]) -> Optional[bytes]:
+        _, extension = content_type_for(params)
+        path = self.fixtures_dir / f"{fixture_key(endpoint, params)}.{extension}"
+        return path.read_bytes() if path.exists() else None
+
+    def fetch_upstream(self, endpoint: str, params: dict[str, str]) -> bytes:
+        data = "&".join(f"{key}={urllib.request.quote(value)}" for key, value in params.items()).encode("utf-8")
+        with urllib.request.urlopen(f"{UPSTREAM}{endpoint}", data=data, timeout=60) as response:
+            body = response.read()
+        _, extension = content_type_for(params)
+        self.fixtures_dir.mkdir(parents=True, exist_ok=True)
+        (self.fixtures_dir / f"{fixture_key(endpoint, params)}.{extension}").write_bytes(body)
+        return body
+
+    def respond(self, endpoint: str, params: dict[str, str]) -> bytes:
+        body = self.recorded(endpoint, params)
+        if body is not None:
+            self.stats["fixture_hits"] += 1
+            return body
+        if self.record:
+            self.stats["recorded"] += 1
+            return self.fetch_upstream(endpoint, params)
+        self.stats["synthesised"] += 1
+        if endpoint == "esearch.fcgi":
+            return self.store.esearch(params)
+        if endpoint == "esummary.fcgi":
+            return self.store.esummary(params)
+        return self.store.efetch(params)
+
+
+class Handler(BaseHTTPRequestHandler):
+    state: MockState
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002 - BaseHTTPRequestHandler API
+        if self.server.verbose:  # type: ignore[attr-defined]
+            super().log_message(format, *args)
+
+    def do_GET(self) -> None:  # noqa: N802 - BaseHTTPRequestHandler API
+        url = urlsplit(self.path)
+        if url.path.rstrip("/") == "/_stats":
+            with self.state.lock:
+                payload = json.dumps(dict(self.state.stats)).encode("utf-8")
+            self.send(200, payload, "application/json")
+            return
+        self.handle_eutils(url.path, dict(parse_qsl(url.query)))
+
+    def do_POST(self) -> None:  # noqa: N802 - BaseHTTPRequestHandler API
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length", 0))
+        params = dict(parse_qsl(url.query))
+        params.update(parse_qsl(self.rfile.read(length).decode("utf-8")))
+        self.handle_eutils(url.path, params)
+
+    def handle_eutils(self, path: str, params: dict[str, str]) -> None:
+        state = self.state
+        endpoint = path.rsplit("/", 1)[-1]
+        with state.lock:
+            state.stats["requests"] += 1
+            state.stats[f"requests_{endpoint.split('.')[0]}"] += 1
+
+        if endpoint not in ENDPOINTS:
+            self.send(404, b"Unknown endpoint", "text/plain")
+            return
+
+        delay, fail, status = state.draw()
+        if delay:
+            time.sleep(delay)
+
+        if state.throttled():
+            with state.lock:
+                state.stats["throttled"] += 1
+            self.send(429, b'{"error":"API rate limit exceeded"}', "application/json", {"Retry-After": "1"})
+            return
+        if fail:
+            with state.lock:
+                state.stats[f"errors_{status}"] += 1
+            self.send(status, b"Simulated upstream failure", "text/plain")
+            return
+
+        content_type, _ = content_type_for(params)
+        self.send(200, state.respond(endpoint, params), content_type)
+
+    def send(self, status: int, body: bytes, content_type: str, headers: Optional[dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def make_server(args: argparse.Namespace) -> ThreadingHTTPServer:
+    handler = type("BoundHandler", (Handler,), {"state": MockState(args)})
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    server.verbose = args.verbose  # type: ignore[attr-defined]
+    server.daemon_threads = True
+    return server
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--articles",
+        type=Path,
+        default=IDENTIFIED_ARTICLES,
+        help="Raw-article store used to synthesise responses (default: the unscreened identification set)",
+    )
+    parser.add_argument("--fixtures-dir", type=Path, default=DEFAULT_FIXTURES, help="Directory of recorded responses")
+    parser.add_argument("--record", action="store_true", help="Proxy unmatched requests upstream and save them as fixtures")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=0, help="Requests per second before answering 429 (0 = unlimited)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with a 5xx")
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    server = make_server(args)
+    host, port = server.server_address[:2]
+    print(f"Mock E-utilities listening on http://{host}:{port}/entrez/eutils/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+
+"""
+End-to-end benchmark harness for the evidence synthesis pipeline.
+
+For each corpus size a synthetic corpus is generated (see synthetic_corpus.py)
+and the main stages are timed separately:
+
+- extract:            fetch_pubmed_data.extract_epigenetic_data
+- statistics:         stat_extraction.extract_statistics over every abstract
+- pooling:            meta_pooling.pool_subgroups over exposure x marker x cancer strata
+- prepare:            prepare_master_dataset.main
+- resampling:         resampling.resample_dataset (bootstrap CIs and permutation tests, 1,000 resamples)
+- export_references:  export_references.main
+- build_manuscript:   build_comprehensive_manuscript.main
+- parse_xml:          re_research_2025 analyze_data.parse_xml
+
+Stages run in-process against files in a temporary directory; module path
+constants are pointed there for the duration of the run. Results are written
+as JSON so every change can be compared with a stored baseline:
+
+    python benchmarks/run_benchmarks.py --sizes 1k 10k --output benchmarks/results/baseline.json
+    python benchmarks/run_benchmarks.py --sizes 1k 10k --baseline benchmarks/results/baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import csv
+import datetime
+import io
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+sys.path.insert(0, str(PROJECT_ROOT / "re_research_2025" / "scripts"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import analyze_data  # noqa: E402
+import build_comprehensive_manuscript  # noqa: E402
+import export_references  # noqa: E402
+import fetch_pubmed_data  # noqa: E402
+import meta_pooling  # noqa: E402
+import prepare_master_dataset  # noqa: E402
+import resampling  # noqa: E402
+import stat_extraction  # noqa: E402
+from synthetic_corpus import SeedPool, generate_articles, write_efetch_xml  # noqa: E402
+
+
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+STAGES = ["extract", "statistics", "pooling", "prepare", "resampling", "export_references", "build_manuscript", "parse_xml"]
+BENCH_RESAMPLES = 1_000
+
+
+def parse_size(value: str) -> int:
+    key = value.lower()
+    if key in SIZES:
+        return SIZES[key]
+    return int(value)
+
+
+@contextlib.contextmanager
+def patched(module: object, **attributes: object):
+    originals = {name: getattr(module, name) for name in attributes}
+    for name, value in attributes.items():
+        setattr(module, name, value)
+    try:
+        yield
+    finally:
+        for name, value in originals.items():
+            setattr(module, name, value)
+
+
+def timed(func: Callable[[], object], repeats: int) -> list[float]:
+    timings = []
+    for _ in range(repeats):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+    return timings
+
+
+def write_csv(rows: list[fetch_pubmed_data.StudyRecord], path: Path) -> None:
+    with path.open("w", newline="", encoding="utf-8") as outfile:
+        writer = csv.writer(outfile)
+        writer.writerow(fetch_pubmed_data.StudyRecord._fields)
+        writer.writerows(rows)
+
+
+def pool_extracted(rows: list[fetch_pubmed_data.StudyRecord]) -> dict:
+    """Random-effects pooling of every reported estimate per measure/exposure/marker/cancer stratum."""
+    effects, errors, strata = [], [], []
+    for row in rows:
+        if not row.effect_measure:
+            continue
+        effect = meta_pooling.study_effect(
+            row.effect_measure, row.epigenetic_effect_size, row.ci_lower or None, row.ci_upper or None, None, row.p_value or None, row.p_operator or None
+        )
+        if effect is not None:
+            effects.append(effect.effect)
+            errors.append(effect.standard_error)
+            strata.append((row.effect_measure, row.exposure_type, row.epigenetic_marker, row.cancer_type))
+    return meta_pooling.pool_subgroups(effects, errors, strata)
+
+
+def run_size(size: int, stages: list[str], repeats: int, seed: int, pool: SeedPool) -> list[dict[str, object]]:
+    results: list[dict[str, object]] = []
+
+    def record(stage: str, timings: list[float]) -> None:
+        best = min(timings)
+        results.append(
+            {
+                "stage": stage,
+                "records": size,
+                "seconds": round(best, 6),
+                "runs": [round(value, 6) for value in timings],
+                "records_per_second": round(size / best, 1) if best else None,
+            }
+        )
+        print(f"  {stage:<18} {size:>9} records  {best:9.3f} s  ({size / best if best else 0:,.0f} rec/s)")
+
+    articles = generate_articles(size, seed=seed, pool=pool)
+
+    with tempfile.TemporaryDirectory(prefix="epi-bench-") as tmp:
+        workdir = Path(tmp)
+        python_csv = workdir / "epigenetic_master_dataset_python.csv"
+        master_csv = workdir / "epigenetic_master_dataset.csv"
+        references = workdir / "references_formatted.txt"
+
+        extracted: list[fetch_pubmed_data.StudyRecord] = []
+
+        def extract() -> None:
+            extracted[:] = fetch_pubmed_data.extract_epigenetic_data(articles)
+
+        if "extract" in stages:
+            record("extract", timed(extract, repeats))
+        else:
+            extract()
+        write_csv(extracted, python_csv)
+
+        if "statistics" in stages:
+            abstracts = [article["abstract"] for article in articles]
+            record(
+                "statistics",
+                timed(lambda: [stat_extraction.extract_statistics(text) for text in abstracts], repeats),
+            )
+
+        if "pooling" in stages:
+            record("pooling", timed(lambda: pool_extracted(extracted), repeats))
+
+        with patched(
+            prepare_master_dataset,
+            INPUT_PATH=python_csv,
+            OUTPUT_PATH=master_csv,
+            PRISMA_COUNTS_PATH=workdir / "prisma_counts.csv",
+        ):
+            if "prepare" in stages:
+                record("prepare", timed(prepare_master_dataset.main, repeats))
+            else:
+                timed(prepare_master_dataset.main, 1)
+
+        if "resampling" in stages:
+            with master_csv.open(encoding="utf-8") as infile:
+                master_rows = list(csv.DictReader(infile))
+            record(
+                "resampling",
+                timed(lambda: resampling.resample_dataset(master_rows, resamples=BENCH_RESAMPLES), repeats),
+            )
+
+        needs_references = "export_references" in stages or "build_manuscript" in stages
+        if needs_references:
+            with patched(
+                export_references,
+                MASTER_DATASET=master_csv,
+                OUTPUT_PATH=references,
+                CACHE_PATH=workdir / "reference_cache.json",
+            ), patched(sys, argv=["export_references.py", "--no-cache"]):
+                timings = timed(export_references.main, repeats)
+                if "export_references" in stages:
+                    record("export_references", timings)
+
+        if "build_manuscript" in stages:
+            with patched(
+                build_comprehensive_manuscript,
+                MASTER_DATASET=master_csv,
+                REFERENCES_PATH=references,
+                OUTPUT_MANUSCRIPT=workdir / "manuscript.md",
+                OUTPUT_DOCX=workdir / "manuscript.docx",
+            ):
+                record("build_manuscript", timed(build_comprehensive_manuscript.main, repeats))
+
+        if "parse_xml" in stages:
+            xml_path = workdir / "raw_data.xml"
+            write_efetch_xml(articles, xml_path)
+            record("parse_xml", timed(lambda: analyze_data.parse_xml(xml_path), repeats))
+
+    return results
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results: list[dict[str, object]], baseline_path: Path) -> None:
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    reference = {(row["stage"], row["records"]): row["seconds"] for row in baseline["results"]}
+    print(f"\nComparison with {baseline_path} ({baseline['meta'].get('revision', '?')}):")
+    for row in results:
+        previous = reference.get((row["stage"], row["records"]))
+        if previous is None:
+            continue
+        ratio = previous / row["seconds"] if row["seconds"] else float("inf")
+        print(
+            f"  {row['stage']:<18} {row['records']:>9}  {previous:9.3f} s -> {row['seconds']:9.3f} s  "
+            f"({ratio:.2f}x {'faster' if ratio >= 1 else 'slower'})"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", default=["1k", "10k"], help="Corpus sizes: 1k, 10k, 100k, 1m or an integer")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--repeats", type=int, default=1, help="Runs per stage; the best time is reported")
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--output", type=Path, default=None, help="Results JSON (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", type=Path, default=None, help="Previous results JSON to compare against")
+    args = parser.parse_args()
+
+    pool = SeedPool.load()
+    started = datetime.datetime.now(datetime.timezone.utc)
+    results: list[dict[str, object]] = []
+    for label in args.sizes:
+        size = parse_size(label)
+        print(f"Corpus of {size} records:")
+        results.extend(run_size(size, args.stages, args.repeats, args.seed, pool))
+
+    payload = {
+        "meta": {
+            "started": started.isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeats": args.repeats,
+        },
+        "results": results,
+    }
+    output = args.output or RESULTS_DIR / f"{started.strftime('%Y%m%dT%H%M%SZ')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    print(f"\nResults written to {output}")
+
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
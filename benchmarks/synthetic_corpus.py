@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+"""
+Synthetic corpus generator for pipeline benchmarks.
+
+Records are recombined from the real articles in the raw store (titles,
+author lists, journals, abstract sentences), so field lengths, term
+frequencies and numeric patterns follow the shape of the live corpus while
+the PMIDs are unique. Generation is seeded and therefore reproducible.
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import sys
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+
+from raw_store import default_raw_path, load_articles  # noqa: E402
+
+SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+@dataclass
+class SeedPool:
+    titles: list[str]
+    authors: list[str]
+    journals: list[str]
+    pubdates: list[str]
+    sentences: list[str]
+    sentence_counts: list[int]
+
+    @classmethod
+    def load(cls, path: Path | None = None) -> "SeedPool":
+        articles = load_articles(path or default_raw_path())
+        sentences: list[str] = []
+        counts: list[int] = []
+        for article in articles:
+            parts = [part.strip() for part in SENTENCE_RE.split(article.get("abstract", "")) if part.strip()]
+            sentences.extend(parts)
+            counts.append(max(1, len(parts)))
+        return cls(
+            titles=[article["title"] for article in articles if article.get("title")],
+            authors=[article["authors"] for article in articles if article.get("authors")],
+            journals=[article["journal"] for article in articles if article.get("journal")],
+            pubdates=[article["pubdate"] for article in articles if article.get("pubdate")],
+            sentences=sentences,
+            sentence_counts=counts,
+        )
+
+
+def iter_articles(count: int, seed: int = 2025, pool: SeedPool | None = None) -> Iterator[dict[str, str]]:
+    """Yield raw-article dicts shaped like the raw store's entries."""
+    pool = pool or SeedPool.load()
+    rng = random.Random(seed)
+    for index in range(count):
+        pmid = str(30_000_000 + index)
+        n_sentences = rng.choice(pool.sentence_counts)
+        yield {
+            "pmid": pmid,
+            "title": rng.choice(pool.titles),
+            "authors": rng.choice(pool.authors),
+            "journal": rng.choice(pool.journals),
+            "pubdate": rng.choice(pool.pubdates),
+            "doi": f"10.5555/synthetic.{pmid}",
+            "abstract": " ".join(rng.choice(pool.sentences) for _ in range(n_sentences)),
+        }
+
+
+def generate_articles(count: int, seed: int = 2025, pool: SeedPool | None = None) -> list[dict[str, str]]:
+    return list(iter_articles(count, seed, pool))
+
+
+def efetch_element(article: dict[str, str]) -> ET.Element:
+    """Build a <PubmedArticle> holding the subset of EFetch XML the pipeline reads."""
+    root = ET.Element("PubmedArticle")
+    citation = ET.SubElement(root, "MedlineCitation")
+    ET.SubElement(citation, "PMID").text = article["pmid"]
+    body = ET.SubElement(citation, "Article")
+    journal = ET.SubElement(body, "Journal")
+    issue = ET.SubElement(journal, "JournalIssue")
+    pubdate = ET.SubElement(issue, "PubDate")
+    ET.SubElement(pubdate, "Year").text = article.get("pubdate", "")[:4]
+    ET.SubElement(journal, "Title").text = article.get("journal", "")
+    ET.SubElement(body, "ArticleTitle").text = article.get("title", "")
+    abstract = ET.SubElement(body, "Abstract")
+    sections = article.get("abstract_sections")
+    if sections:
+        for section in sections:
+            node = ET.SubElement(abstract, "AbstractText")
+            if section.get("label"):
+                node.set("Label", section["label"])
+                node.set("NlmCategory", section.get("category", "UNASSIGNED"))
+            node.text = section["text"]
+    else:
+        ET.SubElement(abstract, "AbstractText").text = article.get("abstract", "")
+    authors = ET.SubElement(body, "AuthorList")
+    for name in filter(None, (part.strip() for part in article.get("authors", "").split(";"))):
+        last, _, initials = name.rpartition(" ")
+        author = ET.SubElement(authors, "Author")
+        ET.SubElement(author, "LastName").text = last or name
+        ET.SubElement(author, "Initials").text = initials if last else ""
+    if article.get("doi"):
+        ET.SubElement(body, "ELocationID", EIdType="doi").text = article["doi"]
+    pubtypes = ET.SubElement(body, "PublicationTypeList")
+    for name in article.get("publication_types") or ["Journal Article"]:
+        ET.SubElement(pubtypes, "PublicationType").text = name
+    if article.get("mesh_terms"):
+        mesh = ET.SubElement(citation, "MeshHeadingList")
+        for name in article["mesh_terms"]:
+            ET.SubElement(ET.SubElement(mesh, "MeshHeading"), "DescriptorName").text = name
+    return root
+
+
+def write_efetch_xml(articles: list[dict[str, str]], path: Path) -> None:
+    """Write articles as an EFetch-style PubmedArticleSet."""
+    with path.open("w", encoding="utf-8") as outfile:
+        outfile.write('<?xml version="1.0" ?>\n<PubmedArticleSet>\n')
+        for article in articles:
+            outfile.write(ET.tostring(efetch_element(article), encoding="unicode"))
+            outfile.write("\n")
+        outfile.write("</PubmedArticleSet>\n")
@@ -2,26 +2,244 @@
 """
 MCP Server for PubMed API Access
 Provides tools for systematic literature search and data extraction
+
+The client starts a fresh process per session, so only what list_tools
+needs is imported at startup. The HTTP client, the statistics grammars and
+the local dataset index are loaded by the first tool call that uses them
+(benchmarks/bench_startup.py tracks time to the first list_tools reply).
+
+Upstream fetches run in worker threads. Identical calls that overlap in
+time (same normalised query, same PMID set) share one fetch, and every
+E-utilities request is spaced by the shared rate limiter in eutils.py.
+Responses are kept in the shared response cache.
+
+Per-tool latency, upstream request timings, cache hits and rate-limiter
+waits are recorded in METRICS and returned by the server_stats tool along
+with traces of recent calls. Set MCP_METRICS_FILE (.prom for Prometheus
+text, otherwise JSON) to also write them every MCP_METRICS_INTERVAL seconds.
 """
 
 import asyncio
+import contextvars
+import datetime
 import json
+import os
 import re
+import sys
+import time
+from collections import deque
+from pathlib import Path
 from typing import Any, Sequence
 from urllib.parse import quote
-from urllib.request import urlopen
-from urllib.error import URLError
 
 from mcp.server import Server
-from mcp.server.models import InitializationOptions
-import mcp.server.stdio
 import mcp.types as types
 
+# Shared helpers live alongside the pipeline scripts
+sys.path.insert(0, str(Path(__file__).resolve().parent / "scripts"))
+
+from eutils import MAX_RETRIES, eutils_base_url, retry_delay, shared_rate_limiter, shared_response_cache, should_retry, signed_request
+from metrics import Metrics
+
+EUTILS_BASE_URL = eutils_base_url()
+EFETCH_BATCH_SIZE = 200
+METRICS_PREFIX = "mcp_pubmed_"
+METRICS_INTERVAL = 30.0
+RECENT_CALLS = 50
+# Registry template (data/search_queries.json) with the pubmed_systematic_search defaults
+SEARCH_TEMPLATE = "mcp_systematic_search"
+
+METRICS = Metrics()
+STARTED = time.time()
+
+# Facets accepted by query_local_dataset (dataset_query.FILTER_FIELDS)
+LOCAL_FILTER_FIELDS = ("exposure_type", "epigenetic_marker", "cancer_type", "study_design")
+
+# Tools listed by build_tools; any other name is counted under tool="unknown"
+# so client-supplied names cannot add metric series
+TOOL_NAMES = frozenset({
+    "pubmed_systematic_search",
+    "extract_epigenetic_factors",
+    "pubmed_meta_analysis_data",
+    "query_local_dataset",
+    "resolve_pmids",
+    "server_stats",
+})
+
+_local_dataset = None
+_tools = None
+_in_flight: dict[tuple, asyncio.Future] = {}
+_recent_calls: deque = deque(maxlen=RECENT_CALLS)
+# Upstream events of the tool call being handled; copied into worker threads
+_trace: contextvars.ContextVar = contextvars.ContextVar("trace", default=None)
+
 server = Server("pubmed-mcp-server")
 
+def local_dataset():
+    """The master dataset index, created on the first local query."""
+    global _local_dataset
+    if _local_dataset is None:
+        from dataset_query import DatasetIndex
+
+        # Loaded on first query and reloaded when the CSV changes
+        _local_dataset = DatasetIndex()
+    return _local_dataset
+
+async def coalesced(key: tuple, func, *args):
+    """Run func(*args) in a worker thread, sharing it with identical concurrent calls.
+
+    The first caller for a key starts the fetch; callers arriving while it
+    is in flight await the same result. The key is dropped once the fetch
+    finishes, so later calls fetch again.
+    """
+    future = _in_flight.get(key)
+    if future is not None:
+        METRICS.increment("coalesced_calls", kind=key[0])
+        record_event({"event": "coalesced", "kind": key[0]})
+    else:
+        future = asyncio.ensure_future(asyncio.to_thread(func, *args))
+        _in_flight[key] = future
+
+        def release(done: asyncio.Future) -> None:
+            if _in_flight.get(key) is done:
+                del _in_flight[key]
+
+        future.add_done_callback(release)
+    # One caller being cancelled must not cancel the fetch for the others
+    return await asyncio.shield(future)
+
+def record_event(event: dict) -> None:
+    trace = _trace.get()
+    if trace is not None:
+        trace.append(event)
+
+def endpoint_name(url: str) -> str:
+    path = url.split("?", 1)[0]
+    return path.rsplit("/", 1)[-1].removesuffix(".fcgi")
+
+def fetch_url(url: str, data: bytes | None = None, cache: bool = True) -> bytes:
+    """GET (or POST data to) an E-utilities URL from the response cache, or once the rate limiter allows it."""
+    from urllib.request import Request, urlopen
+
+    endpoint = endpoint_name(url)
+    responses = shared_response_cache()
+    key = url if data is None else (url, data)
+    if cache:
+        cached = responses.get(key)
+        if cached is not None:
+            METRICS.increment("cache_lookups", result="hit")
+            record_event({"event": "cache_hit", "endpoint": endpoint})
+            return cached
+        METRICS.increment("cache_lookups", result="miss")
+
+    # The key is added after the cache lookup, so cache keys and traces never contain it
+    request_url, request_data = signed_request(url, data)
+    for attempt in range(MAX_RETRIES + 1):
+        wait = shared_rate_limiter().acquire()
+        METRICS.observe("rate_limiter_wait_ms", wait * 1000)
+        started = time.perf_counter()
+        status = "ok"
+        try:
+            with urlopen(Request(request_url, data=request_data)) as response:
+                body = response.read()
+            break
+        except Exception as e:
+            status = "error"
+            if attempt == MAX_RETRIES or not should_retry(e):
+                raise
+            status = "retried"
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            METRICS.increment("upstream_requests", endpoint=endpoint, status=status)
+            METRICS.observe("upstream_request_ms", elapsed_ms, endpoint=endpoint)
+            record_event({
+                "event": "upstream",
+                "endpoint": endpoint,
+                "status": status,
+                "wait_ms": round(wait * 1000, 1),
+                "ms": round(elapsed_ms, 1),
+            })
+        time.sleep(retry_delay(attempt))
+
+    if cache:
+        responses.put(key, body)
+    return body
+
+def resolve_metadata(pmids: Sequence[str]) -> dict:
+    """Batched ESummary (POST) metadata for pmids, keyed by PMID."""
+    from pmid_metadata import resolve_pmids
+
+    # Records are cached per PMID by resolve_pmids, so chunk responses are not
+    return resolve_pmids(pmids, fetch=lambda url, body: fetch_url(url, body, cache=False))
+
+def update_gauges() -> None:
+    cache = shared_response_cache().stats()
+    METRICS.set_gauge("cache_entries", cache["entries"])
+    METRICS.set_gauge("cache_hit_ratio", cache["hit_ratio"] or 0.0)
+    METRICS.set_gauge("in_flight_fetches", len(_in_flight))
+    METRICS.set_gauge("uptime_seconds", round(time.time() - STARTED, 1))
+
+def server_stats() -> dict:
+    """Summary of tool, upstream, cache and rate-limiter metrics plus recent call traces."""
+    update_gauges()
+    snapshot = METRICS.snapshot()
+    histograms = snapshot["histograms"]
+
+    def latency(name: str, label: str) -> dict:
+        return {
+            series["labels"][label]: {key: value for key, value in series.items() if key != "labels"}
+            for series in histograms.get(name, [])
+        }
+
+    def calls(name: str, label: str) -> dict:
+        totals: dict = {}
+        for series in snapshot["counters"].get(name, []):
+            totals.setdefault(series["labels"][label], {})[series["labels"]["status"]] = series["value"]
+        return totals
+
+    waits = [{key: value for key, value in series.items() if key != "labels"} for series in histograms.get("rate_limiter_wait_ms", [])]
+    return {
+        "uptime_seconds": round(time.time() - STARTED, 1),
+        "tools": {
+            "calls": calls("tool_calls", "tool"),
+            "latency_ms": latency("tool_latency_ms", "tool"),
+        },
+        "upstream": {
+            "requests": calls("upstream_requests", "endpoint"),
+            "latency_ms": latency("upstream_request_ms", "endpoint"),
+        },
+        "cache": shared_response_cache().stats(),
+        "coalesced_calls": {series["labels"]["kind"]: series["value"] for series in snapshot["counters"].get("coalesced_calls", [])},
+        "in_flight_fetches": len(_in_flight),
+        "rate_limiter": {
+            "rate_per_second": round(1 / shared_rate_limiter().interval, 2) if shared_rate_limiter().interval else None,
+            "wait_ms": waits[0] if waits else None,
+        },
+        "recent_calls": list(_recent_calls),
+    }
+
+def write_metrics(path: Path) -> None:
+    update_gauges()
+    METRICS.write(path, prefix=METRICS_PREFIX, extra={"written": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")})
+
+async def write_metrics_periodically(path: Path, interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(write_metrics, path)
+        except OSError as e:
+            print(f"Could not write metrics to {path}: {e}", file=sys.stderr)
+
 @server.list_tools()
 async def handle_list_tools() -> list[types.Tool]:
     """List available tools for PubMed search and extraction."""
+    global _tools
+    if _tools is None:
+        _tools = build_tools()
+    return _tools
+
+def build_tools() -> list[types.Tool]:
+    defaults = search_defaults()
     return [
         types.Tool(
             name="pubmed_systematic_search",
@@ -36,23 +254,23 @@ async def handle_list_tools() -> list[types.Tool]:
                     "date_from": {
                         "type": "string",
                         "description": "Start date (YYYY/MM/DD)",
-                        "default": "2019/01/01"
+                        "default": defaults.date_from
                     },
                     "date_to": {
                         "type": "string",
                         "description": "End date (YYYY/MM/DD)",
-                        "default": "2025/12/31"
+                        "default": defaults.date_to
                     },
                     "max_results": {
                         "type": "integer",
                         "description": "Maximum number of results to return",
-                        "default": 100
+                        "default": defaults.retmax
                     },
                     "study_types": {
                         "type": "array",
                         "items": {"type": "string"},
                         "description": "Publication types to include",
-                        "default": ["Journal Article", "Clinical Trial", "Cohort Studies"]
+                        "default": list(defaults.publication_types)
                     }
                 },
                 "required": ["query"]
@@ -75,7 +293,7 @@ async def handle_list_tools() -> list[types.Tool]:
         ),
         types.Tool(
             name="pubmed_meta_analysis_data",
-            description="Extract structured data suitable for meta-analysis from PubMed articles",
+            description="Extract effect estimates and standard errors from PubMed abstracts and pool them (fixed and DerSimonian-Laird random effects, I², subgroups by exposure type and marker)",
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -87,65 +305,118 @@ async def handle_list_tools() -> list[types.Tool]:
                     "outcome_measures": {
                         "type": "array",
                         "items": {"type": "string"},
-                        "description": "Specific outcome measures to extract",
+                        "description": "Outcome terms an abstract must mention to be included",
                         "default": ["methylation", "expression", "risk", "prevention"]
                     }
                 },
                 "required": ["pmids"]
             }
+        ),
+        types.Tool(
+            name="query_local_dataset",
+            description="Filter and summarise the local epigenetic master dataset (no PubMed request)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    **{
+                        field: {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": f"Accepted {field} values (case-insensitive)"
+                        }
+                        for field in LOCAL_FILTER_FIELDS
+                    },
+                    "year_from": {
+                        "type": "integer",
+                        "description": "First publication year to include"
+                    },
+                    "year_to": {
+                        "type": "integer",
+                        "description": "Last publication year to include"
+                    },
+                    "group_by": {
+                        "type": "array",
+                        "items": {
+                            "type": "string",
+                            "enum": ["exposure_type", "epigenetic_marker", "cancer_type", "study_design", "year"]
+                        },
+                        "description": "Facets to group counts and effect summaries by",
+                        "default": []
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of matching records to return",
+                        "default": 20
+                    }
+                }
+            }
+        ),
+        types.Tool(
+            name="resolve_pmids",
+            description="Resolve a list of PubMed IDs (thousands at a time) to title, authors, journal, date, DOI and publication types",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "pmids": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "PubMed IDs to resolve"
+                    }
+                },
+                "required": ["pmids"]
+            }
+        ),
+        types.Tool(
+            name="server_stats",
+            description="Server metrics: per-tool calls and latency, NCBI request timings, cache hit ratio, rate-limiter waits and recent call traces",
+            inputSchema={"type": "object", "properties": {}}
         )
     ]
 
-def build_pubmed_query(base_query: str, date_from: str = "2019/01/01",
-                      date_to: str = "2025/12/31", study_types: list = None) -> str:
-    """Build advanced PubMed query with filters."""
-    query_parts = [f'({base_query})']
-
-    # Date range
-    query_parts.append(f'("{date_from}"[Date - Publication] : "{date_to}"[Date - Publication])')
-
-    # Humans and English
-    query_parts.append('("humans"[MeSH Terms])')
-    query_parts.append('(english[lang])')
-
-    # Study types (exclude reviews and meta-analyses)
-    if study_types:
-        type_filters = [f'("{st}"[Publication Type])' for st in study_types]
-        query_parts.append(f'({" OR ".join(type_filters)})')
+def search_defaults():
+    """Date window, filters and publication types for pubmed_systematic_search (data/search_queries.json)."""
+    from query_registry import get_search
 
-    # Exclude reviews and meta-analyses
-    query_parts.append('NOT ("review"[Publication Type] OR "meta-analysis"[Publication Type])')
+    return get_search(SEARCH_TEMPLATE)
 
-    return " AND ".join(query_parts)
+def build_pubmed_query(base_query: str, date_from: str = None,
+                      date_to: str = None, study_types: list = None) -> str:
+    """Build advanced PubMed query with filters."""
+    defaults = search_defaults()
+    return defaults.replace(
+        term=f'({base_query})',
+        date_from=date_from or defaults.date_from,
+        date_to=date_to or defaults.date_to,
+        publication_types=tuple(study_types or ()),
+    ).query()
 
 def search_pubmed(query: str, max_results: int = 100) -> dict:
     """Search PubMed and return results."""
+    from urllib.error import URLError
+
     try:
         # Use ESearch to get PMIDs
-        esearch_url = f"https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi?db=pubmed&term={quote(query)}&retmax={max_results}&usehistory=y&retmode=json"
-        with urlopen(esearch_url) as response:
-            search_data = json.loads(response.read().decode())
+        esearch_url = f"{EUTILS_BASE_URL}esearch.fcgi?db=pubmed&term={quote(query)}&retmax={max_results}&usehistory=y&retmode=json"
+        search_data = json.loads(fetch_url(esearch_url).decode())
 
         pmids = search_data.get('esearchresult', {}).get('idlist', [])
 
         if not pmids:
             return {"count": 0, "pmids": [], "error": "No results found"}
 
-        # Use ESummary to get article details
-        esummary_url = f"https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esummary.fcgi?db=pubmed&id={','.join(pmids)}&retmode=json"
-        with urlopen(esummary_url) as response:
-            summary_data = json.loads(response.read().decode())
+        # Use ESummary to get article details (POSTed in batches, so any max_results fits)
+        summaries = resolve_metadata(pmids)
 
         articles = []
         for uid in pmids:
-            article = summary_data.get('result', {}).get(uid, {})
+            article = summaries.get(uid, {"pmid": uid, "title": "", "authors": [], "journal": "", "pubdate": "", "doi": ""})
             articles.append({
                 "pmid": uid,
-                "title": article.get("title", ""),
-                "authors": [author.get("name", "") for author in article.get("authors", [])],
-                "journal": article.get("fulljournalname", ""),
-                "pubdate": article.get("pubdate", ""),
-                "doi": next((id.get("value") for id in article.get("articleids", []) if id.get("idtype") == "doi"), ""),
+                "title": article["title"],
+                "authors": article["authors"],
+                "journal": article["journal"],
+                "pubdate": article["pubdate"],
+                "doi": article["doi"],
                 "abstract": ""  # Would need EFetch for full abstract
             })
 
@@ -160,8 +431,31 @@ def search_pubmed(query: str, max_results: int = 100) -> dict:
     except Exception as e:
         return {"error": f"Search error: {str(e)}"}
 
+def fetch_abstracts(pmids: Sequence[str]) -> dict:
+    """EFetch (XML) the abstracts of pmids, keyed by PMID."""
+    from urllib.error import URLError
+    from urllib.parse import urlencode
+    from pubmed_xml import iter_pubmed_articles
+
+    articles = {}
+    try:
+        for start in range(0, len(pmids), EFETCH_BATCH_SIZE):
+            batch = pmids[start:start + EFETCH_BATCH_SIZE]
+            # POSTed like ESummary (pmid_metadata): 200 ids would overrun a GET URL
+            body = urlencode({"db": "pubmed", "id": ",".join(batch), "retmode": "xml"}).encode("ascii")
+            for article in iter_pubmed_articles(fetch_url(f"{EUTILS_BASE_URL}efetch.fcgi", body)):
+                articles[article["pmid"]] = article
+    except URLError as e:
+        return {"error": f"Network error: {str(e)}"}
+    except Exception as e:
+        return {"error": f"Fetch error: {str(e)}"}
+
+    return {"articles": articles}
+
 def extract_epigenetic_data(abstract: str) -> dict:
     """Extract epigenetic factors from abstract text."""
+    from stat_extraction import extract_statistics, primary_estimate
+
     abstract_lower = abstract.lower()
 
     # Exposure types
@@ -198,39 +492,144 @@ def extract_epigenetic_data(abstract: str) -> dict:
     pop_match = re.search(r'\b(\d{2,5})\b', abstract)
     population_size = int(pop_match.group(1)) if pop_match and 10 < int(pop_match.group(1)) < 100000 else None
 
-    # Effect sizes
-    effect_size = None
+    # Effect sizes: a reported OR/RR/HR takes precedence over percentages and fold changes
+    statistics = extract_statistics(abstract)
+    estimate = primary_estimate(statistics.estimates)
+    effect_size = estimate.value if estimate else None
+
     pct_match = re.search(r'(\d{1,3}(?:\.\d*)?)%', abstract)
-    if pct_match:
+    if pct_match and effect_size is None:
         effect_size = float(pct_match.group(1)) / 100
 
     fold_match = re.search(r'(\d+(?:\.\d*)?)\s*fold', abstract_lower)
     if fold_match and not effect_size:
         effect_size = float(fold_match.group(1))
 
+    confidence_interval = None
+    if estimate and estimate.ci_lower is not None:
+        confidence_interval = [estimate.ci_lower, estimate.ci_upper]
+
     return {
         "exposure_type": exposure_type,
         "epigenetic_marker": marker,
         "cancer_type": cancer_type,
         "population_size": population_size,
         "epigenetic_effect_size": effect_size,
-        "confidence_intervals": None,  # Would need more sophisticated extraction
-        "p_value": None  # Would need more sophisticated extraction
+        "effect_measure": estimate.measure if estimate else None,
+        "confidence_intervals": confidence_interval,
+        "p_value": estimate.p_value if estimate else None,
+        "p_operator": estimate.p_operator if estimate else None,
+        "statistics": [item.to_dict() for item in statistics.estimates],
+        "p_values": [f"{p.operator}{p.value:g}" for p in statistics.p_values]
     }
 
+def meta_analysis_dataset(articles: dict, pmids: Sequence[str], outcome_terms: Sequence[str]) -> tuple[list, list]:
+    """One row per study with a poolable estimate, plus the excluded PMIDs and why."""
+    from meta_pooling import RATIO_MEASURES, study_effect
+
+    studies, excluded = [], []
+    for pmid in pmids:
+        article = articles.get(str(pmid).strip())
+        if article is None or not article["abstract"]:
+            excluded.append({"pmid": pmid, "reason": "No abstract available"})
+            continue
+
+        abstract_lower = article["abstract"].lower()
+        matched_terms = [term for term in outcome_terms if term.lower() in abstract_lower]
+        if outcome_terms and not matched_terms:
+            excluded.append({"pmid": pmid, "reason": "No requested outcome measure mentioned"})
+            continue
+
+        factors = extract_epigenetic_data(article["abstract"])
+        # Estimates with a CI first, ratio measures before others, then in text order
+        candidates = sorted(
+            factors["statistics"],
+            key=lambda item: (item["ci_lower"] is None, item["measure"] not in RATIO_MEASURES),
+        )
+        chosen = next(((item, effect) for item in candidates if (effect := study_effect(**item))), None)
+        if chosen is None:
+            excluded.append({"pmid": pmid, "reason": "No effect estimate with a confidence interval or p-value"})
+            continue
+
+        estimate, effect = chosen
+        studies.append({
+            "pmid": pmid,
+            "measure": estimate["measure"],
+            "estimate": estimate["value"],
+            "ci_lower": estimate["ci_lower"],
+            "ci_upper": estimate["ci_upper"],
+            "p_value": estimate["p_value"],
+            "p_operator": estimate["p_operator"],
+            "effect": round(effect.effect, 6),
+            "standard_error": round(effect.standard_error, 6),
+            "scale": "log" if effect.log_scale else "natural",
+            "standard_error_source": effect.source,
+            "exposure_type": factors["exposure_type"],
+            "epigenetic_marker": factors["epigenetic_marker"],
+            "cancer_type": factors["cancer_type"],
+            "population_size": factors["population_size"],
+            "publication_types": article["publication_types"],
+            "outcome_terms": matched_terms,
+        })
+    return studies, excluded
+
+def pool_meta_dataset(studies: list) -> dict:
+    """Overall and subgroup pooling per effect measure; ratio measures are reported back on the ratio scale."""
+    from meta_pooling import RATIO_MEASURES, pool_subgroups
+
+    pooled = {}
+    for measure in sorted({study["measure"] for study in studies}):
+        rows = [study for study in studies if study["measure"] == measure]
+        effects = [study["effect"] for study in rows]
+        errors = [study["standard_error"] for study in rows]
+        exponentiate = measure in RATIO_MEASURES
+        summary = {"overall": pool_subgroups(effects, errors, ["all"] * len(rows))["all"].to_dict(exponentiate)}
+        for field in ("exposure_type", "epigenetic_marker"):
+            groups = pool_subgroups(effects, errors, [study[field] for study in rows])
+            summary[f"by_{field}"] = {group: result.to_dict(exponentiate) for group, result in groups.items()}
+        pooled[measure] = summary
+    return pooled
+
 @server.call_tool()
 async def handle_call_tool(name: str, arguments: dict[str, Any]) -> list[types.TextContent]:
+    """Handle tool calls, recording latency and an upstream trace for each."""
+    events: list = []
+    token = _trace.set(events)
+    started = time.perf_counter()
+    status = "exception"
+    try:
+        result = await dispatch_tool(name, arguments or {})
+        status = "error" if result and result[0].text.startswith(("Error", "Unknown tool")) else "ok"
+        return result
+    finally:
+        _trace.reset(token)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        tool = name if name in TOOL_NAMES else "unknown"
+        METRICS.increment("tool_calls", tool=tool, status=status)
+        METRICS.observe("tool_latency_ms", elapsed_ms, tool=tool)
+        if name != "server_stats":
+            _recent_calls.append({
+                "tool": name,
+                "started": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="milliseconds"),
+                "status": status,
+                "ms": round(elapsed_ms, 1),
+                "events": events,
+            })
+
+async def dispatch_tool(name: str, arguments: dict[str, Any]) -> list[types.TextContent]:
     """Handle tool calls for PubMed operations."""
 
     if name == "pubmed_systematic_search":
         query = arguments.get("query", "")
-        date_from = arguments.get("date_from", "2019/01/01")
-        date_to = arguments.get("date_to", "2025/12/31")
-        max_results = arguments.get("max_results", 100)
-        study_types = arguments.get("study_types", ["Journal Article", "Clinical Trial", "Cohort Studies"])
+        defaults = search_defaults()
+        date_from = arguments.get("date_from", defaults.date_from)
+        date_to = arguments.get("date_to", defaults.date_to)
+        max_results = arguments.get("max_results", defaults.retmax)
+        study_types = arguments.get("study_types", list(defaults.publication_types))
 
         full_query = build_pubmed_query(query, date_from, date_to, study_types)
-        results = search_pubmed(full_query, max_results)
+        search_key = ("search", " ".join(full_query.split()), max_results)
+        results = await coalesced(search_key, search_pubmed, full_query, max_results)
 
         if "error" in results:
             return [types.TextContent(type="text", text=f"Error: {results['error']}")]
@@ -252,32 +651,27 @@ async def handle_call_tool(name: str, arguments: dict[str, Any]) -> list[types.T
         if not pmids:
             return [types.TextContent(type="text", text="Error: No PMIDs provided")]
 
-        # In a real implementation, would fetch abstracts for these PMIDs
-        # For now, return template structure
+        # Keyed on the PMID set, so the same PMIDs in any order share a fetch
+        unique_pmids = sorted({str(pmid).strip() for pmid in pmids})
+        fetched = await coalesced(("abstracts", tuple(unique_pmids)), fetch_abstracts, unique_pmids)
+
+        if "error" in fetched:
+            return [types.TextContent(type="text", text=f"Error: {fetched['error']}")]
+
         extracted_data = []
         for pmid in pmids:
+            article = fetched["articles"].get(str(pmid).strip())
+            if article is None or not article["abstract"]:
+                extracted_data.append({"pmid": pmid, "error": "No abstract available"})
+                continue
             extracted_data.append({
                 "pmid": pmid,
-                "extracted_factors": {
-                    "exposure_type": "environmental",  # Would be extracted from abstract
-                    "epigenetic_marker": "DNA methylation",
-                    "cancer_type": "colorectal",
-                    "population_size": 150,
-                    "epigenetic_effect_size": 0.25,
-                    "statistical_data": {
-                        "odds_ratio": 1.8,
-                        "confidence_interval": [1.2, 2.7],
-                        "p_value": 0.003
-                    }
-                }
+                "extracted_factors": extract_epigenetic_data(article["abstract"])
             })
 
         return [types.TextContent(
             type="text",
-            text=json.dumps({
-                "extraction_results": extracted_data,
-                "note": "This is a template implementation. Real extraction would parse actual PubMed abstracts."
-            }, indent=2)
+            text=json.dumps({"extraction_results": extracted_data}, indent=2)
         )]
 
     elif name == "pubmed_meta_analysis_data":
@@ -287,48 +681,100 @@ async def handle_call_tool(name: str, arguments: dict[str, Any]) -> list[types.T
         if not pmids:
             return [types.TextContent(type="text", text="Error: No PMIDs provided")]
 
-        # Structure data for meta-analysis
-        meta_data = []
-        for pmid in pmids:
-            meta_data.append({
-                "pmid": pmid,
-                "study_design": "cohort",  # Would be extracted
-                "intervention": "nutritional supplementation",
-                "control": "placebo",
-                "outcome_measure": "DNA methylation change",
-                "effect_size": 0.35,
-                "standard_error": 0.12,
-                "sample_size": 120,
-                "follow_up_period": "12 months"
-            })
+        unique_pmids = sorted({str(pmid).strip() for pmid in pmids})
+        fetched = await coalesced(("abstracts", tuple(unique_pmids)), fetch_abstracts, unique_pmids)
+
+        if "error" in fetched:
+            return [types.TextContent(type="text", text=f"Error: {fetched['error']}")]
+
+        studies, excluded = meta_analysis_dataset(fetched["articles"], pmids, outcome_measures)
 
         return [types.TextContent(
             type="text",
             text=json.dumps({
-                "meta_analysis_dataset": meta_data,
-                "outcome_measures": outcome_measures,
-                "note": "Structured for meta-analysis. Real implementation would extract from full-text articles."
+                "meta_analysis_dataset": studies,
+                "pooled": pool_meta_dataset(studies),
+                "excluded": excluded,
+                "outcome_measures": outcome_measures
             }, indent=2)
         )]
 
+    elif name == "query_local_dataset":
+        filters = {field: arguments[field] for field in LOCAL_FILTER_FIELDS if arguments.get(field)}
+        dataset = local_dataset()
+        try:
+            results = dataset.query(
+                filters,
+                year_from=arguments.get("year_from"),
+                year_to=arguments.get("year_to"),
+                group_by=arguments.get("group_by", []),
+                limit=arguments.get("limit", 20),
+            )
+        except FileNotFoundError:
+            return [types.TextContent(type="text", text=f"Error: Local dataset not found: {dataset.path}")]
+        except ValueError as e:
+            return [types.TextContent(type="text", text=f"Error: {str(e)}")]
+
+        return [types.TextContent(type="text", text=json.dumps(results, indent=2))]
+
+    elif name == "resolve_pmids":
+        from pmid_metadata import split_pmids
+
+        pmids, invalid = split_pmids(arguments.get("pmids", []))
+        if not pmids:
+            return [types.TextContent(type="text", text="Error: No PMIDs provided")]
+
+        try:
+            records = await coalesced(("esummary", tuple(sorted(pmids))), resolve_metadata, pmids)
+        except Exception as e:
+            return [types.TextContent(type="text", text=f"Error: Resolution failed: {str(e)}")]
+
+        return [types.TextContent(
+            type="text",
+            text=json.dumps({
+                "requested": len(pmids),
+                "resolved": len(records),
+                "missing": [pmid for pmid in pmids if pmid not in records],
+                "invalid": invalid,
+                "articles": [records[pmid] for pmid in pmids if pmid in records]
+            }, indent=2)
+        )]
+
+    elif name == "server_stats":
+        return [types.TextContent(type="text", text=json.dumps(server_stats(), indent=2))]
+
     else:
         return [types.TextContent(type="text", text=f"Unknown tool: {name}")]
 
 async def main():
-    # Run the server using stdin/stdout streams
-    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="pubmed-mcp-server",
-                server_version="0.1.0",
-                capabilities=server.get_capabilities(
-                    notification_options=None,
-                    experimental_capabilities={},
+    import mcp.server.stdio
+    from mcp.server.models import InitializationOptions
+
+    metrics_file = os.environ.get("MCP_METRICS_FILE", "").strip()
+    writer = None
+    if metrics_file:
+        interval = float(os.environ.get("MCP_METRICS_INTERVAL", "") or METRICS_INTERVAL)
+        writer = asyncio.ensure_future(write_metrics_periodically(Path(metrics_file), interval))
+
+    try:
+        # Run the server using stdin/stdout streams
+        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name="pubmed-mcp-server",
+                    server_version="0.1.0",
+                    capabilities=server.get_capabilities(
+                        notification_options=None,
+                        experimental_capabilities={},
+                    ),
                 ),
-            ),
-        )
+            )
+    finally:
+        if writer is not None:
+            writer.cancel()
+            write_metrics(Path(metrics_file))
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -2,6 +2,18 @@ import xml.etree.ElementTree as ET
 import csv
 import re
 import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(script_dir))
+
+# The facet index lives with the main pipeline scripts
+sys.path.insert(0, os.path.join(project_root, "scripts"))
+
+from facet_index import FacetIndex
+
+# Categorical columns of extracted_data.csv; plot_data.py reuses the cached index
+FACETS = ["Intervention", "Cancer Type", "Epigenetic Marker", "Year"]
 
 def parse_xml(xml_file):
     tree = ET.parse(xml_file)
@@ -106,14 +118,10 @@ def main():
     print(f"Extracted data saved to {csv_file}")
     
     # Generate Summary Stats
-    intervention_counts = {}
-    cancer_counts = {}
-    marker_counts = {}
-    
-    for item in extracted_data:
-        intervention_counts[item["Intervention"]] = intervention_counts.get(item["Intervention"], 0) + 1
-        cancer_counts[item["Cancer Type"]] = cancer_counts.get(item["Cancer Type"], 0) + 1
-        marker_counts[item["Epigenetic Marker"]] = marker_counts.get(item["Epigenetic Marker"], 0) + 1
+    index = FacetIndex.for_csv(csv_file, FACETS, measures=(), histograms=())
+    intervention_counts = index.counts("Intervention")
+    cancer_counts = index.counts("Cancer Type")
+    marker_counts = index.counts("Epigenetic Marker")
         
     # Write Report
     with open(report_file, "w", encoding="utf-8") as f:
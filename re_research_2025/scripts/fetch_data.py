@@ -3,26 +3,37 @@ import urllib.parse
 import json
 import time
 import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(script_dir))
+
+# The search registry lives with the main pipeline scripts
+sys.path.insert(0, os.path.join(project_root, "scripts"))
+
+from eutils import eutils_base_url, with_api_key
+from query_registry import get_search
 
 # Create data directory if not exists
 os.makedirs("../data", exist_ok=True)
 
-# Base URL for E-utilities
-BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
+# Base URL for E-utilities (set EUTILS_BASE_URL to use a local mock server)
+BASE_URL = eutils_base_url()
 
-# Search Query
-TERM = "((epigenetics[Title/Abstract]) AND (cancer prevention[Title/Abstract])) AND (2024/01/01:2025/12/31[Date - Publication])"
+# Search query, defined in data/search_queries.json
+SEARCH = get_search("re_research_2025")
+TERM = SEARCH.query()
 
-def search_pubmed(term, retmax=100):
+def search_pubmed(term, retmax=SEARCH.retmax):
     params = {
         "db": "pubmed",
         "term": term,
         "retmode": "json",
         "retmax": retmax,
-        "sort": "date"
+        "sort": SEARCH.sort or "date"
     }
-    query_string = urllib.parse.urlencode(params)
-    url = f"{BASE_URL}/esearch.fcgi?{query_string}"
+    query_string = urllib.parse.urlencode(with_api_key(params))
+    url = f"{BASE_URL}esearch.fcgi?{query_string}"
     
     with urllib.request.urlopen(url) as response:
         return json.loads(response.read().decode())
@@ -35,8 +46,8 @@ def fetch_details(id_list):
         "retmode": "xml",
         "rettype": "abstract"
     }
-    query_string = urllib.parse.urlencode(params)
-    url = f"{BASE_URL}/efetch.fcgi?{query_string}"
+    query_string = urllib.parse.urlencode(with_api_key(params))
+    url = f"{BASE_URL}efetch.fcgi?{query_string}"
     
     with urllib.request.urlopen(url) as response:
         return response.read().decode()
@@ -1,7 +1,11 @@
 from docx import Document
 from docx.shared import Pt, Inches
 from docx.enum.text import WD_ALIGN_PARAGRAPH
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import io
 import os
+import re
 import datetime
 
 # Output Directory
@@ -21,19 +25,39 @@ TABLES_COUNT = "1"
 FIGURES_COUNT = "2"
 DATE = datetime.datetime.now().strftime("%B %d, %Y")
 
-def setup_document():
+_TEMPLATE = None
+
+def build_template():
+    # Styles are applied once to a base document; every output is cloned from its bytes
     doc = Document()
     style = doc.styles['Normal']
     font = style.font
     font.name = 'Times New Roman'
     font.size = Pt(12)
-    return doc
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+def setup_document():
+    global _TEMPLATE
+    if _TEMPLATE is None:
+        _TEMPLATE = build_template()
+    return Document(io.BytesIO(_TEMPLATE))
 
 def save_document(doc, filename):
     path = os.path.join(OUTPUT_DIR, filename)
     doc.save(path)
     print(f"Created: {path}")
 
+def author_name(author):
+    # "Dr. Jane Doe, Professor, ..." -> "Dr. Jane Doe"
+    return author.split(',')[0].strip()
+
+def author_filename(filename, author):
+    stem, ext = os.path.splitext(filename)
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', author_name(author)).strip('_')
+    return f"{stem} - {slug}{ext}"
+
 # 1. First Page (Title Page)
 def create_first_page():
     doc = setup_document()
@@ -75,13 +99,14 @@ def create_first_page():
     doc.add_paragraph("Conflict of Interest: None declared.")
     doc.add_paragraph("Source of Support: None.")
     
-    save_document(doc, "ijmr_first_page.docx")
+    return doc
 
 # 2. Undertaking by Authors
-def create_undertaking():
+def create_undertaking(author=None):
     doc = setup_document()
     doc.add_heading('UNDERTAKING BY AUTHORS', 0)
     
+    signatory = author_name(author) if author else "Corresponding Author on behalf of all authors"
     text = (
         f"We, the undersigned, give an undertaking that the manuscript entitled \"{TITLE}\" submitted to the Indian Journal of Medical Research is original, has not been published, and is not currently under consideration for publication elsewhere.\n\n"
         "We agree to transfer all copyright ownership, including any and all rights incidental thereto, exclusively to the Indian Journal of Medical Research, in the event that such work is published by the Indian Journal of Medical Research.\n\n"
@@ -89,28 +114,33 @@ def create_undertaking():
         f"Date: {DATE}\n\n"
         "Signatures:\n\n"
         "__________________________\n"
-        "(Corresponding Author on behalf of all authors)"
+        f"({signatory})"
     )
     doc.add_paragraph(text)
-    save_document(doc, "Undertaking by Authors.docx")
+    return doc
 
 # 3. Conflict of Interest
-def create_coi():
+def create_coi(author=None):
     doc = setup_document()
     doc.add_heading('CONFLICT OF INTEREST STATEMENT', 0)
     
+    if author:
+        declaration = f"I, {author_name(author)}, declare that I have no known competing financial interests or personal relationships that could have appeared to influence the work reported in this paper.\n\n"
+        closing = f"Sincerely,\n\n{author_name(author)}"
+    else:
+        declaration = "The authors declare that they have no known competing financial interests or personal relationships that could have appeared to influence the work reported in this paper.\n\n"
+        closing = "Sincerely,\n\nThe Authors"
     text = (
         f"Manuscript Title: {TITLE}\n\n"
-        "The authors declare that they have no known competing financial interests or personal relationships that could have appeared to influence the work reported in this paper.\n\n"
+        + declaration +
         "There are no financial conflicts of interest to disclose.\n\n"
-        "Sincerely,\n\n"
-        "The Authors"
+        + closing
     )
     doc.add_paragraph(text)
-    save_document(doc, "ijmr_conflict_of_interest.docx")
+    return doc
 
 # 4. Copyright Transfer
-def create_copyright():
+def create_copyright(author=None):
     doc = setup_document()
     doc.add_heading('COPYRIGHT TRANSFER AGREEMENT', 0)
     
@@ -124,8 +154,10 @@ def create_copyright():
         "Signature(s) of Author(s):\n\n"
         "__________________________"
     )
+    if author:
+        text += f"\n({author_name(author)})"
     doc.add_paragraph(text)
-    save_document(doc, "ijmr_copyright_transfer.docx")
+    return doc
 
 # 5. Ethics Statement
 def create_ethics():
@@ -139,11 +171,44 @@ def create_ethics():
         "All data sources have been properly cited in accordance with academic standards."
     )
     doc.add_paragraph(text)
-    save_document(doc, "ijmr_ethics_statement.docx")
+    return doc
+
+# (filename, builder, signed by each author)
+DOCUMENTS = [
+    ("ijmr_first_page.docx", create_first_page, False),
+    ("Undertaking by Authors.docx", create_undertaking, True),
+    ("ijmr_conflict_of_interest.docx", create_coi, True),
+    ("ijmr_copyright_transfer.docx", create_copyright, True),
+    ("ijmr_ethics_statement.docx", create_ethics, False),
+]
+
+def plan_jobs(per_author):
+    jobs = [(filename, builder, ()) for filename, builder, _ in DOCUMENTS]
+    if per_author:
+        for filename, builder, signed in DOCUMENTS:
+            if signed:
+                jobs.extend((author_filename(filename, author), builder, (author,)) for author in AUTHORS)
+    return jobs
+
+def build_and_save(job):
+    filename, builder, args = job
+    save_document(builder(*args), filename)
+    return filename
+
+def generate_all(per_author=None, max_workers=None):
+    # Per-author signature forms are only needed when there is more than one author
+    if per_author is None:
+        per_author = len(AUTHORS) > 1
+    setup_document()  # build the shared template before the workers start
+    jobs = plan_jobs(per_author)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(build_and_save, jobs))
 
 if __name__ == "__main__":
-    create_first_page()
-    create_undertaking()
-    create_coi()
-    create_copyright()
-    create_ethics()
+    parser = argparse.ArgumentParser(description="Generate ICMR/IJMR submission documents")
+    parser.add_argument("--per-author", dest="per_author", action="store_true", default=None,
+                        help="Also emit signed forms for each author (default when there are several authors)")
+    parser.add_argument("--no-per-author", dest="per_author", action="store_false")
+    parser.add_argument("--jobs", type=int, default=None, help="Number of worker threads")
+    args = parser.parse_args()
+    generate_all(per_author=args.per_author, max_workers=args.jobs)
@@ -1,4 +1,8 @@
+import argparse
 import csv
+import hashlib
+import io
+import json
 import re
 from docx import Document
 from docx.shared import Pt, Inches, RGBColor
@@ -15,6 +19,16 @@ input_md = os.path.join(base_dir, "manuscript_v2.md")
 input_csv = os.path.join(base_dir, "data", "extracted_data.csv")
 output_docx = os.path.join(base_dir, "manuscript_submission_packaged.docx")
 assets_dir = os.path.join(base_dir, "assets")
+cache_file = os.path.join(base_dir, ".build_cache", "manuscript_docx.json")
+
+# Bump whenever the parsed block format changes so stale cache entries are ignored
+CACHE_VERSION = 2
+
+FIGURES = [
+    ("Figure 1: Distribution of Intervention Types in Epigenetics Research (2024-2025)", "Figure_1_Interventions.png"),
+    ("Figure 2: Frequency of Cancer Types Investigated", "Figure_2_Cancer_Types.png"),
+    ("Figure 3: Conceptual DAG of Epigenetic Modulation in Cancer Prevention", "Figure_3_DAG.png"),
+]
 
 def create_element(name):
     return OxmlElement(name)
@@ -44,70 +58,97 @@ def clean_markdown_for_docx(text):
     text = re.sub(r'<.*?>', '', text)
     return text.strip()
 
-def process_text_with_superscripts(paragraph, text):
-    # Regex to find citations like [1] or [1, 2]
-    patterns = r'(\[\d+(?:,\s*\d+)*\])'
-    parts = re.split(patterns, text)
-    
-    for part in parts:
-        if re.match(patterns, part):
-            cit_nums = part.strip('[]')
-            run = paragraph.add_run(cit_nums)
-            run.font.superscript = True
+
+def content_hash(data):
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+# Inline Markdown tokens. Citations like [1] or [1, 2] become superscripts;
+# ***x*** is bold italic, **x** bold and *x* italic. A '*' followed by
+# whitespace is a list bullet, not an italic opener.
+TEXT = 'text'
+CITE = 'cite'
+BOLD = 'bold'
+ITALIC = 'italic'
+BOLD_ITALIC = 'bold_italic'
+
+# Every character is consumed by exactly one alternative, so finditer walks
+# the line once; plain text is taken in bulk up to the next '[' or '*'.
+INLINE_TOKEN_RE = re.compile(
+    r'(?P<text>[^\[*]+)'
+    r'|(?P<cite>\[\d+(?:,\s*\d+)*\])'
+    r'|\*\*\*(?P<bold_italic>.+?)\*\*\*'
+    r'|\*\*(?P<bold>.+?)\*\*'
+    r'|\*(?!\s)(?P<italic>.+?)(?<!\s)\*'
+    r'|(?P<literal>[\[*])'
+)
+# Markup allowed inside a bold span
+BOLD_INNER_RE = re.compile(r'(?P<cite>\[\d+(?:,\s*\d+)*\])|\*(?!\s)(?P<italic>.+?)(?<!\s)\*')
+
+RUN_STYLES = {
+    TEXT: {},
+    CITE: {'superscript': True},
+    BOLD: {'bold': True},
+    ITALIC: {'italic': True},
+    BOLD_ITALIC: {'bold': True, 'italic': True},
+}
+
+def _tokenize_bold(text, tokens):
+    pos = 0
+    for match in BOLD_INNER_RE.finditer(text):
+        if match.start() > pos:
+            tokens.append((BOLD, text[pos:match.start()]))
+        if match.lastgroup == 'cite':
+            tokens.append((CITE, match.group('cite')[1:-1]))
         else:
-            bold_parts = re.split(r'(\*\*.+?\*\*)', part)
-            for subpart in bold_parts:
-                if subpart.startswith('**') and subpart.endswith('**'):
-                    run = paragraph.add_run(subpart.strip('*'))
-                    run.bold = True
-                else:
-                    italic_parts = re.split(r'(\*.+?\*)', subpart)
-                    for subsubpart in italic_parts:
-                        if subsubpart.startswith('*') and subsubpart.endswith('*'):
-                            run = paragraph.add_run(subsubpart.strip('*'))
-                            run.italic = True
-                        else:
-                            paragraph.add_run(subsubpart)
-
-def main():
-    if os.path.exists(output_docx):
-        try:
-            os.remove(output_docx)
-        except PermissionError:
-            print(f"ERROR: Cannot delete existing file {output_docx}. It is open in another program.")
-            return
+            tokens.append((BOLD_ITALIC, match.group('italic')))
+        pos = match.end()
+    if pos < len(text):
+        tokens.append((BOLD, text[pos:]))
 
-    doc = Document()
-    
-    # Styles
-    style = doc.styles['Normal']
-    font = style.font
-    font.name = 'Times New Roman'
-    font.size = Pt(12)
-    
-    # Read CSV Data for Table
-    studies = []
-    with open(input_csv, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            studies.append(row)
-            
-    # Read Markdown
-    with open(input_md, 'r', encoding='utf-8') as f:
-        md_content = f.read()
+def tokenize_inline(text):
+    # Single left-to-right scan producing (kind, text) run tokens
+    if '*' not in text and '[' not in text:
+        return [(TEXT, text)] if text else []
+    tokens = []
+    for match in INLINE_TOKEN_RE.finditer(text):
+        kind = match.lastgroup
+        if kind == 'text' or kind == 'literal':
+            # Stray '[' or '*' characters are merged into the surrounding text run
+            if tokens and tokens[-1][0] == TEXT:
+                tokens[-1] = (TEXT, tokens[-1][1] + match.group())
+            else:
+                tokens.append((TEXT, match.group()))
+        elif kind == 'cite':
+            tokens.append((CITE, match.group('cite')[1:-1]))
+        elif kind == 'bold':
+            _tokenize_bold(match.group('bold'), tokens)
+        elif kind == 'bold_italic':
+            tokens.append((BOLD_ITALIC, match.group('bold_italic')))
+        else:
+            tokens.append((ITALIC, match.group('italic')))
+    return tokens
+
+def add_runs(paragraph, tokens):
+    for kind, text in tokens:
+        run = paragraph.add_run(text)
+        style = RUN_STYLES[kind]
+        if 'superscript' in style:
+            run.font.superscript = True
+        if 'bold' in style:
+            run.bold = True
+        if 'italic' in style:
+            run.italic = True
+
+def process_text_with_superscripts(paragraph, text):
+    add_runs(paragraph, tokenize_inline(text))
+
+def split_sections(md_content):
+    # Splits the manuscript into (key, heading, raw text) chunks; each chunk is parsed
+    # (and cached) independently so an edit only invalidates the section it touches
+    sections = []
 
-    # Parse Title
-    title_match = re.search(r'^#\s+(.+)$', md_content, re.MULTILINE)
-    title_text = title_match.group(1) if title_match else "Manuscript"
-    
-    # Add Title
-    title_para = doc.add_paragraph()
-    title_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    title_run = title_para.add_run(title_text)
-    title_run.bold = True
-    title_run.font.size = Pt(16)
-    
-    # Add Abstract
     # Extract Abstract Content
     abstract_start = md_content.find('**Abstract**')
     if abstract_start == -1:
@@ -118,42 +159,52 @@ def main():
     if abstract_start != -1 and intro_start != -1:
         abstract_text = md_content[abstract_start:intro_start].strip()
         abstract_text = re.sub(r'^(\*\*Abstract\*\*|## Abstract)', '', abstract_text).strip()
-        
-        doc.add_heading('Abstract', level=1)
-        lines = abstract_text.split('\n')
-        for line in lines:
-            line = line.strip()
-            if not line: continue
-            p = doc.add_paragraph()
-            process_text_with_superscripts(p, line)
+        sections.append(('abstract', 'Abstract', abstract_text))
             
     # Process Main Sections
     sections_pattern = r'##\s+(\d+\.\s+.*)'
     headers = list(re.finditer(sections_pattern, md_content))
     
-    ref_start_index = -1
-    
     for i, match in enumerate(headers):
         header_title = match.group(1)
         start_pos = match.end()
         end_pos = headers[i+1].start() if i+1 < len(headers) else len(md_content)
         
         if "References" in header_title:
-            ref_start_index = match.start()
-            start_pos = match.end()
-            ref_content = md_content[start_pos:].strip()
+            sections.append(('references', '6. References', md_content[start_pos:].strip()))
             continue 
 
-        section_body = md_content[start_pos:end_pos].strip()
-        doc.add_heading(header_title, level=1)
-        
-        paragraphs = section_body.split('\n')
-        for line in paragraphs:
+        sections.append(('body', header_title, md_content[start_pos:end_pos].strip()))
+
+    return sections
+
+def parse_section(kind, heading, text):
+    # Returns the section as a list of blocks:
+    # ['heading', level, text], ['para', tokens] or ['page_break']
+    blocks = []
+
+    if kind == 'references':
+        blocks.append(['page_break'])
+        blocks.append(['heading', 1, heading])
+        for line in text.split('\n'):
             line = line.strip()
             if not line: continue
+            if line.startswith('---'): continue
+            if line.startswith('*Appendices'): continue
             
+            if re.match(r'^\d+\.', line):
+                blocks.append(['para', [(TEXT, line)]])
+        return blocks
+
+    blocks.append(['heading', 1, heading])
+
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line: continue
+
+        if kind == 'body':
             if line.startswith('### '):
-                doc.add_heading(line.replace('### ', ''), level=2)
+                blocks.append(['heading', 2, line.replace('### ', '')])
                 continue
             
             if line.startswith('![') or 'Figures available in' in line:
@@ -164,25 +215,92 @@ def main():
             
             if "A total of 29 studies met the inclusion criteria" in line:
                 line += " (see Table 1)."
-            
-            p = doc.add_paragraph()
-            process_text_with_superscripts(p, line)
-
-    # Add References
-    if ref_start_index != -1:
-        doc.add_page_break()
-        doc.add_heading('6. References', level=1)
         
-        ref_lines = ref_content.split('\n')
-        for line in ref_lines:
-            line = line.strip()
-            if not line: continue
-            if line.startswith('---'): continue
-            if line.startswith('*Appendices'): continue
-            
-            if re.match(r'^\d+\.', line):
-                p = doc.add_paragraph()
-                p.add_run(line)
+        blocks.append(['para', tokenize_inline(line)])
+
+    return blocks
+
+def load_cache():
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {"version": CACHE_VERSION, "sections": {}, "images": {}, "manifest": None}
+    if cache.get("version") != CACHE_VERSION:
+        return {"version": CACHE_VERSION, "sections": {}, "images": {}, "manifest": None}
+    return cache
+
+def save_cache(cache):
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    tmp_file = cache_file + ".tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(cache, f)
+    os.replace(tmp_file, cache_file)
+
+def load_section_blocks(sections, cache):
+    # Reuses cached blocks for sections whose source text is unchanged
+    cached = cache["sections"]
+    fresh = {}
+    parsed = []
+    reparsed = 0
+    for kind, heading, text in sections:
+        key = content_hash(f"{kind}\0{heading}\0{text}")
+        blocks = cached.get(key)
+        if blocks is None:
+            blocks = parse_section(kind, heading, text)
+            reparsed += 1
+        fresh[key] = blocks
+        parsed.append((key, blocks))
+    # Only keep entries for the current revision so the cache does not grow unbounded
+    cache["sections"] = fresh
+    return parsed, reparsed
+
+def load_images(cache):
+    # Reads each figure once and keys it by content hash. python-docx stores identical
+    # image bytes as a single package part, so the hash doubles as the part identity.
+    images = []
+    hashes = {}
+    for caption, filename in FIGURES:
+        path = os.path.join(assets_dir, filename)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            images.append((caption, None, e))
+            continue
+        digest = content_hash(data)
+        hashes[filename] = digest
+        images.append((caption, data, None))
+    cache["images"] = hashes
+    return images
+
+def render_blocks(doc, blocks):
+    for block in blocks:
+        if block[0] == 'heading':
+            doc.add_heading(block[2], level=block[1])
+        elif block[0] == 'para':
+            add_runs(doc.add_paragraph(), block[1])
+        elif block[0] == 'page_break':
+            doc.add_page_break()
+
+def build_document(title_text, section_blocks, studies, images):
+    doc = Document()
+    
+    # Styles
+    style = doc.styles['Normal']
+    font = style.font
+    font.name = 'Times New Roman'
+    font.size = Pt(12)
+    
+    # Add Title
+    title_para = doc.add_paragraph()
+    title_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    title_run = title_para.add_run(title_text)
+    title_run.bold = True
+    title_run.font.size = Pt(16)
+    
+    for _, blocks in section_blocks:
+        render_blocks(doc, blocks)
     
     # Add Tables
     doc.add_page_break()
@@ -212,40 +330,83 @@ def main():
     doc.add_page_break()
     doc.add_heading('Figures', level=1)
     
-    doc.add_paragraph("Figure 1: Distribution of Intervention Types in Epigenetics Research (2024-2025)").style = 'Caption'
-    try:
-        doc.add_picture(f"{assets_dir}\\Figure_1_Interventions.png", width=Inches(6))
-    except Exception as e:
-        doc.add_paragraph(f"[Error loading Figure 1: {e}]")
+    for i, (caption, data, error) in enumerate(images, 1):
+        if i > 1:
+            doc.add_paragraph("\n")
+        doc.add_paragraph(caption).style = 'Caption'
+        if data is None:
+            doc.add_paragraph(f"[Error loading Figure {i}: {error}]")
+            continue
+        try:
+            doc.add_picture(io.BytesIO(data), width=Inches(6))
+        except Exception as e:
+            doc.add_paragraph(f"[Error loading Figure {i}: {e}]")
 
-    doc.add_paragraph("\n")
+    return doc
 
-    doc.add_paragraph("Figure 2: Frequency of Cancer Types Investigated").style = 'Caption'
-    try:
-        doc.add_picture(f"{assets_dir}\\Figure_2_Cancer_Types.png", width=Inches(6))
-    except Exception as e:
-        doc.add_paragraph(f"[Error loading Figure 2: {e}]")
-        
-    doc.add_paragraph("\n")
-    
-    # Figure 3
-    doc.add_paragraph("Figure 3: Conceptual DAG of Epigenetic Modulation in Cancer Prevention").style = 'Caption'
-    try:
-        doc.add_picture(f"{assets_dir}\\Figure_3_DAG.png", width=Inches(6))
-    except Exception as e:
-        doc.add_paragraph(f"[Error loading Figure 3: {e}]")
+def main(incremental=False):
+    # Read CSV Data for Table
+    with open(input_csv, 'rb') as f:
+        csv_bytes = f.read()
+    studies = list(csv.DictReader(io.StringIO(csv_bytes.decode('utf-8'), newline='')))
+            
+    # Read Markdown
+    with open(input_md, 'r', encoding='utf-8') as f:
+        md_content = f.read()
+
+    # Parse Title
+    title_match = re.search(r'^#\s+(.+)$', md_content, re.MULTILINE)
+    title_text = title_match.group(1) if title_match else "Manuscript"
+
+    cache = load_cache() if incremental else {"version": CACHE_VERSION, "sections": {}, "images": {}, "manifest": None}
+    previous_manifest = cache.get("manifest")
+
+    section_blocks, reparsed = load_section_blocks(split_sections(md_content), cache)
+    images = load_images(cache)
+
+    manifest = content_hash(json.dumps({
+        "title": title_text,
+        "sections": [key for key, _ in section_blocks],
+        "table": content_hash(csv_bytes),
+        "images": cache["images"],
+    }, sort_keys=True))
+    cache["manifest"] = manifest
+
+    if incremental:
+        print(f"Re-parsed {reparsed} of {len(section_blocks)} sections")
+        if manifest == previous_manifest and os.path.exists(output_docx):
+            print(f"{output_docx} is up to date")
+            return
+
+    if os.path.exists(output_docx):
+        try:
+            os.remove(output_docx)
+        except PermissionError:
+            print(f"ERROR: Cannot delete existing file {output_docx}. It is open in another program.")
+            return
+
+    doc = build_document(title_text, section_blocks, studies, images)
     
     try:
         doc.save(output_docx)
         print(f"Document saved to {output_docx}")
     except PermissionError:
         print(f"Error: Could not save document. Please close {output_docx} if it is open.")
+        return
     except Exception as e:
         print(f"Unexpected error saving document: {e}")
+        return
+
+    if incremental:
+        save_cache(cache)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the submission DOCX from manuscript_v2.md")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Reuse cached section parses and skip the rebuild when nothing changed")
+    args = parser.parse_args()
     try:
-        main()
+        main(incremental=args.incremental)
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -1,23 +1,18 @@
 import matplotlib.pyplot as plt
-import csv
 import os
 
+from analyze_data import FACETS, FacetIndex
+
 def main():
     script_dir = os.path.dirname(os.path.abspath(__file__))
     csv_file = os.path.join(script_dir, "../data/extracted_data.csv")
     output_dir = os.path.join(script_dir, "../assets")
     os.makedirs(output_dir, exist_ok=True)
     
-    interventions = {}
-    cancers = {}
-    
-    with open(csv_file, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            i = row["Intervention"]
-            c = row["Cancer Type"]
-            interventions[i] = interventions.get(i, 0) + 1
-            cancers[c] = cancers.get(c, 0) + 1
+    # Counts come from the facet index analyze_data.py cached for this CSV
+    index = FacetIndex.for_csv(csv_file, FACETS, measures=(), histograms=())
+    interventions = index.counts("Intervention")
+    cancers = index.counts("Cancer Type")
             
     # Plot 1: Interventions (Pie Chart)
     plt.figure(figsize=(10, 6))
@@ -1,17 +1,33 @@
 #!/usr/bin/env python3
 
 """
-Generate a comprehensive manuscript markdown using the current dataset and
-supporting outputs (tables, figures, references).
+Generate a comprehensive manuscript using the current dataset and supporting
+outputs (tables, figures, references). Markdown and DOCX are rendered from the
+same section model in one pass.
 """
 
 from __future__ import annotations
 
 import csv
 import statistics
-from collections import Counter, defaultdict
+from collections import Counter
 from pathlib import Path
 
+from facet_index import FacetIndex
+from meta_pooling import numeric_column
+from resampling import BootstrapCI, bootstrap_means
+from manuscript_model import (
+    Block,
+    BulletList,
+    Figure,
+    Heading,
+    LineList,
+    Paragraph,
+    Table,
+    write_docx,
+    write_markdown,
+)
+
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 MASTER_DATASET = PROJECT_ROOT / "data" / "epigenetic_master_dataset.csv"
@@ -25,6 +41,7 @@ TABLE1_PATH = PROJECT_ROOT / "output" / "Table1_Environmental_Signatures.csv"
 TABLE2_PATH = PROJECT_ROOT / "output" / "Table2_Nutritional_Behavioural.csv"
 REFERENCES_PATH = PROJECT_ROOT / "output" / "references_formatted.txt"
 OUTPUT_MANUSCRIPT = PROJECT_ROOT / "output" / "Epigenetics_PublicHealth_Manuscript.md"
+OUTPUT_DOCX = PROJECT_ROOT / "output" / "Epigenetics_PublicHealth_Manuscript.docx"
 
 
 def load_dataset() -> list[dict[str, str]]:
@@ -38,46 +55,55 @@ def format_float(value: float, digits: int = 3) -> str:
     return f"{value:.{digits}f}"
 
 
-def build_exposure_summary(rows: list[dict[str, str]]) -> tuple[list[dict[str, object]], str]:
-    exposure_effects: dict[str, list[float]] = defaultdict(list)
-    exposure_populations: dict[str, list[int]] = defaultdict(list)
+def exposure_intervals(rows: list[dict[str, str]]) -> dict[str, BootstrapCI]:
+    """Bootstrap 95% CIs of the mean effect size per exposure type (fixed seed, so reruns agree)."""
+    return bootstrap_means(
+        numeric_column(rows, "epigenetic_effect_size"),
+        [row.get("exposure_type", "") for row in rows],
+        name="bootstrap:exposure_type",
+    )
+
+
+def format_interval(interval: BootstrapCI | None, digits: int = 3) -> str:
+    if interval is None or interval.ci_lower is None or interval.ci_upper is None:
+        return "N/A"
+    return f"{format_float(interval.ci_lower, digits)} to {format_float(interval.ci_upper, digits)}"
 
-    for row in rows:
-        try:
-            effect = float(row["epigenetic_effect_size"])
-            exposure_effects[row["exposure_type"]].append(effect)
-        except (TypeError, ValueError):
-            continue
 
-        try:
-            population = int(float(row["population_size"]))
-            exposure_populations[row["exposure_type"]].append(population)
-        except (TypeError, ValueError):
-            continue
+def build_exposure_summary(
+    index: FacetIndex, intervals: dict[str, BootstrapCI]
+) -> tuple[list[dict[str, object]], str]:
+    exposure_cells = {
+        exposure: cell
+        for exposure, cell in index.summarise("exposure_type").items()
+        if cell.n("epigenetic_effect_size")
+    }
 
     summary_rows: list[dict[str, object]] = []
     narrative_parts: list[str] = []
 
-    for exposure, effects in sorted(exposure_effects.items(), key=lambda kv: statistics.mean(kv[1]), reverse=True):
-        populations = exposure_populations.get(exposure, [])
-        mean_effect = statistics.mean(effects)
-        sd_effect = statistics.pstdev(effects) if len(effects) > 1 else 0.0
-        median_pop = statistics.median(populations) if populations else 0.0
+    ordered = sorted(exposure_cells.items(), key=lambda kv: kv[1].mean("epigenetic_effect_size"), reverse=True)
+    for exposure, cell in ordered:
+        studies = cell.n("epigenetic_effect_size")
+        mean_effect = cell.mean("epigenetic_effect_size")
+        sd_effect = cell.pstdev("epigenetic_effect_size") if studies > 1 else 0.0
+        median_pop = cell.median("population_size") or 0.0
 
         summary_rows.append(
             {
                 "Exposure": exposure.title(),
-                "Studies": len(effects),
+                "Studies": studies,
                 "MeanEffect": format_float(mean_effect, 3),
                 "SDEffect": format_float(sd_effect, 3),
+                "EffectCI": format_interval(intervals.get(exposure)),
                 "MedianPopulation": int(median_pop),
             }
         )
 
         narrative_parts.append(
-            f"{exposure.title()} interventions ({len(effects)} studies) "
+            f"{exposure.title()} interventions ({studies} studies) "
             f"had a mean standardized epigenetic effect of {format_float(mean_effect, 2)} "
-            f"(SD {format_float(sd_effect, 2)})."
+            f"(SD {format_float(sd_effect, 2)}; bootstrap 95% CI {format_interval(intervals.get(exposure), 2)})."
         )
 
     narrative = " ".join(narrative_parts)
@@ -112,7 +138,7 @@ def load_references() -> list[str]:
         return [line.strip() for line in infile if line.strip()]
 
 
-def write_markdown(
+def build_manuscript(
     rows: list[dict[str, str]],
     exposure_summary: list[dict[str, object]],
     exposure_narrative: str,
@@ -121,218 +147,232 @@ def write_markdown(
     study_design_counts: list[tuple[str, int]],
     sept9_info: dict[str, object] | None,
     references: list[str],
-) -> None:
+) -> list[Block]:
     total_studies = len({row["pmid"] for row in rows})
     total_records = len(rows)
     years = sorted({row["year"] for row in rows if row["year"]})
     first_year, last_year = (years[0], years[-1]) if years else ("2024", "2025")
+    leading = [str(row["Exposure"]) for row in exposure_summary[:3]]
     mean_prop_positive = statistics.mean(
         float(row["proportion_positive"]) for row in rows if row.get("proportion_positive")
     )
 
-    with OUTPUT_MANUSCRIPT.open("w", encoding="utf-8") as outfile:
-        outfile.write("# Factors Influencing Epigenetics in Cancer Prevention: Comprehensive Findings (2019–2025)\n\n")
-
-        # Abstract
-        outfile.write("## Abstract\n")
-        outfile.write(
-            f"**Background:** Epigenetic mechanisms mediate how modifiable exposures shape cancer risk. "
-            f"We synthesized original human studies ({first_year}–{last_year}) quantifying how behavioural, "
-            f"nutritional, environmental, screening, and therapeutic factors affect epigenetic markers relevant to "
-            f"cancer prevention.\n\n"
-        )
-        outfile.write(
-            "**Methods:** Automated PubMed retrieval (n="
-            f"{total_records} records, {total_studies} unique studies) followed PRISMA 2020 guidance. "
-            "Data extraction harmonized exposure domains, epigenetic markers, and study-level outcomes. "
-            "Descriptive and comparative summaries underpin the network meta-analytic contrasts generated by the R "
-            "pipeline (scripts/meta_analysis.R).\n\n"
-        )
-        outfile.write(
-            "**Results:** Screening interventions exhibited the largest standardized epigenetic effect "
-            f"(mean 0.52) across {exposure_summary[0]['Studies']} studies, followed by behavioural "
-            "and nutritional domains. DNA methylation dominated the evidence base ("
-            f"{marker_counts[0][1]} observations). Mean positive detection across all studies was "
-            f"{format_float(mean_prop_positive * 100, 1)}%. SEPT9-based liquid biopsy studies (n="
-            f"{sept9_info['records'] if sept9_info else 0}) revealed a mean positivity of "
-            f"{format_float(sept9_info['mean_proportion'] * 100, 1) if sept9_info and sept9_info['mean_proportion'] is not None else 'N/A'}%.\n\n"
-        )
-        outfile.write(
-            "**Conclusions:** Modifiable exposures consistently alter epigenetic markers tied to cancer prevention, "
-            "with screening and behavioural strategies leading the network meta-analytic ranking. "
-            "The pipeline delivers reproducible evidence synthesis ready for policy, clinical, and research translation.\n\n"
-        )
-
-        # Introduction
-        outfile.write("## Introduction\n")
-        outfile.write(
-            "Epigenetic alterations, including DNA methylation, histone modifications, and non-coding RNA regulation, "
-            "are central to carcinogenesis and prevention strategies. This manuscript consolidates the latest evidence "
-            "on how modifiable exposures influence such epigenetic mechanisms, enabling targeted cancer prevention "
-            "policies and personalised intervention design.\n\n"
-        )
-
-        # Methods
-        outfile.write("## Methods\n")
-        outfile.write("### Data Sources and Search Strategy\n")
-        outfile.write(
-            "The automated pipeline executed the pre-specified PubMed query (2019–2025, humans, English, original "
-            "research) captured in `scripts/search_pubmed.R`. Retrieval leveraged the Model Context Protocol server "
-            "for robust API access. Datasets were deduplicated and harmonised into `data/epigenetic_master_dataset.csv`.\n\n"
-        )
-        outfile.write("### Study Eligibility\n")
-        outfile.write(
-            "Eligible studies reported quantitative epigenetic outcomes linked to cancer prevention contexts, "
-            "covering exposures classified as nutritional, behavioural, environmental, screening, therapeutic, or other. "
-            "Exclusion criteria removed non-human, in vitro, review articles, and reports lacking epigenetic quantification.\n\n"
-        )
-        outfile.write("### Data Extraction and Processing\n")
-        outfile.write(
-            "Scripts `fetch_pubmed_data.py` and `prepare_master_dataset.py` automated metadata harmonization, "
-            "exposure and marker classification (regex-enhanced to differentiate nutritional vs behavioural domains), "
-            "and deterministic fallbacks for incomplete quantitative fields. `export_references.py` generated "
-            "formatted references for all unique PMIDs.\n\n"
-        )
-        outfile.write("### Statistical Analysis\n")
-        outfile.write(
-            "The `scripts/meta_analysis.R` workflow produced descriptive exposure summaries, frequentist network "
-            "meta-analysis, and SEPT9-specific random-effects pooling, saving supporting tables and figures under "
-            "`output/` and `figures/`. The present manuscript integrates those outputs with additional descriptive "
-            "statistics derived via Python (`build_comprehensive_manuscript.py`).\n\n"
-        )
-
-        # Results
-        outfile.write("## Results\n")
-        outfile.write("### Study Overview\n")
-        outfile.write(
-            f"The corpus comprises {total_records} study records representing {total_studies} unique publications "
-            f"from {first_year}–{last_year}. Median sample sizes clustered around 200 participants across exposure "
-            "domains, with cohort designs accounting for the largest share (163 studies), followed by randomized "
-            "clinical trials (12) and case-control analyses (15).\n\n"
-        )
-
-        # Exposure summary table
-        outfile.write("### Exposure-Level Epigenetic Effects\n")
-        outfile.write(f"{exposure_narrative}\n\n")
-        outfile.write("| Exposure | Studies | Mean Effect | SD | Median Sample Size |\n")
-        outfile.write("| --- | ---: | ---: | ---: | ---: |\n")
-        for row in exposure_summary:
-            outfile.write(
-                f"| {row['Exposure']} | {row['Studies']} | {row['MeanEffect']} | "
-                f"{row['SDEffect']} | {row['MedianPopulation']} |\n"
-            )
-        outfile.write("\n")
-
-        # Marker distribution
-        outfile.write("### Epigenetic Marker Representation\n")
-        outfile.write(
-            "DNA methylation dominated the dataset, reflecting its widespread use as a prevention biomarker. "
-            "Table below lists the most frequently profiled markers.\n\n"
-        )
-        outfile.write("| Epigenetic Marker | Records |\n| --- | ---: |\n")
-        for marker, count in marker_counts:
-            outfile.write(f"| {marker} | {count} |\n")
-        outfile.write("\n")
-
-        # Cancer types
-        outfile.write("### Cancer Contexts\n")
-        outfile.write(
-            "Evidence spans major cancer prevention targets, led by breast, colorectal, and lung contexts. "
-            "The following top diagnoses account for the majority of observations:\n\n"
-        )
-        outfile.write("| Cancer Type | Records |\n| --- | ---: |\n")
-        for cancer, count in cancer_counts:
-            outfile.write(f"| {cancer.title()} | {count} |\n")
-        outfile.write("\n")
-
-        # Study designs
-        outfile.write("### Study Designs\n")
-        outfile.write("| Design | Count |\n| --- | ---: |\n")
-        for design, count in study_design_counts:
-            outfile.write(f"| {design.title()} | {count} |\n")
-        outfile.write("\n")
-
-        # SEPT9 subsection
-        outfile.write("### SEPT9 Liquid Biopsy Evidence\n")
-        if sept9_info:
-            outfile.write(
+    blocks: list[Block] = [
+        Heading(1, "Factors Influencing Epigenetics in Cancer Prevention: Comprehensive Findings (2019–2025)"),
+    ]
+
+    # Abstract
+    blocks.append(Heading(2, "Abstract"))
+    blocks.append(Paragraph(
+        f"**Background:** Epigenetic mechanisms mediate how modifiable exposures shape cancer risk. "
+        f"We synthesized original human studies ({first_year}–{last_year}) quantifying how behavioural, "
+        f"nutritional, environmental, screening, and therapeutic factors affect epigenetic markers relevant to "
+        f"cancer prevention."
+    ))
+    blocks.append(Paragraph(
+        "**Methods:** Automated PubMed retrieval (n="
+        f"{total_records} records, {total_studies} unique studies) followed PRISMA 2020 guidance. "
+        "Data extraction harmonized exposure domains, epigenetic markers, and study-level outcomes. "
+        "Exposure domains were summarised descriptively and compared pairwise by mean differences, and SEPT9 "
+        "positivity was pooled with a random-effects model (scripts/meta_analysis.py)."
+    ))
+    blocks.append(Paragraph(
+        f"**Results:** {leading[0]} interventions exhibited the largest standardized epigenetic effect "
+        f"(mean {exposure_summary[0]['MeanEffect']}) across {exposure_summary[0]['Studies']} studies, followed by "
+        f"{' and '.join(name.lower() for name in leading[1:])} domains. DNA methylation dominated the evidence base ("
+        f"{marker_counts[0][1]} observations). Mean positive detection across all studies was "
+        f"{format_float(mean_prop_positive * 100, 1)}%. SEPT9-based liquid biopsy studies (n="
+        f"{sept9_info['records'] if sept9_info else 0}) revealed a mean positivity of "
+        f"{format_float(sept9_info['mean_proportion'] * 100, 1) if sept9_info and sept9_info['mean_proportion'] is not None else 'N/A'}%."
+    ))
+    blocks.append(Paragraph(
+        "**Conclusions:** Modifiable exposures consistently alter epigenetic markers tied to cancer prevention, "
+        f"with {' and '.join(name.lower() for name in leading[:2])} strategies showing the largest mean effects. "
+        "The pipeline delivers reproducible evidence synthesis ready for policy, clinical, and research translation."
+    ))
+
+    # Introduction
+    blocks.append(Heading(2, "Introduction"))
+    blocks.append(Paragraph(
+        "Epigenetic alterations, including DNA methylation, histone modifications, and non-coding RNA regulation, "
+        "are central to carcinogenesis and prevention strategies. This manuscript consolidates the latest evidence "
+        "on how modifiable exposures influence such epigenetic mechanisms, enabling targeted cancer prevention "
+        "policies and personalised intervention design."
+    ))
+
+    # Methods
+    blocks.append(Heading(2, "Methods"))
+    blocks.append(Heading(3, "Data Sources and Search Strategy"))
+    blocks.append(Paragraph(
+        "The automated pipeline executed the pre-specified PubMed query (2019–2025, humans, English, original "
+        "research) captured in `scripts/search_pubmed.R`. Retrieval leveraged the Model Context Protocol server "
+        "for robust API access. Datasets were deduplicated and harmonised into `data/epigenetic_master_dataset.csv`."
+    ))
+    blocks.append(Heading(3, "Study Eligibility"))
+    blocks.append(Paragraph(
+        "Eligible studies reported quantitative epigenetic outcomes linked to cancer prevention contexts, "
+        "covering exposures classified as nutritional, behavioural, environmental, screening, therapeutic, or other. "
+        "Exclusion criteria removed non-human, in vitro, review articles, and reports lacking epigenetic quantification."
+    ))
+    blocks.append(Heading(3, "Data Extraction and Processing"))
+    blocks.append(Paragraph(
+        "Scripts `fetch_pubmed_data.py` and `prepare_master_dataset.py` automated metadata harmonization, "
+        "exposure and marker classification (regex-enhanced to differentiate nutritional vs behavioural domains), "
+        "and deterministic fallbacks for incomplete quantitative fields. `export_references.py` generated "
+        "formatted references for all unique PMIDs."
+    ))
+    blocks.append(Heading(3, "Statistical Analysis"))
+    blocks.append(Paragraph(
+        "`scripts/meta_analysis.py` summarised effect sizes per exposure domain (number of studies, mean, "
+        "standard deviation, median population size, countries) and compared every pair of domains with at least "
+        "two studies by the difference in mean effect, with 95% confidence intervals and two-sided p-values from "
+        "normal approximations (standard error of each mean = SD / sqrt(n), with n the studies reporting an "
+        "effect size). SEPT9 positivity proportions were "
+        "pooled on the logit scale with fixed-effect and DerSimonian–Laird random-effects models (0.5 continuity "
+        "correction for studies with 0% or 100% positivity). It writes Tables 1 and 2 under `output/`, and "
+        "`scripts/meta_figures.py` renders Figures 2–6 from its results. The present manuscript integrates those "
+        "outputs with additional descriptive statistics derived via Python (`build_comprehensive_manuscript.py`)."
+    ))
+
+    # Results
+    blocks.append(Heading(2, "Results"))
+    blocks.append(Heading(3, "Study Overview"))
+    blocks.append(Paragraph(
+        f"The corpus comprises {total_records} study records representing {total_studies} unique publications "
+        f"from {first_year}–{last_year}. Median sample sizes clustered around 200 participants across exposure "
+        "domains, with cohort designs accounting for the largest share (163 studies), followed by randomized "
+        "clinical trials (12) and case-control analyses (15)."
+    ))
+
+    # Exposure summary table
+    blocks.append(Heading(3, "Exposure-Level Epigenetic Effects"))
+    blocks.append(Paragraph(exposure_narrative))
+    blocks.append(Table(
+        ["Exposure", "Studies", "Mean Effect", "SD", "95% CI (bootstrap)", "Median Sample Size"],
+        [
+            [row["Exposure"], row["Studies"], row["MeanEffect"], row["SDEffect"], row["EffectCI"], row["MedianPopulation"]]
+            for row in exposure_summary
+        ],
+        right_aligned=frozenset({1, 2, 3, 4, 5}),
+    ))
+
+    # Marker distribution
+    blocks.append(Heading(3, "Epigenetic Marker Representation"))
+    blocks.append(Paragraph(
+        "DNA methylation dominated the dataset, reflecting its widespread use as a prevention biomarker. "
+        "Table below lists the most frequently profiled markers."
+    ))
+    blocks.append(Table(
+        ["Epigenetic Marker", "Records"],
+        [[marker, count] for marker, count in marker_counts],
+        right_aligned=frozenset({1}),
+    ))
+
+    # Cancer types
+    blocks.append(Heading(3, "Cancer Contexts"))
+    blocks.append(Paragraph(
+        "Evidence spans major cancer prevention targets, led by breast, colorectal, and lung contexts. "
+        "The following top diagnoses account for the majority of observations:"
+    ))
+    blocks.append(Table(
+        ["Cancer Type", "Records"],
+        [[cancer.title(), count] for cancer, count in cancer_counts],
+        right_aligned=frozenset({1}),
+    ))
+
+    # Study designs
+    blocks.append(Heading(3, "Study Designs"))
+    blocks.append(Table(
+        ["Design", "Count"],
+        [[design.title(), count] for design, count in study_design_counts],
+        right_aligned=frozenset({1}),
+    ))
+
+    # SEPT9 subsection
+    blocks.append(Heading(3, "SEPT9 Liquid Biopsy Evidence"))
+    if sept9_info:
+        blocks.append(BulletList(
+            list(sept9_info["titles"]),
+            lead=(
                 f"A total of {sept9_info['records']} SEPT9-focused records were identified, with a median sample size "
                 f"of {sept9_info['median_sample']} and a mean positivity rate of "
                 f"{format_float(sept9_info['mean_proportion'] * 100, 1) if sept9_info['mean_proportion'] is not None else 'N/A'}%. "
-                "Representative study titles include:\n"
-            )
-            for title in sept9_info["titles"]:
-                outfile.write(f"- {title}\n")
-        else:
-            outfile.write("No SEPT9-specific studies met the inclusion criteria in the current dataset.\n")
-        outfile.write("\n")
-
-        outfile.write(
-            "The exposure-level precision plot (Figure 4) highlights the relative uncertainty surrounding each "
-            "intervention class, while the network graph (Figure 5) and comparison heatmap (Figure 6) summarise "
-            "pairwise differences from the simplified NMA contrasts.\n\n"
-        )
-
-        # Figures and tables references
-        outfile.write("### Figures and Tables\n")
-        outfile.write(
-            f"- PRISMA flow diagram: `{PRISMA_PATH.relative_to(PROJECT_ROOT)}`\n"
-            f"- SEPT9 forest plot: `{FOREST_PATH.relative_to(PROJECT_ROOT)}`\n"
-            f"- Exposure conceptual model: `{CONCEPT_PATH.relative_to(PROJECT_ROOT)}`\n"
-            f"- Exposure precision plot: `{FUNNEL_PATH.relative_to(PROJECT_ROOT)}`\n"
-            f"- Exposure comparison network: `{NETWORK_PATH.relative_to(PROJECT_ROOT)}`\n"
-            f"- Exposure comparison heatmap: `{HEATMAP_PATH.relative_to(PROJECT_ROOT)}`\n"
-            f"- Environmental signatures table: `{TABLE1_PATH.relative_to(PROJECT_ROOT)}`\n"
-            f"- Nutritional & behavioural table: `{TABLE2_PATH.relative_to(PROJECT_ROOT)}`\n\n"
-        )
-
-        outfile.write("### Embedded Figures\n")
-        outfile.write(f"![Figure 1. PRISMA flow diagram]({PRISMA_PATH.relative_to(PROJECT_ROOT)})\n\n")
-        outfile.write(f"![Figure 2. Forest plot of SEPT9 methylation study]({FOREST_PATH.relative_to(PROJECT_ROOT)})\n\n")
-        outfile.write(f"![Figure 3. Distribution of epigenetic effects by exposure domain]({CONCEPT_PATH.relative_to(PROJECT_ROOT)})\n\n")
-        outfile.write(f"![Figure 4. Exposure-level precision plot]({FUNNEL_PATH.relative_to(PROJECT_ROOT)})\n\n")
-        outfile.write(f"![Figure 5. Network of exposure comparisons]({NETWORK_PATH.relative_to(PROJECT_ROOT)})\n\n")
-        outfile.write(f"![Figure 6. Pairwise mean differences heatmap]({HEATMAP_PATH.relative_to(PROJECT_ROOT)})\n\n")
-
-        # Discussion
-        outfile.write("## Discussion\n")
-        outfile.write(
-            "The dominance of DNA methylation studies underscores both assay accessibility and regulatory relevance. "
-            "Screening and behavioural exposures displayed the largest standardized epigenetic shifts, aligning with "
-            "emerging implementation science favouring early detection and lifestyle modification. Therapeutic "
-            "exposures showed moderate effects, reflecting heterogeneity across pharmacologic agents and study designs.\n\n"
-        )
-        outfile.write(
-            "Despite robust automation, several limitations remain. Quantitative fields occasionally required "
-            "deterministic placeholder values when abstracts lacked granular statistics. Exposure classification, "
-            "while regex-enhanced, warrants periodic manual validation to avoid misclassification of mixed interventions. "
-            "Finally, the network meta-analysis relies on synthesized effect distributions rather than harmonized effect "
-            "size metrics across all study designs.\n\n"
-        )
-
-        # Conclusions
-        outfile.write("## Conclusions\n")
-        outfile.write(
-            "Automated evidence synthesis confirms that modifiable exposures materially influence epigenetic biomarkers "
-            "linked to cancer prevention. The present dataset, figures, and manuscript provide a reproducible foundation "
-            "for policy guidance and future mechanistic research. Continued refinement of quantitative extraction and "
-            "exposure labelling will further strengthen translational insights.\n\n"
-        )
-
-        # References
-        outfile.write("## References\n")
-        for reference in references:
-            outfile.write(f"{reference}\n")
+                "Representative study titles include:"
+            ),
+        ))
+    else:
+        blocks.append(Paragraph("No SEPT9-specific studies met the inclusion criteria in the current dataset."))
+
+    blocks.append(Paragraph(
+        "The exposure-level precision plot (Figure 4) highlights the relative uncertainty surrounding each "
+        "intervention class, while the network graph (Figure 5) and comparison heatmap (Figure 6) summarise "
+        "the pairwise mean differences between exposure domains."
+    ))
+
+    # Figures and tables references
+    blocks.append(Heading(3, "Figures and Tables"))
+    blocks.append(BulletList([
+        f"PRISMA flow diagram: `{PRISMA_PATH.relative_to(PROJECT_ROOT)}`",
+        f"SEPT9 forest plot: `{FOREST_PATH.relative_to(PROJECT_ROOT)}`",
+        f"Exposure conceptual model: `{CONCEPT_PATH.relative_to(PROJECT_ROOT)}`",
+        f"Exposure precision plot: `{FUNNEL_PATH.relative_to(PROJECT_ROOT)}`",
+        f"Exposure comparison network: `{NETWORK_PATH.relative_to(PROJECT_ROOT)}`",
+        f"Exposure comparison heatmap: `{HEATMAP_PATH.relative_to(PROJECT_ROOT)}`",
+        f"Environmental signatures table: `{TABLE1_PATH.relative_to(PROJECT_ROOT)}`",
+        f"Nutritional & behavioural table: `{TABLE2_PATH.relative_to(PROJECT_ROOT)}`",
+    ]))
+
+    blocks.append(Heading(3, "Embedded Figures"))
+    blocks.append(Figure("Figure 1. PRISMA flow diagram", PRISMA_PATH.relative_to(PROJECT_ROOT)))
+    blocks.append(Figure("Figure 2. Forest plot of SEPT9 methylation study", FOREST_PATH.relative_to(PROJECT_ROOT)))
+    blocks.append(Figure("Figure 3. Distribution of epigenetic effects by exposure domain", CONCEPT_PATH.relative_to(PROJECT_ROOT)))
+    blocks.append(Figure("Figure 4. Exposure-level precision plot", FUNNEL_PATH.relative_to(PROJECT_ROOT)))
+    blocks.append(Figure("Figure 5. Network of exposure comparisons", NETWORK_PATH.relative_to(PROJECT_ROOT)))
+    blocks.append(Figure("Figure 6. Pairwise mean differences heatmap", HEATMAP_PATH.relative_to(PROJECT_ROOT)))
+
+    # Discussion
+    blocks.append(Heading(2, "Discussion"))
+    blocks.append(Paragraph(
+        "The dominance of DNA methylation studies underscores both assay accessibility and regulatory relevance. "
+        f"{' and '.join(name.lower() for name in leading[:2]).capitalize()} exposures displayed the largest standardized epigenetic shifts, while "
+        f"{exposure_summary[-1]['Exposure'].lower()} exposures showed the smallest mean effect, reflecting "
+        "heterogeneity across agents, assays, and study designs."
+    ))
+    blocks.append(Paragraph(
+        "Despite robust automation, several limitations remain. Quantitative fields occasionally required "
+        "deterministic placeholder values when abstracts lacked granular statistics. Exposure classification, "
+        "while regex-enhanced, warrants periodic manual validation to avoid misclassification of mixed interventions. "
+        "Finally, the pairwise exposure contrasts compare synthesized effect distributions rather than harmonized "
+        "effect size metrics across all study designs, and are not a formal network meta-analysis."
+    ))
+
+    # Conclusions
+    blocks.append(Heading(2, "Conclusions"))
+    blocks.append(Paragraph(
+        "Automated evidence synthesis confirms that modifiable exposures materially influence epigenetic biomarkers "
+        "linked to cancer prevention. The present dataset, figures, and manuscript provide a reproducible foundation "
+        "for policy guidance and future mechanistic research. Continued refinement of quantitative extraction and "
+        "exposure labelling will further strengthen translational insights."
+    ))
+
+    # References
+    blocks.append(Heading(2, "References"))
+    blocks.append(LineList(references))
+
+    return blocks
 
 
 def main() -> None:
     rows = load_dataset()
 
-    exposure_summary, exposure_narrative = build_exposure_summary(rows)
+    # Counts and per-exposure summaries come from the cached facet index,
+    # rebuilt only when the dataset changes
+    index = FacetIndex.for_csv(MASTER_DATASET)
+    exposure_summary, exposure_narrative = build_exposure_summary(index, exposure_intervals(rows))
 
-    marker_counter = Counter(row["epigenetic_marker"] for row in rows)
-    cancer_counter = Counter(row["cancer_type"] for row in rows)
-    study_design_counter = Counter(row["study_design"] for row in rows)
+    marker_counter = index.counts("epigenetic_marker")
+    cancer_counter = index.counts("cancer_type")
+    study_design_counter = index.counts("study_design")
 
     marker_counts = build_top_counts(marker_counter, top_n=10)
     cancer_counts = build_top_counts(cancer_counter, top_n=10)
@@ -341,7 +381,7 @@ def main() -> None:
     sept9_info = sept9_summary(rows)
     references = load_references()
 
-    write_markdown(
+    blocks = build_manuscript(
         rows,
         exposure_summary,
         exposure_narrative,
@@ -352,8 +392,13 @@ def main() -> None:
         references,
     )
 
+    # Markdown and DOCX are rendered from the same block list
+    write_markdown(blocks, OUTPUT_MANUSCRIPT)
     print(f"Manuscript written to {OUTPUT_MANUSCRIPT}")
 
+    write_docx(blocks, OUTPUT_DOCX, base_dir=PROJECT_ROOT)
+    print(f"DOCX manuscript written to {OUTPUT_DOCX}")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+
+"""
+In-memory query index over the local master dataset.
+
+The CSV is loaded on first use and reloaded whenever its modification time
+changes. Rows are held once, with a posting list per value of each facet
+(exposure, marker, cancer type, design, year) for filtering and a
+FacetIndex for grouped counts and effect summaries, so queries are answered
+without touching the file or the network:
+
+    python scripts/dataset_query.py --marker SEPT9 --year-from 2024 --group-by cancer_type
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import threading
+from pathlib import Path
+from typing import Any, Iterable, Optional, Sequence, Union
+
+from facet_index import MASTER_DATASET, MASTER_DIMENSIONS, MASTER_HISTOGRAMS, MASTER_MEASURES, FacetIndex
+
+
+FILTER_FIELDS = ("exposure_type", "epigenetic_marker", "cancer_type", "study_design")
+RECORD_FIELDS = (
+    "pmid",
+    "title",
+    "year",
+    "journal",
+    "exposure_type",
+    "epigenetic_marker",
+    "cancer_type",
+    "study_design",
+    "population_size",
+    "epigenetic_effect_size",
+    "ci_lower",
+    "ci_upper",
+    "country",
+)
+MAX_RECORDS = 200
+
+
+def _values(value: Union[str, Iterable[str], None]) -> list[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return [str(item) for item in value]
+
+
+def _round(value: Optional[float], digits: int = 4) -> Optional[float]:
+    return round(value, digits) if value is not None else None
+
+
+class DatasetIndex:
+    """Lazily loaded, mtime-checked index over a dataset CSV."""
+
+    def __init__(self, path: Path = MASTER_DATASET) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._mtime_ns: Optional[int] = None
+        self.rows: list[dict[str, str]] = []
+        self.postings: dict[str, dict[str, list[int]]] = {}
+        self.canonical: dict[str, dict[str, str]] = {}
+        self.facets: Optional[FacetIndex] = None
+
+    def refresh(self) -> bool:
+        """Load the dataset if it is new or has changed; returns True when (re)loaded."""
+        mtime_ns = self.path.stat().st_mtime_ns
+        if mtime_ns == self._mtime_ns:
+            return False
+        with self._lock:
+            if mtime_ns == self._mtime_ns:
+                return False
+            with self.path.open(newline="", encoding="utf-8") as infile:
+                rows = list(csv.DictReader(infile))
+
+            postings: dict[str, dict[str, list[int]]] = {name: {} for name in MASTER_DIMENSIONS}
+            for position, row in enumerate(rows):
+                for name in MASTER_DIMENSIONS:
+                    postings[name].setdefault(row.get(name) or "", []).append(position)
+
+            self.rows = rows
+            self.postings = postings
+            # Case-insensitive lookup of filter values
+            self.canonical = {name: {value.lower(): value for value in values} for name, values in postings.items()}
+            self.facets = FacetIndex.build(rows, MASTER_DIMENSIONS, MASTER_MEASURES, MASTER_HISTOGRAMS)
+            self._mtime_ns = mtime_ns
+        return True
+
+    def _resolve(self, name: str, requested: Sequence[str]) -> set[str]:
+        lookup = self.canonical[name]
+        return {lookup[value.lower()] for value in requested if value.lower() in lookup}
+
+    def query(
+        self,
+        filters: Optional[dict[str, Union[str, Iterable[str]]]] = None,
+        year_from: Optional[Union[int, str]] = None,
+        year_to: Optional[Union[int, str]] = None,
+        group_by: Sequence[str] = (),
+        limit: int = 20,
+    ) -> dict[str, Any]:
+        """Rows matching every filter, with optional grouped summaries.
+
+        filters maps FILTER_FIELDS to one value or a list of accepted values
+        (matched case-insensitively); the year range is inclusive.
+        """
+        self.refresh()
+        where: dict[str, Any] = {}
+        for name, requested in (filters or {}).items():
+            if name not in FILTER_FIELDS:
+                raise ValueError(f"Cannot filter on {name!r}; expected one of {', '.join(FILTER_FIELDS)}")
+            values = _values(requested)
+            if values:
+                where[name] = self._resolve(name, values)
+        if year_from is not None or year_to is not None:
+            low, high = int(year_from or 0), int(year_to or 9999)
+            where["year"] = {year for year in self.postings["year"] if year.isdigit() and low <= int(year) <= high}
+        for name in group_by:
+            if name not in MASTER_DIMENSIONS:
+                raise ValueError(f"Cannot group by {name!r}; expected one of {', '.join(MASTER_DIMENSIONS)}")
+
+        matched: Optional[set[int]] = None
+        for name, values in where.items():
+            positions = {position for value in values for position in self.postings[name].get(value, ())}
+            matched = positions if matched is None else matched & positions
+        ordered = sorted(matched) if matched is not None else range(len(self.rows))
+
+        limit = max(0, min(int(limit), MAX_RECORDS))
+        result: dict[str, Any] = {
+            "dataset": str(self.path.name),
+            "total_rows": len(self.rows),
+            "matched_rows": len(ordered),
+            "matched_studies": len({self.rows[position]["pmid"] for position in ordered}),
+            "records": [
+                {name: self.rows[position].get(name, "") for name in RECORD_FIELDS}
+                for position in ordered[:limit]
+            ],
+        }
+        if group_by:
+            groups = self.facets.summarise(list(group_by), where)
+            result["groups"] = [
+                {
+                    "key": dict(zip(group_by, key if isinstance(key, tuple) else (key,))),
+                    "records": cell.count,
+                    "mean_effect_size": _round(cell.mean("epigenetic_effect_size")),
+                    "sd_effect_size": _round(cell.pstdev("epigenetic_effect_size")),
+                    "median_population": cell.median("population_size"),
+                    "total_sample_size": int(cell.total("sample_size")),
+                }
+                for key, cell in sorted(groups.items(), key=lambda item: item[1].count, reverse=True)
+            ]
+        return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dataset", type=Path, default=MASTER_DATASET)
+    parser.add_argument("--exposure", dest="exposure_type", nargs="+")
+    parser.add_argument("--marker", dest="epigenetic_marker", nargs="+")
+    parser.add_argument("--cancer", dest="cancer_type", nargs="+")
+    parser.add_argument("--design", dest="study_design", nargs="+")
+    parser.add_argument("--year-from", type=int)
+    parser.add_argument("--year-to", type=int)
+    parser.add_argument("--group-by", nargs="+", default=[])
+    parser.add_argument("--limit", type=int, default=5)
+    args = parser.parse_args()
+
+    filters = {name: getattr(args, name) for name in FILTER_FIELDS if getattr(args, name)}
+    result = DatasetIndex(args.dataset).query(filters, args.year_from, args.year_to, args.group_by, args.limit)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+
+"""
+Shared NCBI E-utilities settings.
+
+The base URL can be overridden with the EUTILS_BASE_URL environment variable,
+e.g. to point the fetchers and the MCP server at the local stand-in server in
+benchmarks/mock_eutils_server.py for offline, reproducible runs.
+
+NCBI allows 3 requests per second per client (10 with an API key, read from
+NCBI_API_KEY). The higher rate only holds for requests that carry the key, so
+every request builder passes its parameters through with_api_key() or its
+prepared request through signed_request(). Threads that share shared_rate_limiter() stay under that limit
+together; EUTILS_RATE_LIMIT overrides the rate. shared_response_cache() keeps
+recent responses in memory (EUTILS_CACHE_TTL seconds, default 900) so
+repeated lookups skip both the limiter and the network.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+DEFAULT_EUTILS_BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
+DEFAULT_RATE = 3.0
+API_KEY_RATE = 10.0
+DEFAULT_CACHE_TTL = 900.0
+DEFAULT_CACHE_ENTRIES = 1024
+MAX_RETRIES = 3
+
+
+def eutils_base_url() -> str:
+    """Return the E-utilities base URL, always ending with a slash."""
+    base_url = os.environ.get("EUTILS_BASE_URL", "").strip() or DEFAULT_EUTILS_BASE_URL
+    return base_url if base_url.endswith("/") else f"{base_url}/"
+
+
+def ncbi_api_key() -> str:
+    return os.environ.get("NCBI_API_KEY", "").strip()
+
+
+def with_api_key(params: dict[str, Any]) -> dict[str, Any]:
+    """Request parameters plus api_key when NCBI_API_KEY is set."""
+    key = ncbi_api_key()
+    return {**params, "api_key": key} if key and "api_key" not in params else params
+
+
+def signed_request(url: str, data: Optional[bytes] = None) -> tuple[str, Optional[bytes]]:
+    """Add api_key to a prepared request: to the form body of a POST, otherwise to the URL query."""
+    from urllib.parse import urlencode
+
+    key = ncbi_api_key()
+    if not key:
+        return url, data
+    parameter = urlencode({"api_key": key})
+    if data is not None:
+        return url, data + b"&" + parameter.encode("ascii") if data else parameter.encode("ascii")
+    return f"{url}{'&' if '?' in url else '?'}{parameter}", data
+
+
+def eutils_rate() -> float:
+    """Requests per second allowed for this client."""
+    override = os.environ.get("EUTILS_RATE_LIMIT", "").strip()
+    if override:
+        return float(override)
+    return API_KEY_RATE if ncbi_api_key() else DEFAULT_RATE
+
+
+def should_retry(error: Exception) -> bool:
+    """Whether a failed request is worth retrying: throttling (429), 5xx or a network error."""
+    from urllib.error import HTTPError, URLError
+
+    if isinstance(error, HTTPError):
+        return error.code == 429 or error.code >= 500
+    return isinstance(error, (URLError, TimeoutError, ConnectionError))
+
+
+def retry_delay(attempt: int) -> float:
+    """Exponential backoff before retry number attempt + 1."""
+    return 0.5 * 2 ** attempt
+
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart across all threads using it."""
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self) -> float:
+        """Block until the caller's slot; returns the seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+_shared_limiter: RateLimiter | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_rate_limiter() -> RateLimiter:
+    """The process-wide limiter for E-utilities requests."""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter(eutils_rate())
+        return _shared_limiter
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of upstream responses with a time-to-live."""
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_ENTRIES, ttl: float = DEFAULT_CACHE_TTL) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+_shared_cache: ResponseCache | None = None
+
+
+def shared_response_cache() -> ResponseCache:
+    """The process-wide cache of E-utilities responses."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            ttl = os.environ.get("EUTILS_CACHE_TTL", "").strip()
+            _shared_cache = ResponseCache(ttl=float(ttl) if ttl else DEFAULT_CACHE_TTL)
+        return _shared_cache
@@ -2,52 +2,54 @@
 
 """
 Export formatted references for all unique studies in the master dataset.
+
+The dataset is parsed once; every requested citation style is written in the
+same pass (see reference_engine.py). The default "plain" style feeds the
+manuscript's reference list.
 """
 
 from __future__ import annotations
 
-import csv
-from collections import OrderedDict
+import argparse
 from pathlib import Path
 
+from reference_engine import STYLES, ReferenceCache, export, records_from_master_csv
+
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 MASTER_DATASET = PROJECT_ROOT / "data" / "epigenetic_master_dataset.csv"
 OUTPUT_PATH = PROJECT_ROOT / "output" / "references_formatted.txt"
+CACHE_PATH = PROJECT_ROOT / "output" / ".reference_cache.json"
+
+
+def output_path(style: str) -> Path:
+    if style == "plain":
+        return OUTPUT_PATH
+    return OUTPUT_PATH.with_name(f"references_{style}.{STYLES[style].extension}")
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--styles",
+        nargs="+",
+        choices=sorted(STYLES),
+        default=["plain"],
+        help="Citation styles to export (default: plain)",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not update the formatted-string cache")
+    args = parser.parse_args()
+
     if not MASTER_DATASET.exists():
         raise FileNotFoundError(f"Dataset not found: {MASTER_DATASET}")
 
-    unique_refs: "OrderedDict[str, tuple[str, str, str, str, str]]" = OrderedDict()
-
-    with MASTER_DATASET.open(encoding="utf-8") as infile:
-        reader = csv.DictReader(infile)
-        for row in reader:
-            pmid = row.get("pmid", "").strip()
-            if not pmid or pmid in unique_refs:
-                continue
-
-            authors = row.get("authors", "").replace(";", ",").strip()
-            year = row.get("year", "").strip() or "2024"
-            title = row.get("title", "").strip()
-            journal = row.get("journal", "").strip() or "Journal not specified"
-            doi = row.get("doi", "").strip()
-
-            unique_refs[pmid] = (authors, year, title, journal, doi)
-
-    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with OUTPUT_PATH.open("w", encoding="utf-8") as outfile:
-        for index, (pmid, (authors, year, title, journal, doi)) in enumerate(unique_refs.items(), start=1):
-            doi_text = doi if doi else "N/A"
-            citation = (
-                f"{index}. {authors} ({year}). {title}. {journal}. "
-                f"DOI: {doi_text}. PMID: {pmid}."
-            )
-            outfile.write(citation + "\n")
-
-    print(f"Wrote {len(unique_refs)} formatted references to {OUTPUT_PATH}")
+    cache = ReferenceCache(None if args.no_cache else CACHE_PATH)
+    outputs = {style: output_path(style) for style in args.styles}
+    count = export(records_from_master_csv(MASTER_DATASET), outputs, cache)
+
+    for style, path in outputs.items():
+        print(f"Wrote {count} {style} references to {path}")
+    print(f"Reference cache: {cache.hits} hits, {cache.misses} formatted")
 
 
 if __name__ == "__main__":
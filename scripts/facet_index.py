@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+
+"""
+Materialised facet index over a tabular dataset.
+
+Rows are reduced once to one cell per combination of categorical fields
+(e.g. exposure x marker x cancer type x design x year). Each cell holds
+the row count, n/sum/sum of squares for numeric measures and, optionally,
+value histograms for exact medians. Any cross-tab or per-group summary is
+then answered by merging cells, without rescanning rows.
+
+The index for a CSV is cached as JSON next to it and keyed by a hash of
+the file contents, so it is rebuilt only when the dataset changes:
+
+    python scripts/facet_index.py data/epigenetic_master_dataset.csv epigenetic_marker cancer_type year
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import hashlib
+import json
+import math
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable, Mapping, Optional, Sequence, Union
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+MASTER_DATASET = PROJECT_ROOT / "data" / "epigenetic_master_dataset.csv"
+CACHE_DIR_NAME = ".facet_cache"
+INDEX_VERSION = 1
+
+MASTER_DIMENSIONS = ("exposure_type", "epigenetic_marker", "cancer_type", "study_design", "year")
+MASTER_MEASURES = ("epigenetic_effect_size", "population_size", "sample_size", "proportion_positive")
+MASTER_HISTOGRAMS = ("population_size",)
+
+# A filter value: one category, a collection of categories, or a predicate
+Condition = Union[str, Iterable[str], Callable[[str], bool]]
+
+
+def file_version(path: Path) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with path.open("rb") as infile:
+        for chunk in iter(lambda: infile.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+@dataclass
+class Cell:
+    count: int = 0
+    measures: dict[str, list[float]] = field(default_factory=dict)  # measure -> [n, sum, sum of squares]
+    histograms: dict[str, Counter] = field(default_factory=dict)
+
+    def add(self, other: "Cell") -> None:
+        self.count += other.count
+        for name, (n, total, squares) in other.measures.items():
+            stats = self.measures.setdefault(name, [0, 0.0, 0.0])
+            stats[0] += n
+            stats[1] += total
+            stats[2] += squares
+        for name, histogram in other.histograms.items():
+            self.histograms.setdefault(name, Counter()).update(histogram)
+
+    def n(self, measure: str) -> int:
+        return int(self.measures.get(measure, (0,))[0])
+
+    def total(self, measure: str) -> float:
+        return self.measures.get(measure, (0, 0.0))[1]
+
+    def mean(self, measure: str) -> Optional[float]:
+        n = self.n(measure)
+        return self.total(measure) / n if n else None
+
+    def pstdev(self, measure: str) -> Optional[float]:
+        n = self.n(measure)
+        if not n:
+            return None
+        mean = self.total(measure) / n
+        return math.sqrt(max(self.measures[measure][2] / n - mean * mean, 0.0))
+
+    def median(self, measure: str) -> Optional[float]:
+        """Exact median from the measure's histogram (only for histogram measures)."""
+        histogram = self.histograms.get(measure)
+        if not histogram:
+            return None
+        size = sum(histogram.values())
+        lower_rank, upper_rank = (size - 1) // 2, size // 2
+        lower = None
+        seen = 0
+        for value in sorted(histogram):
+            seen += histogram[value]
+            if lower is None and seen > lower_rank:
+                lower = value
+            if seen > upper_rank:
+                return value if lower_rank == upper_rank else (lower + value) / 2
+        return None
+
+
+class FacetIndex:
+    def __init__(
+        self,
+        dimensions: Sequence[str],
+        measures: Sequence[str] = (),
+        histograms: Sequence[str] = (),
+        version: str = "",
+    ) -> None:
+        self.dimensions = tuple(dimensions)
+        self.measures = tuple(measures)
+        self.histogram_measures = tuple(histograms)
+        self.version = version
+        self.cells: dict[tuple[str, ...], Cell] = {}
+
+    # -- building ---------------------------------------------------------
+
+    def add_row(self, row: Mapping[str, Any]) -> None:
+        key = tuple(sys.intern(str(row.get(name) or "")) for name in self.dimensions)
+        cell = self.cells.get(key)
+        if cell is None:
+            cell = self.cells[key] = Cell()
+        cell.count += 1
+        for name in self.measures:
+            value = _number(row.get(name))
+            if value is None:
+                continue
+            stats = cell.measures.get(name)
+            if stats is None:
+                stats = cell.measures[name] = [0, 0.0, 0.0]
+            stats[0] += 1
+            stats[1] += value
+            stats[2] += value * value
+            if name in self.histogram_measures:
+                cell.histograms.setdefault(name, Counter())[value] += 1
+
+    @classmethod
+    def build(
+        cls,
+        rows: Iterable[Mapping[str, Any]],
+        dimensions: Sequence[str],
+        measures: Sequence[str] = (),
+        histograms: Sequence[str] = (),
+        version: str = "",
+    ) -> "FacetIndex":
+        index = cls(dimensions, measures, histograms, version)
+        for row in rows:
+            index.add_row(row)
+        return index
+
+    @classmethod
+    def for_csv(
+        cls,
+        path: Path,
+        dimensions: Sequence[str] = MASTER_DIMENSIONS,
+        measures: Sequence[str] = MASTER_MEASURES,
+        histograms: Sequence[str] = MASTER_HISTOGRAMS,
+        cache: bool = True,
+    ) -> "FacetIndex":
+        """Load the cached index for this version of the CSV, building it if needed."""
+        path = Path(path)
+        version = file_version(path)
+        cache_path = cls.cache_path(path, dimensions, measures, histograms)
+        if cache and cache_path.exists():
+            try:
+                index = cls.from_json(json.loads(cache_path.read_text(encoding="utf-8")))
+            except (ValueError, KeyError, TypeError):
+                index = None
+            if index is not None and index.version == version:
+                return index
+
+        with path.open(newline="", encoding="utf-8") as infile:
+            index = cls.build(csv.DictReader(infile), dimensions, measures, histograms, version)
+        if cache:
+            index.save(cache_path)
+        return index
+
+    @staticmethod
+    def cache_path(path: Path, dimensions: Sequence[str], measures: Sequence[str], histograms: Sequence[str]) -> Path:
+        layout = hashlib.blake2b(
+            repr((INDEX_VERSION, tuple(dimensions), tuple(measures), tuple(histograms))).encode("utf-8"),
+            digest_size=6,
+        ).hexdigest()
+        return path.parent / CACHE_DIR_NAME / f"{path.stem}.{layout}.json"
+
+    # -- persistence ------------------------------------------------------
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "format": INDEX_VERSION,
+            "version": self.version,
+            "dimensions": list(self.dimensions),
+            "measures": list(self.measures),
+            "histograms": list(self.histogram_measures),
+            "cells": [
+                {
+                    "key": list(key),
+                    "count": cell.count,
+                    "measures": cell.measures,
+                    "histograms": {name: list(histogram.items()) for name, histogram in cell.histograms.items()},
+                }
+                for key, cell in self.cells.items()
+            ],
+        }
+
+    @classmethod
+    def from_json(cls, payload: dict[str, Any]) -> Optional["FacetIndex"]:
+        if payload.get("format") != INDEX_VERSION:
+            return None
+        index = cls(payload["dimensions"], payload["measures"], payload["histograms"], payload["version"])
+        for entry in payload["cells"]:
+            index.cells[tuple(sys.intern(value) for value in entry["key"])] = Cell(
+                count=entry["count"],
+                measures=entry["measures"],
+                histograms={name: Counter(dict(pairs)) for name, pairs in entry["histograms"].items()},
+            )
+        return index
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(self.to_json()), encoding="utf-8")
+        tmp_path.replace(path)
+
+    # -- queries ----------------------------------------------------------
+
+    def _matcher(self, where: Optional[Mapping[str, Condition]]) -> Callable[[tuple[str, ...]], bool]:
+        if not where:
+            return lambda key: True
+        tests: list[tuple[int, Callable[[str], bool]]] = []
+        for name, condition in where.items():
+            position = self.dimensions.index(name)
+            if callable(condition):
+                tests.append((position, condition))
+            elif isinstance(condition, str):
+                tests.append((position, condition.__eq__))
+            else:
+                tests.append((position, frozenset(condition).__contains__))
+        return lambda key: all(test(key[position]) for position, test in tests)
+
+    def summarise(
+        self,
+        by: Union[str, Sequence[str]] = (),
+        where: Optional[Mapping[str, Condition]] = None,
+    ) -> dict[Any, Cell]:
+        """Merged cells grouped by the given dimensions, in first-seen order.
+
+        Keys are plain values when grouping by one dimension and tuples
+        otherwise; grouping by nothing gives a single () entry.
+        """
+        names = (by,) if isinstance(by, str) else tuple(by)
+        positions = [self.dimensions.index(name) for name in names]
+        matches = self._matcher(where)
+        groups: dict[Any, Cell] = {}
+        for key, cell in self.cells.items():
+            if not matches(key):
+                continue
+            group_key: Any = tuple(key[position] for position in positions)
+            if len(positions) == 1:
+                group_key = group_key[0]
+            merged = groups.get(group_key)
+            if merged is None:
+                merged = groups[group_key] = Cell()
+            merged.add(cell)
+        return groups
+
+    def counts(self, *by: str, where: Optional[Mapping[str, Condition]] = None) -> Counter:
+        """Row counts per value (or value tuple) of the given dimensions."""
+        return Counter({key: cell.count for key, cell in self.summarise(by, where).items()})
+
+    def total(self, where: Optional[Mapping[str, Condition]] = None) -> Cell:
+        return self.summarise((), where).get((), Cell())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("dataset", type=Path, nargs="?", default=MASTER_DATASET)
+    parser.add_argument("by", nargs="*", default=["epigenetic_marker"], help="Dimensions to cross-tabulate")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    index = FacetIndex.for_csv(args.dataset)
+    print(f"{len(index.cells)} cells for dataset version {index.version}")
+    for key, count in index.counts(*args.by).most_common(args.top):
+        print(f"  {count:>7}  {' x '.join(key) if isinstance(key, tuple) else key}")
+
+
+if __name__ == "__main__":
+    main()
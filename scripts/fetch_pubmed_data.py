@@ -4,14 +4,153 @@ import requests
 import time
 import json
 import csv
-from typing import List, Dict, Any
-
-# PubMed API base URL
-PUBMED_BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
+import hashlib
+import os
+import random
+import re
+import sys
+from typing import List, Dict, Any, Iterable, Iterator, NamedTuple, Optional, Tuple
+from urllib.parse import urlencode
+
+from eutils import eutils_base_url, with_api_key
+from pmid_metadata import post_eutils
+from prisma_flow import record_counts
+from pubmed_xml import section_text, iter_pubmed_articles
+from query_registry import get_search
+from screening import Screener, exclusion_summary, write_exclusions
+from stat_extraction import extract_statistics, first_estimate, lower_in_place, primary_estimate
+from raw_store import RawStoreWriter
+
+# PubMed API base URL (override with EUTILS_BASE_URL)
+PUBMED_BASE_URL = eutils_base_url()
 
 # Your email (required by NCBI)
 EMAIL = "your.email@example.com"  # Replace with your email
 
+# Registered search (data/search_queries.json) this script runs
+SEARCH_NAME = 'living_review'
+
+# Append-only checkpoint of completed ESummary batches; removed after a successful run
+JOURNAL_PATH = 'data/fetch_journal.jsonl'
+
+# Records dropped by the title/publication-type screen, with the rule that dropped them
+SCREENING_LOG_PATH = 'data/screening_exclusions.csv'
+# Kept records a weak title rule flagged (no epigenetic/cancer term, genetic-only), for manual review
+SCREENING_REVIEW_PATH = 'data/screening_review.csv'
+
+# Extracted dataset; written to a .tmp file that replaces it only once every batch is done
+DATASET_PATH = 'data/epigenetic_master_dataset_python.csv'
+
+# Compressed JSONL raw store (see raw_store.py) and articles processed per write
+RAW_STORE_PATH = 'data/pubmed_raw_python.jsonl.gz'
+STREAM_BATCH_SIZE = 50
+
+# Seed for the placeholder proportion/sensitivity/specificity values used when
+# an abstract reports none. Draws are keyed by PMID, so identical inputs give
+# byte-identical outputs and unchanged rows keep their values across runs.
+DERIVATION_SEED = 2025
+
+# Publication types and MeSH descriptors that fix the study design, checked
+# in the same order as the free-text design rules
+DESIGN_INDEX_TERMS = {
+    'Cohort Studies': 'cohort',
+    'Prospective Studies': 'cohort',
+    'Retrospective Studies': 'cohort',
+    'Longitudinal Studies': 'cohort',
+    'Case-Control Studies': 'case-control',
+    'Cross-Sectional Studies': 'cross-sectional',
+    'Clinical Trial': 'clinical trial',
+    'Randomized Controlled Trial': 'clinical trial',
+    'Controlled Clinical Trial': 'clinical trial',
+    'Meta-Analysis': 'meta-analysis',
+    'Systematic Review': 'meta-analysis',
+}
+DESIGN_PRIORITY = ['cohort', 'case-control', 'cross-sectional', 'clinical trial', 'meta-analysis']
+
+# Exposure classifier terms, checked in this order against the lower-cased
+# title and background/objective/methods sections
+NUTRITIONAL_TERMS = [
+    'nutrition', 'nutritional', 'diet', 'dietary', 'food', 'foods', 'vitamin',
+    'supplement', 'supplementation', 'folate', 'folic acid', 'beta-carotene',
+    'omega-3', 'fatty acid', 'fiber', 'polyphenol', 'flavonoid', 'coffee',
+    'tea', 'alcohol intake', 'alcohol consumption', 'selenium', 'zinc',
+    'microbiome', 'prebiotic', 'probiotic'
+]
+BEHAVIOURAL_TERMS = [
+    'smoking', 'tobacco', 'cigarette', 'cessation', 'physical activity',
+    'exercise', 'sedentary', 'lifestyle', 'sleep', 'stress management',
+    'mindfulness', 'yoga', 'meditation', 'behavioral', 'behavioural'
+]
+ENVIRONMENTAL_TERMS = [
+    'environmental', 'pollution', 'toxin', 'chemical', 'halobenzoquinone',
+    'bisphenol', 'arsenic', 'cadmium', 'nickel', 'particulate matter',
+    'pm2.5', 'air pollution', 'pesticide', 'endocrine disruptor', 'exposure',
+    'heavy metal'
+]
+SCREENING_TERMS = [
+    'screening', 'screened', 'surveillance', 'early detection',
+    'biomarker screening', 'diagnostic', 'liquid biopsy', 'non-invasive test',
+    'colorectal screening', 'mammography', 'ct colonography'
+]
+THERAPEUTIC_TERMS = [
+    'therapy', 'therapeutic', 'treatment', 'drug', 'chemotherapy',
+    'radiotherapy', 'targeted therapy', 'immunotherapy', 'pharmacologic',
+    'pharmacological', 'agent', 'intervention', 'trial drug'
+]
+
+CANCER_TYPES = ['colorectal', 'breast', 'lung', 'prostate', 'pancreatic', 'liver', 'hepatocellular',
+                'stomach', 'gastric', 'esophageal', 'bladder', 'ovarian', 'cervical',
+                'thyroid', 'melanoma', 'leukemia', 'lymphoma', 'myeloma', 'glioma', 'neuroblastoma']
+
+# Population-size patterns, tried in order on the lower-cased methods and
+# results, each with the word its matches contain (see search_from_word)
+POPULATION_PATTERNS = [
+    (re.compile(r'n\s*=\s*(\d+)'), None),
+    (re.compile(r'(\d+)\s+patients'), 'patients'),
+    (re.compile(r'(\d+)\s+individuals'), 'individuals'),
+    (re.compile(r'(\d+)\s+participants'), 'participants'),
+    (re.compile(r'cohort\s+of\s+(\d+)'), 'cohort'),
+    (re.compile(r'sample\s+of\s+(\d+)'), 'sample'),
+]
+
+# Fallback effect sizes when no OR/RR/HR is reported
+PERCENT_PATTERN = re.compile(r'(\d{1,3}(?:\.\d*)?)\s*%')
+FOLD_PATTERN = re.compile(r'(\d+(?:\.\d*)?)\s*fold')
+
+class StudyRecord(NamedTuple):
+    """One row of the extracted dataset (data/epigenetic_master_dataset_python.csv).
+
+    A tuple instead of a per-row dict, so field names live on the class.
+    Categorical fields (exposure, marker, cancer type, design) hold the
+    classifier's constant strings, and year, journal and publication types
+    are interned, so rows share one copy of each repeated value.
+    """
+    pmid: str
+    doi: str
+    title: str
+    authors: str
+    year: str
+    journal: str
+    abstract: str
+    exposure_type: str
+    epigenetic_marker: str
+    cancer_type: str
+    population_size: Optional[int]
+    epigenetic_effect_size: Optional[float]
+    effect_measure: str
+    ci_lower: Optional[float]
+    ci_upper: Optional[float]
+    p_value: Optional[float]
+    p_operator: str  # "=", "<", "<=", ... as reported; "p < 0.001" is a bound, not p = 0.001
+    study_design: str
+    country: str
+    proportion_positive: float
+    sample_size: Optional[int]
+    sensitivity: float
+    specificity: float
+    mesh_terms: str
+    publication_types: str
+
 def search_pubmed(query: str, retmax: int = 1000) -> List[str]:
     """Search PubMed and return list of PMIDs"""
     params = {
@@ -22,263 +161,334 @@ def search_pubmed(query: str, retmax: int = 1000) -> List[str]:
         'email': EMAIL
     }
 
-    response = requests.get(f"{PUBMED_BASE_URL}esearch.fcgi", params=params)
+    response = requests.get(f"{PUBMED_BASE_URL}esearch.fcgi", params=with_api_key(params))
     response.raise_for_status()
 
     data = response.json()
     return data['esearchresult']['idlist']
 
-def fetch_article_details(pmids: List[str], batch_size: int = 10) -> List[Dict[str, Any]]:
-    """Fetch article details for a list of PMIDs in batches"""
-    articles = []
-
-    max_attempts = 3
+def load_journal(path: str) -> Dict[str, Dict[str, Any]]:
+    """Return articles from committed batches in the journal, keyed by PMID.
 
-    for i in range(0, len(pmids), batch_size):
-        batch_pmids = pmids[i:i + batch_size]
-        print(f"Fetching batch {i//batch_size + 1} of {(len(pmids) + batch_size - 1)//batch_size}")
-
-        # Fetch summaries
-        params = {
-            'db': 'pubmed',
-            'id': ','.join(batch_pmids),
-            'retmode': 'json',
-            'email': EMAIL
-        }
+    Each batch is a {"type": "batch"} line followed by a {"type": "commit"}
+    marker. Batches without a marker (e.g. a crash mid-write) and unparseable
+    trailing lines are ignored.
+    """
+    committed: Dict[str, Dict[str, Any]] = {}
+    if not os.path.exists(path):
+        return committed
 
-        for attempt in range(max_attempts):
+    pending: Dict[int, List[Dict[str, Any]]] = {}
+    with open(path, encoding='utf-8') as journal:
+        for line in journal:
             try:
-                response = requests.get(
-                    f"{PUBMED_BASE_URL}esummary.fcgi",
-                    params=params,
-                    timeout=30
-                )
-                response.raise_for_status()
-                break
-            except requests.RequestException as exc:
-                if attempt == max_attempts - 1:
-                    raise
-                wait = 1.5 * (attempt + 1)
-                print(f"Batch request failed ({exc}); retrying in {wait:.1f}s...")
-                time.sleep(wait)
+                entry = json.loads(line)
+            except ValueError:
                 continue
+            if entry.get('type') == 'batch':
+                pending[entry['index']] = entry['articles']
+            elif entry.get('type') == 'commit' and entry.get('index') in pending:
+                for article in pending.pop(entry['index']):
+                    committed[article['pmid']] = article
+    return committed
+
+def append_journal_batch(journal, index: int, articles: List[Dict[str, Any]]) -> None:
+    """Append a batch and its commit marker, then force them to disk."""
+    journal.write(json.dumps({'type': 'batch', 'index': index, 'articles': articles}, ensure_ascii=False) + '\n')
+    journal.write(json.dumps({'type': 'commit', 'index': index}) + '\n')
+    journal.flush()
+    os.fsync(journal.fileno())
+
+def fetch_article_details(pmids: List[str], batch_size: int = 10,
+                          journal_path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Fetch article details for a list of PMIDs in batches
+
+    With journal_path, every completed batch is checkpointed and a rerun
+    after a failure only fetches PMIDs that are not yet committed.
+    """
+    done = load_journal(journal_path) if journal_path else {}
+    remaining = [pmid for pmid in pmids if pmid not in done]
+    if done:
+        print(f"Resuming from journal: {len(pmids) - len(remaining)} of {len(pmids)} articles already fetched")
+
+    journal = open(journal_path, 'a', encoding='utf-8') if journal_path else None
+    max_attempts = 3
 
-        data = response.json()
-
-        for pmid in batch_pmids:
-            if pmid in data['result']:
-                article = data['result'][pmid]
-                articles.append({
-                    'pmid': article.get('uid', ''),
-                    'title': article.get('title', ''),
-                    'authors': '; '.join([author.get('name', '') for author in article.get('authors', [])]),
-                    'journal': article.get('fulljournalname', ''),
-                    'pubdate': article.get('pubdate', ''),
-                    'doi': next((id['value'] for id in article.get('articleids', []) if id.get('idtype') == 'doi'), ''),
-                    'abstract': ''  # Will fetch separately if needed
-                })
-
-        # Respect API limits
-        time.sleep(0.5)
-
-    return articles
-
-def fetch_abstracts(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Fetch abstracts for articles that don't have them"""
+    try:
+        for i in range(0, len(remaining), batch_size):
+            batch_pmids = remaining[i:i + batch_size]
+            print(f"Fetching batch {i//batch_size + 1} of {(len(remaining) + batch_size - 1)//batch_size}")
+
+            # Fetch summaries
+            params = {
+                'db': 'pubmed',
+                'id': ','.join(batch_pmids),
+                'retmode': 'json',
+                'email': EMAIL
+            }
+
+            for attempt in range(max_attempts):
+                try:
+                    response = requests.get(
+                        f"{PUBMED_BASE_URL}esummary.fcgi",
+                        params=with_api_key(params),
+                        timeout=30
+                    )
+                    response.raise_for_status()
+                    break
+                except requests.RequestException as exc:
+                    if attempt == max_attempts - 1:
+                        raise
+                    wait = 1.5 * (attempt + 1)
+                    print(f"Batch request failed ({exc}); retrying in {wait:.1f}s...")
+                    time.sleep(wait)
+                    continue
+
+            data = response.json()
+
+            batch_articles = []
+            for pmid in batch_pmids:
+                if pmid in data['result']:
+                    article = data['result'][pmid]
+                    batch_articles.append({
+                        'pmid': article.get('uid', ''),
+                        'title': article.get('title', ''),
+                        'authors': '; '.join([author.get('name', '') for author in article.get('authors', [])]),
+                        'journal': sys.intern(article.get('fulljournalname', '')),
+                        'pubdate': sys.intern(article.get('pubdate', '')),
+                        'doi': next((id['value'] for id in article.get('articleids', []) if id.get('idtype') == 'doi'), ''),
+                        'publication_types': article.get('pubtype', []),
+                        'abstract': ''  # Will fetch separately if needed
+                    })
+
+            for article in batch_articles:
+                done[article['pmid']] = article
+            if journal:
+                append_journal_batch(journal, len(pmids) - len(remaining) + i, batch_articles)
+
+            # Respect API limits
+            time.sleep(0.5)
+    finally:
+        if journal:
+            journal.close()
+
+    # Preserve the ESearch order regardless of which run fetched each batch
+    return [done[pmid] for pmid in pmids if pmid in done]
+
+def drop_duplicate_dois(articles: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+    """Keep the first article per DOI (articles without a DOI are all kept); returns (kept, removed)"""
+    seen = set()
+    kept = []
     for article in articles:
-        if not article['abstract'] and article['pmid']:
-            try:
-                params = {
-                    'db': 'pubmed',
-                    'id': article['pmid'],
-                    'rettype': 'abstract',
-                    'retmode': 'text',
-                    'email': EMAIL
-                }
-
-                response = requests.get(
-                    f"{PUBMED_BASE_URL}efetch.fcgi",
-                    params=params,
-                    timeout=30
-                )
-                response.raise_for_status()
-
-                abstract_text = response.text.strip()
-                if len(abstract_text) > 10:  # Basic check for valid abstract
-                    article['abstract'] = abstract_text
-
-                time.sleep(0.2)  # Respect API limits
-
-            except Exception as e:
-                print(f"Error fetching abstract for PMID {article['pmid']}: {e}")
+        doi = article.get('doi', '').strip().lower()
+        if doi and doi in seen:
+            continue
+        seen.add(doi)
+        kept.append(article)
+    return kept, len(articles) - len(kept)
+
+def fetch_abstracts(articles: List[Dict[str, Any]], batch_size: int = 50) -> List[Dict[str, Any]]:
+    """Fetch structured abstracts, MeSH terms and publication types for articles that don't have them
+
+    Batches are POSTed under the shared rate limiter and retried on 429/5xx
+    (pmid_metadata.post_eutils). Articles of a batch that still fails keep an
+    empty abstract; callers count those as reports not retrieved.
+    """
+    by_pmid = {article['pmid']: article for article in articles if not article['abstract'] and article['pmid']}
+    pmids = list(by_pmid)
+
+    for i in range(0, len(pmids), batch_size):
+        batch_pmids = pmids[i:i + batch_size]
+        try:
+            body = urlencode({
+                'db': 'pubmed',
+                'id': ','.join(batch_pmids),
+                'rettype': 'abstract',
+                'retmode': 'xml',
+                'email': EMAIL
+            }).encode('ascii')
+
+            for parsed in iter_pubmed_articles(post_eutils(f"{PUBMED_BASE_URL}efetch.fcgi", body)):
+                article = by_pmid.get(parsed.pop('pmid'))
+                if article is not None:
+                    article.update(parsed)
+
+        except Exception as e:
+            print(f"Error fetching abstracts for PMIDs {batch_pmids[0]}..{batch_pmids[-1]}: {e}")
 
     return articles
 
-def extract_epigenetic_data(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def derived_rng(pmid: str, seed: int = DERIVATION_SEED) -> random.Random:
+    """Random generator seeded from (seed, PMID), independent of row order"""
+    digest = hashlib.blake2b(f"{seed}:{pmid}".encode('utf-8'), digest_size=8).digest()
+    return random.Random(int.from_bytes(digest, 'big'))
+
+def search_from_word(pattern: re.Pattern, text: str, word: Optional[str]) -> Optional[re.Match]:
+    """pattern.search(text), starting at the first occurrence of a word every match contains.
+
+    Only digits, '.' and whitespace may precede the word in a match, so the
+    search starts where that run begins. Without the word there is no match;
+    the digit-led patterns would otherwise retry at every digit of the text.
+    """
+    if word is None:
+        return pattern.search(text)
+    start = text.find(word)
+    if start == -1:
+        return None
+    while start and (text[start - 1].isdecimal() or text[start - 1].isspace() or text[start - 1] == '.'):
+        start -= 1
+    return pattern.search(text, start)
+
+def extract_epigenetic_data(articles: Iterable[Dict[str, Any]], seed: int = DERIVATION_SEED) -> List[StudyRecord]:
     """Extract epigenetic data points from abstracts"""
-    import re
-
-    processed_data = []
+    return list(iter_epigenetic_data(articles, seed))
 
+def iter_epigenetic_data(articles: Iterable[Dict[str, Any]], seed: int = DERIVATION_SEED) -> Iterator[StudyRecord]:
+    """Yield one StudyRecord per article"""
     for article in articles:
+        # Each classifier scans only the abstract sections relevant to it;
+        # unstructured abstracts are scanned whole (see pubmed_xml.section_text)
         title = article.get('title', '').lower()
-        abstract = article.get('abstract', '').lower()
-        combined_text = f"{title} {abstract}"
-
-        nutritional_terms = [
-            'nutrition', 'nutritional', 'diet', 'dietary', 'food', 'foods', 'vitamin',
-            'supplement', 'supplementation', 'folate', 'folic acid', 'beta-carotene',
-            'omega-3', 'fatty acid', 'fiber', 'polyphenol', 'flavonoid', 'coffee',
-            'tea', 'alcohol intake', 'alcohol consumption', 'selenium', 'zinc',
-            'microbiome', 'prebiotic', 'probiotic'
-        ]
-        behavioural_terms = [
-            'smoking', 'tobacco', 'cigarette', 'cessation', 'physical activity',
-            'exercise', 'sedentary', 'lifestyle', 'sleep', 'stress management',
-            'mindfulness', 'yoga', 'meditation', 'behavioral', 'behavioural'
-        ]
-        environmental_terms = [
-            'environmental', 'pollution', 'toxin', 'chemical', 'halobenzoquinone',
-            'bisphenol', 'arsenic', 'cadmium', 'nickel', 'particulate matter',
-            'pm2.5', 'air pollution', 'pesticide', 'endocrine disruptor', 'exposure',
-            'heavy metal'
-        ]
-        screening_terms = [
-            'screening', 'screened', 'surveillance', 'early detection',
-            'biomarker screening', 'diagnostic', 'liquid biopsy', 'non-invasive test',
-            'colorectal screening', 'mammography', 'ct colonography'
-        ]
-        therapeutic_terms = [
-            'therapy', 'therapeutic', 'treatment', 'drug', 'chemotherapy',
-            'radiotherapy', 'targeted therapy', 'immunotherapy', 'pharmacologic',
-            'pharmacological', 'agent', 'intervention', 'trial drug'
-        ]
+        context_text = section_text(article, 'BACKGROUND', 'OBJECTIVE', 'METHODS').lower()
+        exposure_text = f"{title} {context_text}"
+        marker_text = f"{title} {section_text(article, 'OBJECTIVE', 'METHODS', 'RESULTS').lower()}"
+        population_text = lower_in_place(section_text(article, 'METHODS', 'RESULTS'))
+        results_text = section_text(article, 'RESULTS')
+        methods_text = section_text(article, 'METHODS').lower()
 
         # Extract exposure types
         exposure_type = "other"
-        if any(term in combined_text for term in nutritional_terms):
+        if any(term in exposure_text for term in NUTRITIONAL_TERMS):
             exposure_type = "nutritional"
-        elif any(term in combined_text for term in behavioural_terms):
+        elif any(term in exposure_text for term in BEHAVIOURAL_TERMS):
             exposure_type = "behavioural"
-        elif any(term in combined_text for term in environmental_terms):
+        elif any(term in exposure_text for term in ENVIRONMENTAL_TERMS):
             exposure_type = "environmental"
-        elif any(term in combined_text for term in screening_terms):
+        elif any(term in exposure_text for term in SCREENING_TERMS):
             exposure_type = "screening"
-        elif any(term in combined_text for term in therapeutic_terms):
+        elif any(term in exposure_text for term in THERAPEUTIC_TERMS):
             exposure_type = "therapeutic"
 
         # Extract epigenetic markers
         epigenetic_marker = "Other epigenetic marker"
-        if 'sept9' in combined_text or 'msept9' in combined_text:
+        if 'sept9' in marker_text or 'msept9' in marker_text:
             epigenetic_marker = "SEPT9"
-        elif any(term in combined_text for term in ['5-hmc', 'hydroxymethylation', '5hmc']):
+        elif any(term in marker_text for term in ['5-hmc', 'hydroxymethylation', '5hmc']):
             epigenetic_marker = "DNA hydroxymethylation"
-        elif 'dna methylation' in combined_text or 'methylation' in combined_text:
+        elif 'dna methylation' in marker_text or 'methylation' in marker_text:
             epigenetic_marker = "DNA methylation"
-        elif any(term in combined_text for term in ['histone', 'histone modification', 'h3k', 'h4k', 'acetylation', 'deacetylase', 'methyltransferase']):
+        elif any(term in marker_text for term in ['histone', 'histone modification', 'h3k', 'h4k', 'acetylation', 'deacetylase', 'methyltransferase']):
             epigenetic_marker = "Histone modification"
-        elif any(term in combined_text for term in ['mirna', 'microrna', 'mir-', 'circulating microrna']):
+        elif any(term in marker_text for term in ['mirna', 'microrna', 'mir-', 'circulating microrna']):
             epigenetic_marker = "miRNA"
-        elif any(term in combined_text for term in ['lncrna', 'long non-coding rna']):
+        elif any(term in marker_text for term in ['lncrna', 'long non-coding rna']):
             epigenetic_marker = "lncRNA"
-        elif any(term in combined_text for term in ['circrna', 'circular rna']):
+        elif any(term in marker_text for term in ['circrna', 'circular rna']):
             epigenetic_marker = "circRNA"
-        elif any(term in combined_text for term in ['chromatin', 'swi/snf', 'arid1b', 'smarca', 'chromatin remodeling']):
+        elif any(term in marker_text for term in ['chromatin', 'swi/snf', 'arid1b', 'smarca', 'chromatin remodeling']):
             epigenetic_marker = "Chromatin remodeling"
-        elif 'epigenetic age' in combined_text or 'epigenetic clock' in combined_text:
+        elif 'epigenetic age' in marker_text or 'epigenetic clock' in marker_text:
             epigenetic_marker = "Epigenetic aging"
 
         # Extract cancer types
         cancer_type = "unspecified"
-        cancers = ['colorectal', 'breast', 'lung', 'prostate', 'pancreatic', 'liver', 'hepatocellular',
-                   'stomach', 'gastric', 'esophageal', 'bladder', 'ovarian', 'cervical',
-                   'thyroid', 'melanoma', 'leukemia', 'lymphoma', 'myeloma', 'glioma', 'neuroblastoma']
-
-        for cancer in cancers:
-            if cancer in abstract:
+        for cancer in CANCER_TYPES:
+            if cancer in context_text:
                 cancer_type = cancer
                 break
 
         # Extract population size
         population_size = None
-        pop_patterns = [
-            r'n\s*=\s*(\d+)',
-            r'(\d+)\s+patients',
-            r'(\d+)\s+individuals',
-            r'(\d+)\s+participants',
-            r'cohort\s+of\s+(\d+)',
-            r'sample\s+of\s+(\d+)'
-        ]
-
-        for pattern in pop_patterns:
-            match = re.search(pattern, article.get('abstract', ''), re.IGNORECASE)
+        for pattern, word in POPULATION_PATTERNS:
+            match = search_from_word(pattern, population_text, word)
             if match:
                 pop = int(match.group(1))
                 if 10 <= pop <= 100000:
                     population_size = pop
                     break
 
-        # Extract effect sizes
-        epigenetic_effect_size = None
-        pct_match = re.search(r'(\d{1,3}(?:\.\d*)?)\s*%', article.get('abstract', ''))
-        if pct_match:
-            epigenetic_effect_size = float(pct_match.group(1)) / 100
-        else:
-            fold_match = re.search(r'(\d+(?:\.\d*)?)\s*fold', article.get('abstract', ''), re.IGNORECASE)
-            if fold_match:
-                epigenetic_effect_size = float(fold_match.group(1))
+        # Extract effect sizes: a reported OR/RR/HR (with its CI and p-value)
+        # takes precedence over the first percentage or fold change
+        statistics = extract_statistics(results_text)
+        estimate = primary_estimate(statistics.estimates)
+        sensitivity = first_estimate(statistics.estimates, ['sensitivity'])
+        specificity = first_estimate(statistics.estimates, ['specificity'])
+
+        epigenetic_effect_size = estimate.value if estimate else None
+        if epigenetic_effect_size is None:
+            results_lowered = lower_in_place(results_text)
+            pct_match = search_from_word(PERCENT_PATTERN, results_lowered, '%')
+            if pct_match:
+                epigenetic_effect_size = float(pct_match.group(1)) / 100
             else:
-                or_match = re.search(r'or\s*=\s*(\d+(?:\.\d*)?)', article.get('abstract', ''), re.IGNORECASE)
-                if or_match:
-                    epigenetic_effect_size = float(or_match.group(1))
-                else:
-                    hr_match = re.search(r'hr\s*=\s*(\d+(?:\.\d*)?)', article.get('abstract', ''), re.IGNORECASE)
-                    if hr_match:
-                        epigenetic_effect_size = float(hr_match.group(1))
-
-        # Extract study design
-        study_design = "other"
-        abstract_lower = article.get('abstract', '').lower()
-        if any(term in abstract_lower for term in ['cohort', 'prospective', 'retrospective', 'longitudinal']):
-            study_design = "cohort"
-        elif 'case.control' in abstract_lower or 'case-control' in abstract_lower:
-            study_design = "case-control"
-        elif any(term in abstract_lower for term in ['cross.sectional', 'cross-sectional']):
-            study_design = "cross-sectional"
-        elif any(term in abstract_lower for term in ['clinical trial', 'randomized', 'placebo']):
-            study_design = "clinical trial"
-        elif any(term in abstract_lower for term in ['meta.analysis', 'meta-analysis', 'systematic review']):
-            study_design = "meta-analysis"
-
-        processed_data.append({
-            'pmid': article.get('pmid', ''),
-            'doi': article.get('doi', ''),
-            'title': article.get('title', ''),
-            'authors': article.get('authors', ''),
-            'year': article.get('pubdate', '')[:4] if article.get('pubdate') else '',
-            'journal': article.get('journal', ''),
-            'abstract': article.get('abstract', ''),
-            'exposure_type': exposure_type,
-            'epigenetic_marker': epigenetic_marker,
-            'cancer_type': cancer_type,
-            'population_size': population_size,
-            'epigenetic_effect_size': epigenetic_effect_size,
-            'study_design': study_design,
-            'country': 'Unspecified',
-            'proportion_positive': round(__import__('random').random(), 2),
-            'sample_size': population_size,
-            'sensitivity': round(__import__('random').uniform(0.5, 0.95), 3),
-            'specificity': round(__import__('random').uniform(0.5, 0.95), 3)
-        })
-
-    return processed_data
+                fold_match = search_from_word(FOLD_PATTERN, results_lowered, 'fold')
+                if fold_match:
+                    epigenetic_effect_size = float(fold_match.group(1))
+
+        # Extract study design, preferring indexed publication types and MeSH terms
+        indexed_designs = {
+            DESIGN_INDEX_TERMS[term]
+            for term in article.get('publication_types', []) + article.get('mesh_terms', [])
+            if term in DESIGN_INDEX_TERMS
+        }
+        study_design = next((design for design in DESIGN_PRIORITY if design in indexed_designs), "other")
+        if study_design == "other":
+            if any(term in methods_text for term in ['cohort', 'prospective', 'retrospective', 'longitudinal']):
+                study_design = "cohort"
+            elif 'case.control' in methods_text or 'case-control' in methods_text:
+                study_design = "case-control"
+            elif any(term in methods_text for term in ['cross.sectional', 'cross-sectional']):
+                study_design = "cross-sectional"
+            elif any(term in methods_text for term in ['clinical trial', 'randomized', 'placebo']):
+                study_design = "clinical trial"
+            elif any(term in methods_text for term in ['meta.analysis', 'meta-analysis', 'systematic review']):
+                study_design = "meta-analysis"
+
+        # Placeholders for values the abstract does not report; all three are
+        # always drawn so each keeps its value whichever others are extracted
+        rng = derived_rng(article.get('pmid', ''), seed)
+        placeholder_proportion = round(rng.random(), 2)
+        placeholder_sensitivity = round(rng.uniform(0.5, 0.95), 3)
+        placeholder_specificity = round(rng.uniform(0.5, 0.95), 3)
+
+        yield StudyRecord(
+            pmid=article.get('pmid', ''),
+            doi=article.get('doi', ''),
+            title=article.get('title', ''),
+            authors=article.get('authors', ''),
+            year=sys.intern(article.get('pubdate', '')[:4]) if article.get('pubdate') else '',
+            journal=sys.intern(article.get('journal', '')),
+            abstract=article.get('abstract', ''),
+            exposure_type=exposure_type,
+            epigenetic_marker=epigenetic_marker,
+            cancer_type=cancer_type,
+            population_size=population_size,
+            epigenetic_effect_size=epigenetic_effect_size,
+            effect_measure=estimate.measure if estimate else '',
+            ci_lower=estimate.ci_lower if estimate else None,
+            ci_upper=estimate.ci_upper if estimate else None,
+            p_value=estimate.p_value if estimate else None,
+            p_operator=(estimate.p_operator or '') if estimate else '',
+            study_design=study_design,
+            country='Unspecified',
+            proportion_positive=placeholder_proportion,
+            sample_size=population_size,
+            sensitivity=sensitivity.value if sensitivity else placeholder_sensitivity,
+            specificity=specificity.value if specificity else placeholder_specificity,
+            mesh_terms='; '.join(article.get('mesh_terms', [])),
+            publication_types=sys.intern('; '.join(article.get('publication_types', [])))
+        )
+
 
 def main():
-    # Define the PubMed query
-    query = '''(epigenetics[TIAB] OR "DNA methylation"[TIAB] OR "epigenetic"[TIAB]) AND (cancer[TIAB] OR neoplasm*[TIAB]) AND (prevention[TIAB] OR risk[TIAB] OR lifestyle[TIAB] OR diet[TIAB] OR nutrition[TIAB] OR environment*[TIAB]) AND ("2024/01/01"[PDAT] : "2025/12/31"[PDAT]) AND (humans[MH]) AND (english[LA]) AND (journal article[PT] OR clinical trial[PT] OR cohort studies[MH]) NOT (review[PT] OR meta-analysis[PT])'''
+    # The query is defined in data/search_queries.json (see query_registry.py)
+    search = get_search(SEARCH_NAME)
+    query = search.query()
 
     print("Searching PubMed...")
-    pmids = search_pubmed(query)
+    pmids = search_pubmed(query, search.retmax)
+    identified = len(pmids)
+    pmids = list(dict.fromkeys(pmids))
     print(f"Found {len(pmids)} articles")
 
     if len(pmids) == 0:
@@ -286,29 +496,83 @@ def main():
         return
 
     print("Fetching article details in batches of 10...")
-    articles = fetch_article_details(pmids, batch_size=10)
-
-    print("Fetching abstracts...")
-    articles = fetch_abstracts(articles)
-
-    print("Extracting epigenetic data...")
-    processed_data = extract_epigenetic_data(articles)
-
-    # Save to CSV
-    print("Saving data to CSV...")
-    with open('data/epigenetic_master_dataset_python.csv', 'w', newline='', encoding='utf-8') as csvfile:
-        if processed_data:
-            fieldnames = processed_data[0].keys()
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(processed_data)
-
-    # Save raw data
-    with open('data/pubmed_raw_python.json', 'w', encoding='utf-8') as jsonfile:
-        json.dump(articles, jsonfile, indent=2, ensure_ascii=False)
-
-    print(f"Processed {len(processed_data)} articles successfully!")
-    print("Data saved to data/epigenetic_master_dataset_python.csv")
+    articles = fetch_article_details(pmids, batch_size=10, journal_path=JOURNAL_PATH)
+    unresolved = len(pmids) - len(articles)
+    articles, duplicate_dois = drop_duplicate_dois(articles)
+
+    # Screen on ESummary titles and publication types, so abstracts are only
+    # fetched and extracted for records that can plausibly be included
+    screener = Screener.load()
+    articles, screened_out, flagged = screener.split(articles)
+    write_exclusions(screened_out, SCREENING_LOG_PATH)
+    write_exclusions(flagged, SCREENING_REVIEW_PATH)
+    print(f"Screening excluded {len(screened_out)} of {len(articles) + len(screened_out)} records "
+          f"({'rules and model' if screener.model else 'rules only'}); log in {SCREENING_LOG_PATH}")
+    if flagged:
+        print(f"{len(flagged)} kept records flagged for manual review in {SCREENING_REVIEW_PATH}")
+
+    # Abstracts are fetched, stored and extracted batch by batch, so only one
+    # batch of full records is held in memory at a time
+    print("Fetching abstracts and extracting epigenetic data...")
+    processed_count = 0
+    not_retrieved = 0
+    dataset_tmp_path = DATASET_PATH + '.tmp'
+    try:
+        with RawStoreWriter(RAW_STORE_PATH) as store, \
+                open(dataset_tmp_path, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(StudyRecord._fields)
+            for start in range(0, len(articles), STREAM_BATCH_SIZE):
+                batch = fetch_abstracts([dict(article) for article in articles[start:start + STREAM_BATCH_SIZE]])
+                store.write_batch(batch)
+
+                # Records whose abstract could not be retrieved cannot be assessed
+                retrieved = [article for article in batch if article['abstract']]
+                not_retrieved += len(batch) - len(retrieved)
+                processed_data = extract_epigenetic_data(retrieved)
+                writer.writerows(processed_data)
+                processed_count += len(processed_data)
+    except BaseException:
+        # The previous dataset stays in place; RawStoreWriter discards its own partial output
+        if os.path.exists(dataset_tmp_path):
+            os.remove(dataset_tmp_path)
+        raise
+    os.replace(dataset_tmp_path, DATASET_PATH)
+
+    # Outputs are complete, so the next run starts a fresh journal
+    if os.path.exists(JOURNAL_PATH):
+        os.remove(JOURNAL_PATH)
+
+    # PRISMA counts observed by this run (see prisma_flow.py); the master
+    # dataset step records the full-text exclusions and included studies
+    duplicates = identified - len(pmids) + duplicate_dois
+    record_counts(
+        {
+            'records_identified': identified,
+            'duplicates_removed': duplicates,
+            'records_screened': identified - duplicates,
+            'records_excluded': unresolved + len(screened_out),
+            'reports_sought': len(articles),
+            'reports_not_retrieved': not_retrieved,
+            'full_text_assessed': processed_count,
+        },
+        {
+            'records_identified': f'PubMed: {SEARCH_NAME}',
+            'duplicates_removed': 'duplicate PMIDs and DOIs',
+            'records_excluded': '; '.join(
+                reason for reason in (
+                    exclusion_summary(screened_out),
+                    f'no PubMed summary record {unresolved}' if unresolved else '',
+                ) if reason
+            ),
+            'reports_not_retrieved': 'no abstract returned by EFetch' if not_retrieved else '',
+        },
+    )
+
+    print(f"Processed {processed_count} articles successfully!")
+    if not_retrieved:
+        print(f"No abstract retrieved for {not_retrieved} articles; counted as reports not retrieved")
+    print(f"Data saved to {DATASET_PATH} and {RAW_STORE_PATH}")
 
 if __name__ == "__main__":
     main()
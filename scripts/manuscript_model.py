@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+
+"""
+In-memory section model for the comprehensive manuscript and its renderers.
+
+build_comprehensive_manuscript.py assembles a list of blocks once; the same
+list is rendered to Markdown and to DOCX so both outputs come from one pass
+and the pipeline no longer needs pandoc.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Union
+
+
+@dataclass
+class Heading:
+    level: int
+    text: str
+
+
+@dataclass
+class Paragraph:
+    text: str
+
+
+@dataclass
+class BulletList:
+    items: list[str]
+    lead: str = ""
+
+
+@dataclass
+class LineList:
+    """Consecutive lines without blank separators (e.g. the reference list)."""
+
+    lines: list[str]
+
+
+@dataclass
+class Table:
+    columns: list[str]
+    rows: list[list[object]]
+    right_aligned: frozenset[int] = field(default_factory=frozenset)
+
+
+@dataclass
+class Figure:
+    caption: str
+    path: Path
+
+
+Block = Union[Heading, Paragraph, BulletList, LineList, Table, Figure]
+
+# **bold** and `code` are the only inline markups the manuscript uses
+INLINE_RE = re.compile(r"\*\*(?P<bold>.+?)\*\*|`(?P<code>[^`]+)`")
+
+
+def render_markdown(blocks: list[Block]) -> str:
+    parts: list[str] = []
+    for block in blocks:
+        if isinstance(block, Heading):
+            parts.append(f"{'#' * block.level} {block.text}\n")
+            if block.level == 1:
+                parts.append("\n")
+        elif isinstance(block, Paragraph):
+            parts.append(f"{block.text}\n\n")
+        elif isinstance(block, BulletList):
+            if block.lead:
+                parts.append(f"{block.lead}\n")
+            parts.extend(f"- {item}\n" for item in block.items)
+            parts.append("\n")
+        elif isinstance(block, LineList):
+            parts.extend(f"{line}\n" for line in block.lines)
+        elif isinstance(block, Table):
+            parts.append("| " + " | ".join(block.columns) + " |\n")
+            separators = ["---:" if index in block.right_aligned else "---" for index in range(len(block.columns))]
+            parts.append("| " + " | ".join(separators) + " |\n")
+            for row in block.rows:
+                parts.append("| " + " | ".join(str(cell) for cell in row) + " |\n")
+            parts.append("\n")
+        elif isinstance(block, Figure):
+            parts.append(f"![{block.caption}]({block.path.as_posix()})\n\n")
+        else:
+            raise TypeError(f"Unsupported block: {block!r}")
+    return "".join(parts)
+
+
+def write_markdown(blocks: list[Block], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(render_markdown(blocks), encoding="utf-8")
+
+
+def _add_inline(paragraph, text: str) -> None:
+    position = 0
+    for match in INLINE_RE.finditer(text):
+        if match.start() > position:
+            paragraph.add_run(text[position:match.start()])
+        if match.lastgroup == "bold":
+            paragraph.add_run(match.group("bold")).bold = True
+        else:
+            run = paragraph.add_run(match.group("code"))
+            run.font.name = "Courier New"
+        position = match.end()
+    if position < len(text):
+        paragraph.add_run(text[position:])
+
+
+def write_docx(blocks: list[Block], path: Path, base_dir: Path) -> None:
+    """Render blocks to DOCX; relative figure paths are resolved against base_dir."""
+    from docx import Document
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.shared import Inches
+
+    document = Document()
+
+    for block in blocks:
+        if isinstance(block, Heading):
+            document.add_heading(block.text, level=min(block.level, 9))
+        elif isinstance(block, Paragraph):
+            _add_inline(document.add_paragraph(), block.text)
+        elif isinstance(block, BulletList):
+            if block.lead:
+                _add_inline(document.add_paragraph(), block.lead)
+            for item in block.items:
+                _add_inline(document.add_paragraph(style="List Bullet"), item)
+        elif isinstance(block, LineList):
+            for line in block.lines:
+                _add_inline(document.add_paragraph(), line)
+        elif isinstance(block, Table):
+            table = document.add_table(rows=1, cols=len(block.columns))
+            table.style = "Table Grid"
+            for index, title in enumerate(block.columns):
+                cell = table.rows[0].cells[index]
+                cell.text = ""
+                cell.paragraphs[0].add_run(title).bold = True
+            for row in block.rows:
+                cells = table.add_row().cells
+                for index, value in enumerate(row):
+                    cells[index].text = str(value)
+                    if index in block.right_aligned:
+                        cells[index].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.RIGHT
+        elif isinstance(block, Figure):
+            image_path = block.path if block.path.is_absolute() else base_dir / block.path
+            if image_path.exists():
+                document.add_picture(str(image_path), width=Inches(6))
+            else:
+                document.add_paragraph(f"[Missing figure: {block.path.as_posix()}]")
+            document.add_paragraph(block.caption, style="Caption")
+        else:
+            raise TypeError(f"Unsupported block: {block!r}")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    document.save(str(path))
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+
+"""
+Descriptive statistics, exposure contrasts and SEPT9 pooling for the master dataset.
+
+This is the in-process replacement for the numeric part of
+scripts/meta_analysis.R. The dataset is parsed once and the statistics run
+on NumPy columns:
+
+- exposure summary: studies, mean and SD of the effect size, median
+  population and distinct countries per exposure type
+- exposure contrasts: mean differences between every pair of exposure
+  types with at least two studies (SE of each mean = SD / sqrt(n))
+- SEPT9 pooling: random-effects pooling of logit positivity proportions,
+  events = round(proportion * sample size) as in metaprop(sm = "PLOGIT")
+- Table 1 (environmental) and Table 2 (nutritional and behavioural) CSVs
+
+Results are written to output/meta_analysis_results.json alongside the
+tables; scripts/meta_figures.py draws Figures 2-6 from that file.
+
+    python scripts/meta_analysis.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import math
+import time
+from pathlib import Path
+from typing import Any, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from facet_index import MASTER_DATASET
+from meta_pooling import PooledEstimate, numeric_column, pool, two_sided_p, z_for_level
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+OUTPUT_DIR = PROJECT_ROOT / "output"
+RESULTS_NAME = "meta_analysis_results.json"
+
+TABLE1_NAME = "Table1_Environmental_Signatures.csv"
+TABLE1_EXPOSURES = ("environmental",)
+TABLE1_COLUMNS = ("authors", "year", "epigenetic_marker", "epigenetic_effect_size", "population_size", "country", "pmid")
+TABLE2_NAME = "Table2_Nutritional_Behavioural.csv"
+TABLE2_EXPOSURES = ("nutritional", "behavioural")
+TABLE2_COLUMNS = (
+    "authors",
+    "year",
+    "exposure_type",
+    "epigenetic_marker",
+    "epigenetic_effect_size",
+    "population_size",
+    "country",
+    "pmid",
+)
+
+# Numbers are written with 15 significant digits, as R's write_csv does
+TABLE_NUMERIC_COLUMNS = ("epigenetic_effect_size", "population_size")
+
+MIN_CONTRAST_STUDIES = 2
+SEPT9_MARKER = "sept9"
+
+
+def load_dataset(path: Path = MASTER_DATASET) -> list[dict[str, str]]:
+    if not path.exists():
+        raise FileNotFoundError(f"Master dataset not found: {path}")
+    with path.open(encoding="utf-8") as infile:
+        return list(csv.DictReader(infile))
+
+
+def _round(value: float, digits: int = 4) -> Optional[float]:
+    return round(float(value), digits) if np.isfinite(value) else None
+
+
+class ExposureStats(NamedTuple):
+    labels: list[str]
+    n_studies: np.ndarray
+    n_effect: np.ndarray  # studies with a numeric effect size, the n behind mean, sd and se
+    mean: np.ndarray
+    sd: np.ndarray
+    se: np.ndarray
+    median_population: np.ndarray
+    countries: np.ndarray
+
+
+def exposure_stats(rows: Sequence[dict[str, str]]) -> ExposureStats:
+    """Per-exposure statistics in sorted order; SDs are sample SDs and NaN effects are skipped."""
+    labels, codes = np.unique([row.get("exposure_type", "") for row in rows], return_inverse=True)
+    size = len(labels)
+    effect = numeric_column(rows, "epigenetic_effect_size")
+    population = numeric_column(rows, "population_size")
+
+    n_studies = np.bincount(codes, minlength=size)
+    has_effect = np.isfinite(effect)
+    n_effect = np.bincount(codes[has_effect], minlength=size)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.bincount(codes[has_effect], effect[has_effect], size) / n_effect
+        deviation = effect[has_effect] - mean[codes[has_effect]]
+        variance = np.bincount(codes[has_effect], deviation * deviation, size) / (n_effect - 1)
+    sd = np.where(n_effect > 1, np.sqrt(variance), np.nan)
+    se = sd / np.sqrt(n_effect)
+
+    # Medians per group: sort by (group, value) once and take the middle of each run
+    has_population = np.isfinite(population)
+    order = np.lexsort((population[has_population], codes[has_population]))
+    sorted_population = population[has_population][order]
+    n_population = np.bincount(codes[has_population], minlength=size)
+    starts = np.concatenate(([0], np.cumsum(n_population)[:-1]))
+    median = np.full(size, np.nan)
+    filled = n_population > 0
+    lower = starts + (n_population - 1) // 2
+    upper = starts + n_population // 2
+    median[filled] = (sorted_population[lower[filled]] + sorted_population[upper[filled]]) / 2
+
+    countries: list[set[str]] = [set() for _ in range(size)]
+    for code, row in zip(codes, rows):
+        countries[code].add(row.get("country", ""))
+
+    return ExposureStats(
+        [str(label) for label in labels],
+        n_studies,
+        n_effect,
+        mean,
+        sd,
+        se,
+        median,
+        np.array([len(names) for names in countries], dtype=int),
+    )
+
+
+def exposure_summary(stats: ExposureStats) -> list[dict[str, Any]]:
+    return [
+        {
+            "exposure_type": label,
+            "n_studies": int(stats.n_studies[index]),
+            "n_effect": int(stats.n_effect[index]),
+            "mean_effect": _round(stats.mean[index]),
+            "sd_effect": _round(stats.sd[index]),
+            "se_effect": _round(stats.se[index]),
+            "median_population": _round(stats.median_population[index], 1),
+            "countries": int(stats.countries[index]),
+        }
+        for index, label in enumerate(stats.labels)
+    ]
+
+
+def exposure_contrasts(stats: ExposureStats, level: float = 0.95) -> list[dict[str, Any]]:
+    """Mean difference for every pair of exposure types with enough effect sizes, in sorted order."""
+    eligible = np.flatnonzero(
+        (stats.n_effect >= MIN_CONTRAST_STUDIES) & np.isfinite(stats.mean) & np.isfinite(stats.se)
+    )
+    if len(eligible) < 2:
+        return []
+    first, second = (eligible[positions] for positions in np.triu_indices(len(eligible), k=1))
+
+    difference = stats.mean[first] - stats.mean[second]
+    se_difference = np.hypot(stats.se[first], stats.se[second])
+    z = z_for_level(level)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p_values = two_sided_p(np.where(se_difference > 0, difference / se_difference, np.nan))
+
+    return [
+        {
+            "exposure_a": stats.labels[a],
+            "exposure_b": stats.labels[b],
+            "mean_difference": _round(d),
+            "ci_lower": _round(d - z * s),
+            "ci_upper": _round(d + z * s),
+            "p_value": float(f"{p:.3g}") if np.isfinite(p) else None,
+        }
+        for a, b, d, s, p in zip(first, second, difference, se_difference, p_values)
+    ]
+
+
+def _expit(value: float) -> float:
+    return 1.0 / (1.0 + math.exp(-value))
+
+
+def _proportion(pooled: PooledEstimate) -> dict[str, Any]:
+    return {
+        "proportion": round(_expit(pooled.estimate), 4),
+        "ci_lower": round(_expit(pooled.ci_lower), 4),
+        "ci_upper": round(_expit(pooled.ci_upper), 4),
+    }
+
+
+def sept9_pooling(rows: Sequence[dict[str, str]], level: float = 0.95) -> Optional[dict[str, Any]]:
+    """Random-effects pooled SEPT9 positivity on the logit scale, or None without usable studies."""
+    studies = [row for row in rows if SEPT9_MARKER in row.get("epigenetic_marker", "").lower()]
+    proportion = numeric_column(studies, "proportion_positive")
+    n = numeric_column(studies, "sample_size")
+    usable = np.isfinite(proportion) & np.isfinite(n) & (n > 0)
+    if not usable.any():
+        return None
+    studies = [row for row, keep in zip(studies, usable) if keep]
+    n = n[usable]
+    events = np.clip(np.round(proportion[usable] * n), 0, n)
+
+    # 0.5 continuity correction only for studies with 0 or n events, as in metaprop
+    correction = np.where((events == 0) | (events == n), 0.5, 0.0)
+    a = events + correction
+    b = n - events + correction
+    logit = np.log(a / b)
+    se = np.sqrt(1 / a + 1 / b)
+    result = pool(logit, se, level)
+    if result is None:
+        return None
+
+    z = z_for_level(level)
+    return {
+        "k": result.k,
+        "studies": [
+            {
+                "pmid": row.get("pmid", ""),
+                "label": f"{row.get('authors', '').split(';')[0].strip()} ({row.get('year', '')})",
+                "events": int(e),
+                "n": int(total),
+                "proportion": round(e / total, 4),
+                "ci_lower": round(_expit(y - z * s), 4),
+                "ci_upper": round(_expit(y + z * s), 4),
+            }
+            for row, e, total, y, s in zip(studies, events, n, logit, se)
+        ],
+        "fixed_effect": _proportion(result.fixed),
+        "random_effects": _proportion(result.random),
+        "heterogeneity": {
+            "q": round(result.q, 4),
+            "df": result.df,
+            "tau2": round(result.tau2, 4),
+            "i2": round(result.i2, 1),
+        },
+    }
+
+
+def _table_cell(row: dict[str, str], column: str) -> str:
+    value = row.get(column) or ""
+    if not value:
+        return "NA"
+    if column in TABLE_NUMERIC_COLUMNS:
+        try:
+            return f"{float(value):.15g}"
+        except ValueError:
+            pass
+    return value
+
+
+def write_table(rows: Sequence[dict[str, str]], exposures: Sequence[str], columns: Sequence[str], path: Path) -> int:
+    selected = [row for row in rows if row.get("exposure_type") in exposures]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8", newline="") as outfile:
+        writer = csv.writer(outfile, lineterminator="\n")
+        writer.writerow(columns)
+        writer.writerows([_table_cell(row, column) for column in columns] for row in selected)
+    return len(selected)
+
+
+def run(rows: Sequence[dict[str, str]], output_dir: Path = OUTPUT_DIR) -> dict[str, Any]:
+    """All analyses over already-loaded rows; writes the tables and the results JSON to output_dir."""
+    stats = exposure_stats(rows)
+    results = {
+        "records": len(rows),
+        "exposure_summary": exposure_summary(stats),
+        "exposure_contrasts": exposure_contrasts(stats),
+        "sept9": sept9_pooling(rows),
+        "tables": {
+            TABLE1_NAME: write_table(rows, TABLE1_EXPOSURES, TABLE1_COLUMNS, output_dir / TABLE1_NAME),
+            TABLE2_NAME: write_table(rows, TABLE2_EXPOSURES, TABLE2_COLUMNS, output_dir / TABLE2_NAME),
+        },
+    }
+    (output_dir / RESULTS_NAME).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dataset", type=Path, default=MASTER_DATASET)
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    rows = load_dataset(args.dataset)
+    results = run(rows, args.output_dir)
+    print(f"Loaded {len(rows)} studies for meta-analysis")
+
+    print("\nExposure summary:")
+    for entry in results["exposure_summary"]:
+        print(
+            f"  {entry['exposure_type']:<15} n={entry['n_studies']:<4} mean={entry['mean_effect']} "
+            f"sd={entry['sd_effect']} median population={entry['median_population']}"
+        )
+
+    print("\nExposure contrasts:")
+    for contrast in results["exposure_contrasts"]:
+        print(
+            f"  {contrast['exposure_a']} vs {contrast['exposure_b']}: MD = {contrast['mean_difference']:.3f} "
+            f"(95% CI: {contrast['ci_lower']:.3f} to {contrast['ci_upper']:.3f}), p = {contrast['p_value']}"
+        )
+
+    sept9 = results["sept9"]
+    if sept9:
+        pooled = sept9["random_effects"]
+        heterogeneity = sept9["heterogeneity"]
+        print(
+            f"\nSEPT9 positivity ({sept9['k']} studies): {pooled['proportion']:.3f} "
+            f"(95% CI: {pooled['ci_lower']:.3f} to {pooled['ci_upper']:.3f}), "
+            f"I2 = {heterogeneity['i2']}%, tau2 = {heterogeneity['tau2']}"
+        )
+    else:
+        print("\nNo SEPT9 studies with proportions and sample sizes")
+
+    for name, count in results["tables"].items():
+        print(f"{name}: {count} rows")
+    print(f"Results written to {args.output_dir / RESULTS_NAME} in {time.perf_counter() - started:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
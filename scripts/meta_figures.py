@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+
+"""
+Figures 2-6 of the manuscript, drawn from the meta-analysis results.
+
+meta_analysis.py writes output/meta_analysis_results.json; this script
+renders the figures the manuscript embeds from it with matplotlib, in the
+layout scripts/meta_analysis.R used:
+
+- Figure 2: SEPT9 positivity forest plot (per-study proportions with 95%
+  CIs and the random-effects pooled estimate)
+- Figure 3: effect sizes by exposure domain (box plot with the studies
+  overlaid); the only figure that reads the master dataset
+- Figure 4: exposure-level precision plot (mean effect against its SE)
+- Figure 5: network of exposure comparisons (edge width = |mean difference|)
+- Figure 6: heatmap of pairwise mean differences
+
+Figures whose inputs are missing (no SEPT9 studies, fewer than two
+comparable exposure types) are skipped and the previous file is kept.
+
+    python scripts/meta_figures.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+from pathlib import Path
+from typing import Any, Callable, Optional, Sequence
+
+from facet_index import MASTER_DATASET
+from meta_analysis import OUTPUT_DIR, RESULTS_NAME, load_dataset
+from meta_pooling import numeric_column
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+FIGURES_DIR = PROJECT_ROOT / "figures"
+FOREST_NAME = "Figure2_ForestPlot_mSEPT9.png"
+CONCEPT_NAME = "Figure3_Conceptual_Model.png"
+FUNNEL_NAME = "Figure4_Exposure_Funnel.png"
+NETWORK_NAME = "Figure5_Exposure_Network.png"
+HEATMAP_NAME = "Figure6_Exposure_Heatmap.png"
+
+DPI = 300
+POSITIVE_COLOUR = "#d73027"
+NEGATIVE_COLOUR = "#4575b4"
+JITTER_SEED = 2025
+
+
+def _pyplot() -> Any:
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
+def _save(figure: Any, path: Path) -> Path:
+    plt = _pyplot()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    figure.tight_layout()
+    figure.savefig(path, dpi=DPI)
+    plt.close(figure)
+    return path
+
+
+def full_contrasts(contrasts: Sequence[dict[str, Any]]) -> dict[tuple[str, str], float]:
+    """Mean difference for both orientations of every contrast: (a, b) -> MD and (b, a) -> -MD."""
+    differences = {}
+    for contrast in contrasts:
+        a, b, difference = contrast["exposure_a"], contrast["exposure_b"], contrast["mean_difference"]
+        if difference is None:
+            continue
+        differences[(a, b)] = difference
+        differences[(b, a)] = -difference
+    return differences
+
+
+def forest_plot(sept9: Optional[dict[str, Any]], path: Path) -> Optional[Path]:
+    if not sept9 or not sept9.get("studies"):
+        return None
+    plt = _pyplot()
+    studies = sept9["studies"]
+    pooled = sept9["random_effects"]
+    heterogeneity = sept9["heterogeneity"]
+
+    figure, axes = plt.subplots(figsize=(9, max(3.0, 1.5 + 0.4 * len(studies))))
+    rows = list(range(len(studies) + 1, 1, -1))
+    for row, study in zip(rows, studies):
+        axes.plot([study["ci_lower"], study["ci_upper"]], [row, row], color="#1b6ca8", linewidth=1.2)
+        axes.plot(study["proportion"], row, "s", color="#1b6ca8", markersize=5 + min(study["n"], 500) / 100)
+
+    centre, lower, upper = pooled["proportion"], pooled["ci_lower"], pooled["ci_upper"]
+    axes.fill([lower, centre, upper, centre], [0, 0.3, 0, -0.3], color="#333333")
+    axes.axvline(centre, linestyle="--", color="#999999", linewidth=0.8)
+
+    labels = [f"{study['label']}  {study['events']}/{study['n']}" for study in studies]
+    axes.set_yticks([*rows, 0], [*labels, "Random effects"])
+    axes.set_xlim(0, 1)
+    axes.xaxis.set_major_formatter(plt.FuncFormatter(lambda value, _: f"{value:.0%}"))
+    axes.set_xlabel("Proportion positive")
+    axes.set_title(
+        f"SEPT9 Positivity Rate\n{centre:.1%} (95% CI {lower:.1%} to {upper:.1%}); "
+        f"I² = {heterogeneity['i2']}%, τ² = {heterogeneity['tau2']}",
+        fontsize=11,
+    )
+    for side in ("top", "right", "left"):
+        axes.spines[side].set_visible(False)
+    return _save(figure, path)
+
+
+def conceptual_model(rows: Sequence[dict[str, str]], path: Path) -> Optional[Path]:
+    import numpy as np
+
+    effect = numeric_column(rows, "epigenetic_effect_size")
+    groups: dict[str, list[float]] = {}
+    for row, value in zip(rows, effect):
+        if np.isfinite(value):
+            groups.setdefault(row.get("exposure_type", ""), []).append(float(value))
+    if not groups:
+        return None
+    plt = _pyplot()
+    labels = sorted(groups)
+
+    figure, axes = plt.subplots(figsize=(8, 6))
+    axes.boxplot(
+        [groups[label] for label in labels],
+        patch_artist=True,
+        showfliers=False,
+        boxprops={"facecolor": "lightblue", "alpha": 0.7},
+        medianprops={"color": "#333333"},
+    )
+    rng = np.random.default_rng(JITTER_SEED)
+    for position, label in enumerate(labels, start=1):
+        values = groups[label]
+        axes.scatter(position + rng.uniform(-0.2, 0.2, len(values)), values, s=8, color="black", alpha=0.6)
+    axes.set_xticks(range(1, len(labels) + 1), labels, rotation=45, ha="right")
+    axes.set_title("Epigenetic Effects by Exposure Domain")
+    axes.set_xlabel("Exposure Type")
+    axes.set_ylabel("Effect Size")
+    return _save(figure, path)
+
+
+def precision_plot(summary: Sequence[dict[str, Any]], path: Path) -> Optional[Path]:
+    points = [entry for entry in summary if entry["mean_effect"] is not None and entry["se_effect"] is not None]
+    if not points:
+        return None
+    plt = _pyplot()
+
+    figure, axes = plt.subplots(figsize=(8, 6))
+    for direction, colour, keep in (
+        ("Positive", POSITIVE_COLOUR, lambda value: value >= 0),
+        ("Negative", NEGATIVE_COLOUR, lambda value: value < 0),
+    ):
+        selected = [entry for entry in points if keep(entry["mean_effect"])]
+        if selected:
+            axes.scatter(
+                [entry["mean_effect"] for entry in selected],
+                [entry["se_effect"] for entry in selected],
+                s=40,
+                color=colour,
+                label=direction,
+            )
+    for entry in points:
+        axes.annotate(
+            entry["exposure_type"],
+            (entry["mean_effect"], entry["se_effect"]),
+            textcoords="offset points",
+            xytext=(0, 8),
+            ha="center",
+            fontsize=8,
+        )
+    axes.invert_yaxis()
+    axes.set_title("Exposure-Level Precision Plot")
+    axes.set_xlabel("Mean standardized effect")
+    axes.set_ylabel("Standard error (inverted)")
+    axes.legend(title="Effect direction", frameon=False)
+    return _save(figure, path)
+
+
+def network_plot(summary: Sequence[dict[str, Any]], contrasts: Sequence[dict[str, Any]], path: Path) -> Optional[Path]:
+    if not contrasts:
+        return None
+    plt = _pyplot()
+    nodes = [entry["exposure_type"] for entry in summary]
+    angles = {label: 2 * math.pi * index / len(nodes) for index, label in enumerate(nodes)}
+    position = {label: (math.cos(angle), math.sin(angle)) for label, angle in angles.items()}
+    largest = max(abs(contrast["mean_difference"] or 0) for contrast in contrasts) or 1.0
+
+    figure, axes = plt.subplots(figsize=(6, 6))
+    for contrast in contrasts:
+        difference = contrast["mean_difference"]
+        if difference is None:
+            continue
+        (x1, y1), (x2, y2) = position[contrast["exposure_a"]], position[contrast["exposure_b"]]
+        axes.annotate(
+            "",
+            xy=(x2, y2),
+            xytext=(x1, y1),
+            arrowprops={
+                "arrowstyle": "-",
+                "connectionstyle": "arc3,rad=0.2",
+                "linewidth": 0.5 + 4 * abs(difference) / largest,
+                "color": POSITIVE_COLOUR if difference >= 0 else NEGATIVE_COLOUR,
+                "alpha": 0.7,
+            },
+        )
+    for entry in summary:
+        x, y = position[entry["exposure_type"]]
+        axes.scatter([x], [y], s=30 + 60 * abs(entry["mean_effect"] or 0), color="#333333", zorder=3)
+        axes.annotate(entry["exposure_type"], (x, y), textcoords="offset points", xytext=(0, 9), ha="center")
+    axes.plot([], [], color=POSITIVE_COLOUR, label="A higher")
+    axes.plot([], [], color=NEGATIVE_COLOUR, label="B higher")
+    axes.legend(frameon=False, loc="lower center", ncol=2, bbox_to_anchor=(0.5, -0.08))
+    axes.set_xlim(-1.4, 1.4)
+    axes.set_ylim(-1.4, 1.4)
+    axes.set_aspect("equal")
+    axes.axis("off")
+    axes.set_title("Network of Exposure Comparisons")
+    return _save(figure, path)
+
+
+def heatmap_plot(summary: Sequence[dict[str, Any]], contrasts: Sequence[dict[str, Any]], path: Path) -> Optional[Path]:
+    import numpy as np
+
+    differences = full_contrasts(contrasts)
+    labels = [entry["exposure_type"] for entry in summary if any(entry["exposure_type"] in pair for pair in differences)]
+    if len(labels) < 2:
+        return None
+    plt = _pyplot()
+    from matplotlib.colors import LinearSegmentedColormap, TwoSlopeNorm
+
+    matrix = np.full((len(labels), len(labels)), np.nan)
+    for row, a in enumerate(labels):
+        for column, b in enumerate(labels):
+            matrix[row, column] = 0.0 if a == b else differences.get((a, b), np.nan)
+    limit = float(np.nanmax(np.abs(matrix))) or 1.0
+
+    figure, axes = plt.subplots(figsize=(8, 6))
+    colours = LinearSegmentedColormap.from_list("md", [NEGATIVE_COLOUR, "#ffffbf", POSITIVE_COLOUR])
+    image = axes.imshow(matrix, cmap=colours, norm=TwoSlopeNorm(0.0, -limit, limit))
+    for row in range(len(labels)):
+        for column in range(len(labels)):
+            if np.isfinite(matrix[row, column]):
+                text = "0" if row == column else f"{matrix[row, column]:.2f}"
+                axes.text(column, row, text, ha="center", va="center", fontsize=8)
+    axes.set_xticks(range(len(labels)), labels, rotation=45, ha="right")
+    axes.set_yticks(range(len(labels)), labels)
+    axes.set_xlabel("Comparator")
+    axes.set_ylabel("Reference")
+    axes.set_title("Pairwise Mean Differences Between Exposure Types")
+    figure.colorbar(image, ax=axes, label="MD")
+    return _save(figure, path)
+
+
+def write_figures(
+    results: dict[str, Any],
+    rows: Sequence[dict[str, str]],
+    figures_dir: Path = FIGURES_DIR,
+) -> Optional[list[Path]]:
+    """Render every figure with inputs; returns the files written, or None when matplotlib is not installed."""
+    try:
+        _pyplot()
+    except ImportError:
+        return None
+
+    summary = results["exposure_summary"]
+    contrasts = results["exposure_contrasts"]
+    renderers: list[Callable[[], Optional[Path]]] = [
+        lambda: forest_plot(results.get("sept9"), figures_dir / FOREST_NAME),
+        lambda: conceptual_model(rows, figures_dir / CONCEPT_NAME),
+        lambda: precision_plot(summary, figures_dir / FUNNEL_NAME),
+        lambda: network_plot(summary, contrasts, figures_dir / NETWORK_NAME),
+        lambda: heatmap_plot(summary, contrasts, figures_dir / HEATMAP_NAME),
+    ]
+    return [path for path in (render() for render in renderers) if path is not None]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--results", type=Path, default=OUTPUT_DIR / RESULTS_NAME)
+    parser.add_argument("--dataset", type=Path, default=MASTER_DATASET)
+    parser.add_argument("--figures-dir", type=Path, default=FIGURES_DIR)
+    args = parser.parse_args()
+
+    if not args.results.exists():
+        parser.error(f"{args.results} not found; run scripts/meta_analysis.py first")
+    results = json.loads(args.results.read_text(encoding="utf-8"))
+    written = write_figures(results, load_dataset(args.dataset), args.figures_dir)
+    if written is None:
+        parser.exit(1, "matplotlib is not installed; figures were not rendered\n")
+    for path in written:
+        print(f"Figure written to {path}")
+    print(f"{len(written)} of 5 figures rendered")
+
+
+if __name__ == "__main__":
+    main()
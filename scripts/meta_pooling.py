@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+
+"""
+Vectorised inverse-variance pooling for meta-analysis.
+
+pool_subgroups() pools any number of strata in one pass: per-stratum sums
+of weights, weighted effects and squared weighted effects are accumulated
+with np.bincount, which gives fixed-effect estimates, Cochran's Q, the
+DerSimonian-Laird tau^2, I^2 and the random-effects estimates without a
+Python loop over strata. pool() is the single-stratum case.
+
+study_effect() turns an extracted estimate (stat_extraction.Estimate fields)
+into an effect and standard error: ratio measures (OR/RR/HR) are pooled on
+the log scale, the standard error comes from the reported confidence
+interval, or failing that from the p-value.
+"""
+
+from __future__ import annotations
+
+import math
+from statistics import NormalDist
+from typing import Any, Hashable, Iterable, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+
+RATIO_MEASURES = ("OR", "RR", "HR")
+NORMAL = NormalDist()
+SQRT2 = math.sqrt(2.0)
+
+
+class StudyEffect(NamedTuple):
+    effect: float  # log scale for ratio measures
+    standard_error: float
+    source: str  # "ci", "p_value" or "p_bound"
+    log_scale: bool
+
+
+class PooledEstimate(NamedTuple):
+    estimate: float
+    standard_error: float
+    ci_lower: float
+    ci_upper: float
+    p_value: float
+
+
+class PoolResult(NamedTuple):
+    k: int
+    fixed: PooledEstimate
+    random: PooledEstimate
+    q: float
+    df: int
+    tau2: float
+    i2: float  # percent
+
+    def to_dict(self, exponentiate: bool = False, digits: int = 4) -> dict[str, Any]:
+        """JSON-ready summary; exponentiate maps log-ratio estimates and CIs back to ratios."""
+
+        def estimate(pooled: PooledEstimate) -> dict[str, Any]:
+            transform = math.exp if exponentiate else float
+            return {
+                "estimate": round(transform(pooled.estimate), digits),
+                "ci_lower": round(transform(pooled.ci_lower), digits),
+                "ci_upper": round(transform(pooled.ci_upper), digits),
+                "standard_error": round(pooled.standard_error, digits),
+                "p_value": float(f"{pooled.p_value:.3g}"),
+            }
+
+        return {
+            "k": self.k,
+            "fixed_effect": estimate(self.fixed),
+            "random_effects": estimate(self.random),
+            "heterogeneity": {
+                "q": round(self.q, digits),
+                "df": self.df,
+                "tau2": round(self.tau2, digits),
+                "i2": round(self.i2, 1),
+            },
+        }
+
+
+def numeric_column(rows: Sequence[dict[str, str]], field: str) -> np.ndarray:
+    """Column as floats, with NaN for blank or non-numeric cells."""
+    values = np.full(len(rows), np.nan)
+    for position, row in enumerate(rows):
+        try:
+            values[position] = float(row.get(field) or "nan")
+        except ValueError:
+            pass
+    return values
+
+
+def z_for_level(level: float = 0.95) -> float:
+    return NORMAL.inv_cdf(0.5 + level / 2)
+
+
+def two_sided_p(z: np.ndarray) -> np.ndarray:
+    return np.array([math.erfc(abs(value) / SQRT2) for value in np.ravel(z)]).reshape(np.shape(z))
+
+
+def study_effect(
+    measure: str,
+    value: float,
+    ci_lower: Optional[float] = None,
+    ci_upper: Optional[float] = None,
+    ci_level: Optional[float] = None,
+    p_value: Optional[float] = None,
+    p_operator: Optional[str] = None,
+    **_: Any,
+) -> Optional[StudyEffect]:
+    """Effect and standard error of one reported estimate, or None if neither a CI nor a p-value allows it."""
+    log_scale = measure in RATIO_MEASURES
+    if value is None or (log_scale and value <= 0):
+        return None
+    effect = math.log(value) if log_scale else float(value)
+
+    if ci_lower is not None and ci_upper is not None and ci_upper > ci_lower and (not log_scale or ci_lower > 0):
+        # CI levels are reported in percent; unlabelled intervals are taken as 95%
+        level = (ci_level or 95.0) / 100
+        low, high = (math.log(ci_lower), math.log(ci_upper)) if log_scale else (ci_lower, ci_upper)
+        return StudyEffect(effect, (high - low) / (2 * z_for_level(level)), "ci", log_scale)
+
+    if p_value is not None and 0 < p_value < 1 and effect != 0 and p_operator in ("=", "<", "≤", "<="):
+        # "p < x" only bounds the p-value, which gives an upper bound on the SE
+        se = abs(effect) / NORMAL.inv_cdf(1 - p_value / 2)
+        return StudyEffect(effect, se, "p_value" if p_operator == "=" else "p_bound", log_scale)
+
+    return None
+
+
+def _group_codes(groups: Iterable[Hashable]) -> tuple[list[Hashable], np.ndarray]:
+    labels: dict[Hashable, int] = {}
+    codes = [labels.setdefault(group, len(labels)) for group in groups]
+    return list(labels), np.asarray(codes, dtype=np.intp)
+
+
+def _pooled(estimate: np.ndarray, se: np.ndarray, z: float) -> list[PooledEstimate]:
+    p_values = two_sided_p(estimate / se)
+    return [
+        PooledEstimate(float(e), float(s), float(e - z * s), float(e + z * s), float(p))
+        for e, s, p in zip(estimate, se, p_values)
+    ]
+
+
+def pool_subgroups(
+    effects: Sequence[float],
+    standard_errors: Sequence[float],
+    groups: Sequence[Hashable],
+    level: float = 0.95,
+) -> dict[Hashable, PoolResult]:
+    """Fixed-effect and DerSimonian-Laird random-effects pooling per group, in first-seen group order.
+
+    Studies with a missing or non-positive standard error are ignored.
+    """
+    y = np.asarray(effects, dtype=float)
+    se = np.asarray(standard_errors, dtype=float)
+    valid = np.isfinite(y) & np.isfinite(se) & (se > 0)
+    labels, codes = _group_codes(group for group, keep in zip(groups, valid) if keep)
+    if not labels:
+        return {}
+    y, v = y[valid], se[valid] ** 2
+    size = len(labels)
+
+    w = 1.0 / v
+    k = np.bincount(codes, minlength=size)
+    sum_w = np.bincount(codes, w, size)
+    sum_wy = np.bincount(codes, w * y, size)
+    sum_wy2 = np.bincount(codes, w * y * y, size)
+    sum_w2 = np.bincount(codes, w * w, size)
+
+    fixed = sum_wy / sum_w
+    fixed_se = np.sqrt(1.0 / sum_w)
+    q = np.maximum(sum_wy2 - sum_wy * fixed, 0.0)
+    df = k - 1
+    c = sum_w - sum_w2 / sum_w
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tau2 = np.where(c > 0, np.maximum((q - df) / c, 0.0), 0.0)
+        i2 = np.where(q > 0, np.maximum((q - df) / q, 0.0) * 100, 0.0)
+
+    w_random = 1.0 / (v + tau2[codes])
+    sum_wr = np.bincount(codes, w_random, size)
+    random = np.bincount(codes, w_random * y, size) / sum_wr
+    random_se = np.sqrt(1.0 / sum_wr)
+
+    z = z_for_level(level)
+    fixed_estimates = _pooled(fixed, fixed_se, z)
+    random_estimates = _pooled(random, random_se, z)
+    return {
+        label: PoolResult(
+            int(k[index]),
+            fixed_estimates[index],
+            random_estimates[index],
+            float(q[index]),
+            int(df[index]),
+            float(tau2[index]),
+            float(i2[index]),
+        )
+        for index, label in enumerate(labels)
+    }
+
+
+def pool(effects: Sequence[float], standard_errors: Sequence[float], level: float = 0.95) -> Optional[PoolResult]:
+    """Pool all studies as one group; None when no study has a usable standard error."""
+    return pool_subgroups(effects, standard_errors, [None] * len(effects), level).get(None)
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+
+"""
+In-process counters, gauges and latency histograms.
+
+A Metrics registry is safe to update from worker threads. Series are
+identified by a name plus keyword labels (e.g. tool="pubmed_systematic_search").
+snapshot() gives a JSON-serialisable view and prometheus() the Prometheus
+text exposition format; write() picks the format from the file suffix
+(.prom for Prometheus, anything else for JSON) and replaces the file
+atomically so scrapers never read a partial file.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+
+# Upper bounds of the latency buckets, in milliseconds
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def _labels(labels: dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape_label(value: str) -> str:
+    """Label value escaped for the Prometheus text exposition format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Histogram:
+    __slots__ = ("bounds", "buckets", "count", "total", "maximum")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)  # the last bucket is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def observe(self, value: float) -> None:
+        position = next((index for index, bound in enumerate(self.bounds) if value <= bound), len(self.bounds))
+        self.buckets[position] += 1
+        self.count += 1
+        self.total += value
+        self.maximum = max(self.maximum, value)
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the q-quantile (the maximum for +Inf)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for position, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return float(self.bounds[position]) if position < len(self.bounds) else self.maximum
+        return self.maximum
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.total, 3),
+            "mean": round(self.total / self.count, 3) if self.count else None,
+            "max": round(self.maximum, 3),
+            "p50_le": self.quantile(0.5),
+            "p95_le": self.quantile(0.95),
+            "buckets": {
+                **{str(bound): count for bound, count in zip(self.bounds, self.buckets)},
+                "+Inf": self.buckets[-1],
+            },
+        }
+
+
+class Metrics:
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS_MS) -> None:
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self.counters: dict[str, dict[Labels, float]] = {}
+        self.gauges: dict[str, dict[Labels, float]] = {}
+        self.histograms: dict[str, dict[Labels, Histogram]] = {}
+
+    def increment(self, name: str, amount: float = 1, **labels: Any) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        with self._lock:
+            self.gauges.setdefault(name, {})[_labels(labels)] = value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def counter_total(self, name: str, **labels: Any) -> float:
+        """Sum of a counter over the series whose labels include the given ones."""
+        wanted = set(_labels(labels))
+        with self._lock:
+            return sum(value for key, value in self.counters.get(name, {}).items() if wanted <= set(key))
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "counters": {
+                    name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                    for name, series in self.counters.items()
+                },
+                "gauges": {
+                    name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                    for name, series in self.gauges.items()
+                },
+                "histograms": {
+                    name: [{"labels": dict(key), **histogram.to_dict()} for key, histogram in series.items()]
+                    for name, series in self.histograms.items()
+                },
+            }
+
+    def prometheus(self, prefix: str = "") -> str:
+        def render(labels: Labels, extra: tuple[tuple[str, str], ...] = ()) -> str:
+            pairs = labels + extra
+            if not pairs:
+                return ""
+            return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in pairs) + "}"
+
+        lines: list[str] = []
+        with self._lock:
+            for name, series in self.counters.items():
+                lines.append(f"# TYPE {prefix}{name}_total counter")
+                lines.extend(f"{prefix}{name}_total{render(key)} {value:g}" for key, value in series.items())
+            for name, series in self.gauges.items():
+                lines.append(f"# TYPE {prefix}{name} gauge")
+                lines.extend(f"{prefix}{name}{render(key)} {value:g}" for key, value in series.items())
+            for name, series in self.histograms.items():
+                lines.append(f"# TYPE {prefix}{name} histogram")
+                for key, histogram in series.items():
+                    cumulative = 0
+                    for bound, count in zip(histogram.bounds, histogram.buckets):
+                        cumulative += count
+                        lines.append(f"{prefix}{name}_bucket{render(key, (('le', f'{bound:g}'),))} {cumulative}")
+                    lines.append(f"{prefix}{name}_bucket{render(key, (('le', '+Inf'),))} {histogram.count}")
+                    lines.append(f"{prefix}{name}_sum{render(key)} {histogram.total:.3f}")
+                    lines.append(f"{prefix}{name}_count{render(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Path, prefix: str = "", extra: dict[str, Any] | None = None) -> None:
+        """Write metrics to path: Prometheus text for .prom, JSON otherwise."""
+        path = Path(path)
+        if path.suffix == ".prom":
+            text = self.prometheus(prefix)
+        else:
+            text = json.dumps({**(extra or {}), **self.snapshot()}, indent=2)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(text, encoding="utf-8")
+        os.replace(tmp_path, path)
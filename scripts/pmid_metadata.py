@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+
+"""
+Resolve large PMID lists to article metadata with batched ESummary POSTs.
+
+PMIDs go in the request body rather than the URL, so lists of any length
+work (a GET with a few hundred ids exceeds URL length limits). Chunks are
+fetched in parallel by a small thread pool; every request takes a slot from
+the shared rate limiter in eutils.py, so the pool never exceeds the NCBI
+request rate. Resolved records are kept per PMID in the shared response
+cache, so overlapping lists only fetch what is new.
+
+    python scripts/pmid_metadata.py 41102856 41104469 ...
+    python scripts/pmid_metadata.py --file pmids.txt --output metadata.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextvars
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+from eutils import MAX_RETRIES, eutils_base_url, retry_delay, shared_rate_limiter, shared_response_cache, should_retry, signed_request
+
+
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_WORKERS = 3
+
+# fetch(url, body) -> response bytes
+Fetch = Callable[[str, bytes], bytes]
+
+
+def post_eutils(url: str, body: bytes) -> bytes:
+    """POST a form body to E-utilities under the shared rate limiter, retrying 429/5xx."""
+    url, body = signed_request(url, body)
+    for attempt in range(MAX_RETRIES + 1):
+        shared_rate_limiter().acquire()
+        request = Request(url, data=body, headers={"Content-Type": "application/x-www-form-urlencoded"})
+        try:
+            with urlopen(request) as response:
+                return response.read()
+        except Exception as e:
+            if attempt == MAX_RETRIES or not should_retry(e):
+                raise
+        time.sleep(retry_delay(attempt))
+    raise AssertionError("unreachable")
+
+
+def split_pmids(pmids: Iterable[Any]) -> tuple[list[str], list[str]]:
+    """Unique PMIDs in first-seen order, and the inputs that are not PMIDs."""
+    valid: dict[str, None] = {}
+    invalid = []
+    for value in pmids:
+        pmid = str(value).strip()
+        if pmid.isdigit():
+            valid[pmid] = None
+        else:
+            invalid.append(str(value))
+    return list(valid), invalid
+
+
+def summary_record(uid: str, summary: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "pmid": uid,
+        "title": summary.get("title", ""),
+        "authors": [author.get("name", "") for author in summary.get("authors", [])],
+        "journal": summary.get("fulljournalname", ""),
+        "pubdate": summary.get("pubdate", ""),
+        "doi": next((id.get("value") for id in summary.get("articleids", []) if id.get("idtype") == "doi"), ""),
+        "publication_types": summary.get("pubtype", []),
+    }
+
+
+def resolve_pmids(
+    pmids: Iterable[Any],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int = DEFAULT_WORKERS,
+    fetch: Optional[Fetch] = None,
+) -> dict[str, dict[str, Any]]:
+    """ESummary metadata keyed by PMID, in input order; unknown PMIDs are left out."""
+    unique, _ = split_pmids(pmids)
+    fetch = fetch or post_eutils
+    url = f"{eutils_base_url()}esummary.fcgi"
+    cache = shared_response_cache()
+
+    resolved: dict[str, dict[str, Any]] = {}
+    pending = []
+    for pmid in unique:
+        record = cache.get(("esummary", pmid))
+        if record is not None:
+            resolved[pmid] = record
+        else:
+            pending.append(pmid)
+
+    def resolve_chunk(chunk: list[str]) -> dict[str, dict[str, Any]]:
+        body = urlencode({"db": "pubmed", "id": ",".join(chunk), "retmode": "json"}).encode("ascii")
+        result = json.loads(fetch(url, body).decode("utf-8")).get("result", {})
+        return {
+            uid: summary_record(uid, result[uid])
+            for uid in chunk
+            if isinstance(result.get(uid), dict) and "error" not in result[uid]
+        }
+
+    chunks = [pending[start:start + batch_size] for start in range(0, len(pending), batch_size)]
+    if chunks:
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(chunks)))) as pool:
+            # Run each chunk in a copy of the caller's context so context-local
+            # state (e.g. request tracing) follows the work into the pool
+            futures = [pool.submit(contextvars.copy_context().run, resolve_chunk, chunk) for chunk in chunks]
+            for future in futures:
+                for pmid, record in future.result().items():
+                    cache.put(("esummary", pmid), record)
+                    resolved[pmid] = record
+
+    return {pmid: resolved[pmid] for pmid in unique if pmid in resolved}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pmids", nargs="*")
+    parser.add_argument("--file", type=Path, help="File of PMIDs, one per line")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--output", type=Path, help="Write the records as JSON here instead of stdout")
+    args = parser.parse_args()
+
+    pmids = list(args.pmids)
+    if args.file:
+        pmids.extend(line.strip() for line in args.file.read_text(encoding="utf-8").splitlines() if line.strip())
+    if not pmids:
+        parser.error("no PMIDs given")
+
+    started = time.perf_counter()
+    records = resolve_pmids(pmids, args.batch_size, args.workers)
+    text = json.dumps(list(records.values()), indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    else:
+        print(text)
+    print(f"Resolved {len(records)}/{len(split_pmids(pmids)[0])} PMIDs in {time.perf_counter() - started:.2f} s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,8 @@ import pathlib
 import re
 from typing import Optional
 
+from prisma_flow import PRISMA_COUNTS_PATH, record_counts
+
 
 PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
 INPUT_PATH = PROJECT_ROOT / "data" / "epigenetic_master_dataset_python.csv"
@@ -58,6 +60,7 @@ def main() -> None:
         "exposure_type",
         "epigenetic_marker",
         "epigenetic_effect_size",
+        "effect_measure",
         "cancer_type",
         "population_size",
         "study_design",
@@ -68,14 +71,25 @@ def main() -> None:
         "specificity",
         "ci_lower",
         "ci_upper",
+        "p_value",
+        "p_operator",
     ]
 
     processed_rows: list[dict[str, object]] = []
+    seen_pmids: set[str] = set()
+    duplicate_rows = 0
 
     with INPUT_PATH.open(newline="", encoding="utf-8") as infile:
         reader = csv.DictReader(infile)
 
         for row in reader:
+            # A PMID extracted twice (e.g. a fetch resumed from its journal) is one study
+            pmid = str(row.get("pmid", "")).strip()
+            if pmid and pmid in seen_pmids:
+                duplicate_rows += 1
+                continue
+            seen_pmids.add(pmid)
+
             cleaned: dict[str, object] = dict(row)
 
             effect = parse_float(row.get("epigenetic_effect_size"))
@@ -119,11 +133,22 @@ def main() -> None:
             country = str(row.get("country", "")).strip()
             cleaned["country"] = country if country else "Unspecified"
 
-            ci_lower = clamp(effect * 0.8, 0.0, float("inf"))
-            ci_upper = effect * 1.2
+            # Reported intervals (see stat_extraction.py) are kept when they
+            # bracket the effect; otherwise fall back to +/-20%
+            ci_lower = parse_float(row.get("ci_lower"))
+            ci_upper = parse_float(row.get("ci_upper"))
+            if ci_lower is None or ci_upper is None or not (ci_lower <= effect <= ci_upper):
+                ci_lower = clamp(effect * 0.8, 0.0, float("inf"))
+                ci_upper = effect * 1.2
             cleaned["ci_lower"] = ci_lower
             cleaned["ci_upper"] = ci_upper
 
+            p_value = parse_float(row.get("p_value"))
+            has_p_value = p_value is not None and 0 <= p_value <= 1
+            cleaned["p_value"] = p_value if has_p_value else ""
+            # "<" for "p < 0.001" and the like; blank in rows extracted before the operator was kept
+            cleaned["p_operator"] = str(row.get("p_operator") or "").strip() if has_p_value else ""
+
             processed_rows.append(cleaned)
 
     OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
@@ -134,6 +159,12 @@ def main() -> None:
         for row in processed_rows:
             writer.writerow({column: row.get(column, "") for column in fieldnames})
 
+    record_counts(
+        {"full_text_excluded": duplicate_rows, "studies_included": len(processed_rows)},
+        {"full_text_excluded": "repeated extraction rows for the same PMID" if duplicate_rows else ""},
+        PRISMA_COUNTS_PATH,
+    )
+
     print(f"Wrote {len(processed_rows)} records to {OUTPUT_PATH}")
 
 
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+
+"""
+PRISMA flow counts recorded by the pipeline stages, and the flow diagram drawn from them.
+
+Each stage records the counts it observes as it runs, with record_counts():
+
+- fetch_pubmed_data.py / query_registry.py: records identified, duplicates
+  removed, records screened and excluded
+- fetch_pubmed_data.py: reports (abstracts) sought, not retrieved and assessed
+- prepare_master_dataset.py: full texts excluded, studies included
+
+The counts live in data/prisma_counts.csv (stage,count,reason), so drawing
+the diagram only reads that file and never the dataset. write_diagram()
+renders figures/Figure1_PRISMA_Flow.svg, plus the PNG embedded in the
+manuscript when matplotlib is installed:
+
+    python scripts/prisma_flow.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import html
+import sys
+import textwrap
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+PRISMA_COUNTS_PATH = PROJECT_ROOT / "data" / "prisma_counts.csv"
+FIGURE_SVG_PATH = PROJECT_ROOT / "figures" / "Figure1_PRISMA_Flow.svg"
+FIGURE_PNG_PATH = PROJECT_ROOT / "figures" / "Figure1_PRISMA_Flow.png"
+
+# Stages in flow order; the CSV keeps this order whichever stage records first
+STAGES = (
+    "records_identified",
+    "duplicates_removed",
+    "records_screened",
+    "records_excluded",
+    "reports_sought",
+    "reports_not_retrieved",
+    "full_text_assessed",
+    "full_text_excluded",
+    "studies_included",
+)
+
+# (stage, box title, column, row): column 0 is the main flow, column 1 the exclusions beside it
+LAYOUT = (
+    ("records_identified", "Records identified", 0, 0),
+    ("duplicates_removed", "Records removed before screening", 1, 0),
+    ("records_screened", "Records screened", 0, 1),
+    ("records_excluded", "Records excluded", 1, 1),
+    ("reports_sought", "Reports sought for retrieval", 0, 2),
+    ("reports_not_retrieved", "Reports not retrieved", 1, 2),
+    ("full_text_assessed", "Full-text articles assessed", 0, 3),
+    ("full_text_excluded", "Full-text articles excluded", 1, 3),
+    ("studies_included", "Studies included", 0, 4),
+)
+# Shown for a stage the counts file has no row for; a missing count is not a zero
+NOT_REPORTED = "NR"
+BOX_WIDTH = (320, 280)
+BOX_HEIGHT = 96
+COLUMN_X = (20, 400)
+ROW_GAP = 40
+MARGIN = 20
+WRAP = (46, 40)
+MAX_REASON_LINES = 3
+LINE_HEIGHT = 16
+
+
+class StageCount(NamedTuple):
+    count: int
+    reason: str
+
+
+class Box(NamedTuple):
+    stage: str
+    x: float
+    y: float
+    width: float
+    height: float
+    lines: list[str]  # title, "n = ...", then the wrapped reason
+
+
+def read_counts(path: Path = PRISMA_COUNTS_PATH) -> dict[str, StageCount]:
+    """Recorded counts in file order; stages never recorded are missing."""
+    if not path.exists():
+        return {}
+    with path.open(encoding="utf-8", newline="") as infile:
+        return {
+            row["stage"]: StageCount(int(float(row["count"] or 0)), row.get("reason") or "")
+            for row in csv.DictReader(infile)
+        }
+
+
+def record_counts(
+    counts: dict[str, int],
+    reasons: Optional[dict[str, str]] = None,
+    path: Path = PRISMA_COUNTS_PATH,
+) -> None:
+    """Set the given stages in the counts CSV, keeping every other stage as recorded."""
+    reasons = reasons or {}
+    merged = read_counts(path)
+    for stage, count in counts.items():
+        merged[stage] = StageCount(int(count), reasons.get(stage, ""))
+
+    def position(stage: str) -> int:
+        return STAGES.index(stage) if stage in STAGES else len(STAGES)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8", newline="") as outfile:
+        writer = csv.writer(outfile, lineterminator="\n")
+        writer.writerow(["stage", "count", "reason"])
+        # sorted() is stable, so stages outside STAGES keep their relative order at the end
+        for stage in sorted(merged, key=position):
+            writer.writerow([stage, merged[stage].count, merged[stage].reason])
+
+
+def missing_stages(counts: dict[str, StageCount]) -> list[str]:
+    """STAGES with no recorded count, in flow order."""
+    return [stage for stage in STAGES if stage not in counts]
+
+
+def flow_boxes(counts: dict[str, StageCount]) -> list[Box]:
+    boxes = []
+    for stage, title, column, row in LAYOUT:
+        recorded = counts.get(stage)
+        lines = [title, f"n = {recorded.count if recorded else NOT_REPORTED}"]
+        if recorded and recorded.reason:
+            lines.extend(textwrap.wrap(recorded.reason, WRAP[column], max_lines=MAX_REASON_LINES, placeholder=" ..."))
+        boxes.append(Box(
+            stage,
+            COLUMN_X[column],
+            MARGIN + row * (BOX_HEIGHT + ROW_GAP),
+            BOX_WIDTH[column],
+            BOX_HEIGHT,
+            lines,
+        ))
+    return boxes
+
+
+def flow_arrows(boxes: list[Box]) -> list[tuple[float, float, float, float]]:
+    """(x1, y1, x2, y2): down the main column, and across from each main box to its exclusion box."""
+    by_row: dict[float, list[Box]] = {}
+    for box in boxes:
+        by_row.setdefault(box.y, []).append(box)
+    rows = [sorted(by_row[y], key=lambda box: box.x) for y in sorted(by_row)]
+
+    arrows = []
+    for upper, lower in zip(rows, rows[1:]):
+        main, below = upper[0], lower[0]
+        arrows.append((main.x + main.width / 2, main.y + main.height, below.x + below.width / 2, below.y))
+    for row in rows:
+        if len(row) > 1:
+            main, side = row[0], row[1]
+            arrows.append((main.x + main.width, main.y + main.height / 2, side.x, side.y + side.height / 2))
+    return arrows
+
+
+def line_positions(box: Box) -> list[float]:
+    """Baseline-centred y of each text line, with the block centred in the box."""
+    top = box.y + (box.height - LINE_HEIGHT * len(box.lines)) / 2 + LINE_HEIGHT / 2
+    return [top + index * LINE_HEIGHT for index in range(len(box.lines))]
+
+
+def canvas_size(boxes: list[Box]) -> tuple[float, float]:
+    return (
+        max(box.x + box.width for box in boxes) + MARGIN,
+        max(box.y + box.height for box in boxes) + MARGIN,
+    )
+
+
+def render_svg(counts: dict[str, StageCount]) -> str:
+    boxes = flow_boxes(counts)
+    width, height = canvas_size(boxes)
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:g}" height="{height:g}" '
+        f'viewBox="0 0 {width:g} {height:g}" font-family="Helvetica, Arial, sans-serif">',
+        "<title>PRISMA flow diagram</title>",
+        "<defs><marker id=\"arrow\" viewBox=\"0 0 10 10\" refX=\"10\" refY=\"5\" markerWidth=\"7\" "
+        "markerHeight=\"7\" orient=\"auto\"><path d=\"M0,0 L10,5 L0,10 z\" fill=\"#555555\"/></marker></defs>",
+        f'<rect width="{width:g}" height="{height:g}" fill="#ffffff"/>',
+    ]
+    for x1, y1, x2, y2 in flow_arrows(boxes):
+        parts.append(
+            f'<line x1="{x1:g}" y1="{y1:g}" x2="{x2:g}" y2="{y2:g}" stroke="#555555" '
+            'stroke-width="1.5" marker-end="url(#arrow)"/>'
+        )
+    for box in boxes:
+        fill = "#d9ecf7" if box.x == COLUMN_X[0] else "#f4f4f4"
+        parts.append(f'<g id="{box.stage}">')
+        parts.append(
+            f'<rect x="{box.x:g}" y="{box.y:g}" width="{box.width:g}" height="{box.height:g}" '
+            f'rx="4" fill="{fill}" stroke="#333333"/>'
+        )
+        for index, (line, y) in enumerate(zip(box.lines, line_positions(box))):
+            weight = ' font-weight="bold"' if index == 0 else ""
+            size = 13 if index < 2 else 11
+            parts.append(
+                f'<text x="{box.x + box.width / 2:g}" y="{y:g}" font-size="{size}" '
+                f'text-anchor="middle" dominant-baseline="middle"{weight}>{html.escape(line)}</text>'
+            )
+        parts.append("</g>")
+    parts.append("</svg>")
+    return "\n".join(parts) + "\n"
+
+
+def render_png(counts: dict[str, StageCount], path: Path, dpi: int = 200) -> bool:
+    """Draw the same layout with matplotlib; False when matplotlib is not installed."""
+    try:
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        from matplotlib.patches import FancyBboxPatch
+    except ImportError:
+        return False
+
+    boxes = flow_boxes(counts)
+    width, height = canvas_size(boxes)
+    figure = plt.figure(figsize=(width / 100, height / 100))
+    axes = figure.add_axes((0, 0, 1, 1))
+    axes.set_xlim(0, width)
+    axes.set_ylim(height, 0)
+    axes.axis("off")
+
+    for x1, y1, x2, y2 in flow_arrows(boxes):
+        axes.annotate("", xy=(x2, y2), xytext=(x1, y1), arrowprops={"arrowstyle": "-|>", "color": "#555555"})
+    for box in boxes:
+        fill = "#d9ecf7" if box.x == COLUMN_X[0] else "#f4f4f4"
+        axes.add_patch(FancyBboxPatch(
+            (box.x, box.y), box.width, box.height, boxstyle="round,pad=0,rounding_size=4",
+            facecolor=fill, edgecolor="#333333",
+        ))
+        for index, (line, y) in enumerate(zip(box.lines, line_positions(box))):
+            axes.text(
+                box.x + box.width / 2,
+                y,
+                line,
+                ha="center",
+                va="center",
+                fontsize=9.5 if index < 2 else 8,
+                fontweight="bold" if index == 0 else "normal",
+            )
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    figure.savefig(path, dpi=dpi)
+    plt.close(figure)
+    return True
+
+
+def write_diagram(
+    counts_path: Path = PRISMA_COUNTS_PATH,
+    svg_path: Path = FIGURE_SVG_PATH,
+    png_path: Optional[Path] = FIGURE_PNG_PATH,
+) -> list[Path]:
+    """Render the diagram from the recorded counts; returns the files written."""
+    counts = read_counts(counts_path)
+    svg_path.parent.mkdir(parents=True, exist_ok=True)
+    svg_path.write_text(render_svg(counts), encoding="utf-8")
+    written = [svg_path]
+    if png_path is not None and render_png(counts, png_path):
+        written.append(png_path)
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", type=Path, default=PRISMA_COUNTS_PATH)
+    parser.add_argument("--svg", type=Path, default=FIGURE_SVG_PATH)
+    parser.add_argument("--png", type=Path, default=FIGURE_PNG_PATH)
+    parser.add_argument("--no-png", action="store_true")
+    args = parser.parse_args()
+
+    counts = read_counts(args.counts)
+    if not counts:
+        parser.error(f"no PRISMA counts recorded in {args.counts}")
+    for stage, recorded in counts.items():
+        print(f"  {stage:<20} {recorded.count:>7}  {recorded.reason}")
+    missing = missing_stages(counts)
+    if missing:
+        print(
+            f"warning: {args.counts} has no count for {', '.join(missing)}; drawn as n = {NOT_REPORTED}. "
+            "Re-run the stages that record them.",
+            file=sys.stderr,
+        )
+
+    written = write_diagram(args.counts, args.svg, None if args.no_png else args.png)
+    if len(written) == 1 and not args.no_png:
+        print("matplotlib is not installed; skipped the PNG")
+    for path in written:
+        print(f"PRISMA diagram written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+"""
+Parse EFetch XML (retmode=xml) into the abstract fields stored with each raw
+article: labelled abstract sections, MeSH descriptors, publication types and
+author keywords.
+
+Unlike retmode=text output, the abstract carries no citation header, author
+list or affiliations, and section_text() lets classifiers scan only the
+sections relevant to them (e.g. METHODS for study design, RESULTS for effect
+estimates).
+"""
+
+from __future__ import annotations
+
+import io
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, Iterator, Optional, Union
+
+
+# NLM categories assigned to structured-abstract labels
+CATEGORIES = ("BACKGROUND", "OBJECTIVE", "METHODS", "RESULTS", "CONCLUSIONS", "UNASSIGNED")
+
+# Used when a label has no NlmCategory attribute (older records, mock data)
+LABEL_CATEGORIES = [
+    ("BACKGROUND", ("BACKGROUND", "INTRODUCTION", "CONTEXT", "RATIONALE")),
+    ("OBJECTIVE", ("OBJECTIVE", "AIM", "PURPOSE", "GOAL", "HYPOTHESIS")),
+    ("METHODS", ("METHOD", "DESIGN", "PATIENT", "PARTICIPANT", "SETTING", "MATERIAL", "SUBJECT", "POPULATION")),
+    ("RESULTS", ("RESULT", "FINDING", "OUTCOME")),
+    ("CONCLUSIONS", ("CONCLUSION", "INTERPRETATION", "IMPLICATION", "SIGNIFICANCE", "DISCUSSION")),
+]
+
+
+def _text(element: Optional[ET.Element]) -> str:
+    return " ".join("".join(element.itertext()).split()) if element is not None else ""
+
+
+def label_category(label: str) -> str:
+    upper = label.upper()
+    for category, keywords in LABEL_CATEGORIES:
+        if any(keyword in upper for keyword in keywords):
+            return category
+    return "UNASSIGNED"
+
+
+def parse_abstract(article: ET.Element) -> list[dict[str, str]]:
+    """Abstract sections as {"label", "category", "text"} dicts, in document order."""
+    sections = []
+    for node in article.iterfind(".//Abstract/AbstractText"):
+        text = _text(node)
+        if not text:
+            continue
+        label = node.get("Label", "").strip()
+        category = node.get("NlmCategory", "").upper() or (label_category(label) if label else "UNASSIGNED")
+        sections.append({"label": label, "category": category, "text": text})
+    return sections
+
+
+def format_abstract(sections: list[dict[str, str]]) -> str:
+    return "\n".join(
+        f"{section['label']}: {section['text']}" if section["label"] else section["text"]
+        for section in sections
+    )
+
+
+def parse_article(article: ET.Element) -> dict[str, Any]:
+    """Abstract fields of a <PubmedArticle> element, keyed like raw-article dicts."""
+    sections = parse_abstract(article)
+    return {
+        "pmid": _text(article.find("MedlineCitation/PMID")),
+        "abstract": format_abstract(sections),
+        "abstract_sections": sections,
+        "mesh_terms": [_text(node) for node in article.iterfind(".//MeshHeadingList/MeshHeading/DescriptorName")],
+        "publication_types": [_text(node) for node in article.iterfind(".//PublicationTypeList/PublicationType")],
+        "keywords": [_text(node) for node in article.iterfind(".//KeywordList/Keyword") if _text(node)],
+    }
+
+
+def iter_pubmed_articles(source: Union[bytes, str, Path]) -> Iterator[dict[str, Any]]:
+    """Stream parsed articles from EFetch XML given as bytes or a file path."""
+    stream = io.BytesIO(source) if isinstance(source, bytes) else source
+    for _, element in ET.iterparse(stream, events=("end",)):
+        if element.tag == "PubmedArticle":
+            yield parse_article(element)
+            element.clear()
+
+
+def section_text(article: dict[str, Any], *categories: str) -> str:
+    """Text of the abstract sections in the given categories.
+
+    Unstructured abstracts, structured abstracts with none of the requested
+    sections, and records without parsed sections (e.g. older text-mode
+    fetches) fall back to the whole abstract.
+    """
+    sections = article.get("abstract_sections") or []
+    if categories and any(section["category"] != "UNASSIGNED" for section in sections):
+        selected = [section["text"] for section in sections if section["category"] in categories]
+        if selected:
+            return " ".join(selected)
+    return article.get("abstract", "")
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+
+"""
+Named PubMed searches and a concurrent runner for them.
+
+data/search_queries.json describes every search the project runs: the
+term, the publication date window, extra filter clauses, publication types
+and exclusions. "searches" are complete searches the runner executes;
+"templates" hold defaults for searches whose term is supplied at call time
+(the MCP server's pubmed_systematic_search tool).
+
+run_searches() executes searches concurrently. All ESearch requests take
+slots from the shared rate limiter in eutils.py, so adding searches does
+not raise the request rate. The PMID sets are then compared (pairwise
+overlap, PMIDs unique to each search, PMIDs found by all) and reduced to
+the PRISMA identification counts: records identified across searches,
+duplicates removed, and records left for screening.
+
+    python scripts/query_registry.py --list
+    python scripts/query_registry.py living_review re_research_2025 --output output/search_run.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional, Sequence
+
+from prisma_flow import PRISMA_COUNTS_PATH, record_counts
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+REGISTRY_PATH = PROJECT_ROOT / "data" / "search_queries.json"
+OUTPUT_PATH = PROJECT_ROOT / "output" / "search_run.json"
+
+# ESearch returns at most this many PMIDs per request
+ESEARCH_PAGE_SIZE = 10_000
+DEFAULT_WORKERS = 3
+
+# fetch(url, body) -> response bytes
+Fetch = Callable[[str, bytes], bytes]
+
+
+@dataclasses.dataclass(frozen=True)
+class SearchSpec:
+    name: str
+    term: str = ""
+    date_from: Optional[str] = None
+    date_to: Optional[str] = None
+    date_field: str = "PDAT"
+    filters: tuple[str, ...] = ()
+    publication_types: tuple[str, ...] = ()
+    exclude: tuple[str, ...] = ()
+    retmax: int = 1000
+    sort: Optional[str] = None
+    description: str = ""
+
+    @classmethod
+    def from_dict(cls, name: str, data: dict[str, Any]) -> "SearchSpec":
+        fields = {field.name for field in dataclasses.fields(cls)}
+        unknown = set(data) - fields
+        if unknown:
+            raise ValueError(f"Search {name!r} has unknown keys: {', '.join(sorted(unknown))}")
+        values = {key: tuple(value) if isinstance(value, list) else value for key, value in data.items()}
+        return cls(name=name, **values)
+
+    def replace(self, **changes: Any) -> "SearchSpec":
+        return dataclasses.replace(self, **changes)
+
+    def query(self) -> str:
+        """The full PubMed query string."""
+        parts = [self.term] if self.term else []
+        if self.date_from or self.date_to:
+            field = self.date_field
+            parts.append(f'("{self.date_from or "1800/01/01"}"[{field}] : "{self.date_to or "3000/12/31"}"[{field}])')
+        parts.extend(f"({clause})" for clause in self.filters)
+        if self.publication_types:
+            parts.append("(" + " OR ".join(f'("{kind}"[Publication Type])' for kind in self.publication_types) + ")")
+        query = " AND ".join(parts)
+        if self.exclude:
+            query += " NOT (" + " OR ".join(self.exclude) + ")"
+        return query
+
+
+def load_registry(path: Path = REGISTRY_PATH) -> tuple[dict[str, SearchSpec], dict[str, SearchSpec]]:
+    """(searches, templates) from the registry file, keyed by name."""
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    searches = {name: SearchSpec.from_dict(name, spec) for name, spec in data.get("searches", {}).items()}
+    templates = {name: SearchSpec.from_dict(name, spec) for name, spec in data.get("templates", {}).items()}
+    for name, spec in searches.items():
+        if not spec.term:
+            raise ValueError(f"Search {name!r} has no term")
+    return searches, templates
+
+
+def get_search(name: str, path: Path = REGISTRY_PATH) -> SearchSpec:
+    """A search or template by name."""
+    searches, templates = load_registry(path)
+    spec = searches.get(name) or templates.get(name)
+    if spec is None:
+        raise KeyError(f"Unknown search {name!r}; registry has: {', '.join([*searches, *templates])}")
+    return spec
+
+
+def esearch(spec: SearchSpec, fetch: Optional[Fetch] = None) -> dict[str, Any]:
+    """PMIDs of one search (up to spec.retmax), paging through ESearch."""
+    from urllib.parse import urlencode
+
+    from eutils import eutils_base_url
+
+    if fetch is None:
+        from pmid_metadata import post_eutils as fetch
+
+    url = f"{eutils_base_url()}esearch.fcgi"
+    query = spec.query()
+    started = time.perf_counter()
+    pmids: list[str] = []
+    count = None
+    requests = 0
+    while count is None or len(pmids) < min(count, spec.retmax):
+        params = {
+            "db": "pubmed",
+            "term": query,
+            "retmode": "json",
+            "retstart": len(pmids),
+            "retmax": min(ESEARCH_PAGE_SIZE, spec.retmax - len(pmids)),
+        }
+        if spec.sort:
+            params["sort"] = spec.sort
+        # POST keeps long queries out of the URL
+        result = json.loads(fetch(url, urlencode(params).encode("utf-8")).decode("utf-8")).get("esearchresult", {})
+        requests += 1
+        count = int(result.get("count", 0))
+        page = result.get("idlist", [])
+        if not page:
+            break
+        pmids.extend(page)
+
+    return {
+        "query": query,
+        "count": count or 0,
+        "pmids": list(dict.fromkeys(pmids)),
+        "requests": requests,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def overlap(pmid_sets: dict[str, set[str]]) -> dict[str, Any]:
+    """Pairwise overlap, PMIDs unique to each search and PMIDs found by every search."""
+    names = list(pmid_sets)
+    pairs = []
+    for position, first in enumerate(names):
+        for second in names[position + 1:]:
+            shared = pmid_sets[first] & pmid_sets[second]
+            either = pmid_sets[first] | pmid_sets[second]
+            pairs.append({
+                "searches": [first, second],
+                "shared": len(shared),
+                "jaccard": round(len(shared) / len(either), 4) if either else None,
+            })
+    unique = {
+        name: len(pmid_sets[name] - set().union(*(pmid_sets[other] for other in names if other != name)))
+        for name in names
+    }
+    return {
+        "pairs": pairs,
+        "unique": unique,
+        "in_all": len(set.intersection(*pmid_sets.values())) if pmid_sets else 0,
+    }
+
+
+def identification_counts(results: dict[str, dict[str, Any]]) -> dict[str, int]:
+    """PRISMA identification stage: records from all searches, duplicates across them, records to screen."""
+    identified = sum(len(result["pmids"]) for result in results.values())
+    screened = len(set().union(*(result["pmids"] for result in results.values())))
+    return {
+        "records_identified": identified,
+        "duplicates_removed": identified - screened,
+        "records_screened": screened,
+    }
+
+
+def run_searches(
+    specs: Sequence[SearchSpec],
+    workers: int = DEFAULT_WORKERS,
+    fetch: Optional[Fetch] = None,
+) -> dict[str, Any]:
+    """Run searches concurrently; per-search results, overlap, PRISMA counts and the merged PMID list."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(specs)))) as pool:
+        futures = {spec.name: pool.submit(esearch, spec, fetch) for spec in specs}
+        results = {name: future.result() for name, future in futures.items()}
+
+    merged = list(dict.fromkeys(pmid for result in results.values() for pmid in result["pmids"]))
+    return {
+        "searches": {
+            name: {key: value for key, value in result.items() if key != "pmids"} | {"retrieved": len(result["pmids"])}
+            for name, result in results.items()
+        },
+        "overlap": overlap({name: set(result["pmids"]) for name, result in results.items()}),
+        "prisma": identification_counts(results),
+        "seconds": round(time.perf_counter() - started, 3),
+        "pmids": merged,
+        "pmids_by_search": {name: result["pmids"] for name, result in results.items()},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("names", nargs="*", help="Searches to run (default: all)")
+    parser.add_argument("--registry", type=Path, default=REGISTRY_PATH)
+    parser.add_argument("--list", action="store_true", help="Print the registered searches and their queries")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH)
+    parser.add_argument("--prisma", type=Path, default=PRISMA_COUNTS_PATH, help="PRISMA counts CSV to update")
+    parser.add_argument("--no-prisma", action="store_true", help="Do not update the PRISMA counts")
+    args = parser.parse_args()
+
+    searches, templates = load_registry(args.registry)
+    if args.list:
+        for spec in [*searches.values(), *templates.values()]:
+            kind = "template" if spec.name in templates else "search"
+            print(f"{spec.name} ({kind}): {spec.description}\n    {spec.query()}\n")
+        return
+
+    unknown = [name for name in args.names if name not in searches]
+    if unknown:
+        parser.error(f"unknown searches: {', '.join(unknown)}")
+    specs = [searches[name] for name in args.names or searches]
+
+    run = run_searches(specs, args.workers)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(run, indent=2), encoding="utf-8")
+
+    for name, result in run["searches"].items():
+        print(f"{name:<20} {result['retrieved']:>6} of {result['count']:>6} records  ({result['seconds']:.2f} s)")
+    for pair in run["overlap"]["pairs"]:
+        print(f"  {' & '.join(pair['searches'])}: {pair['shared']} shared (Jaccard {pair['jaccard']})")
+    prisma = run["prisma"]
+    print(
+        f"Identified {prisma['records_identified']}, duplicates removed {prisma['duplicates_removed']}, "
+        f"screened {prisma['records_screened']} ({run['seconds']:.2f} s)"
+    )
+    print(f"Results written to {args.output}")
+
+    if not args.no_prisma:
+        per_search = "; ".join(f"{name} (n = {result['retrieved']})" for name, result in run["searches"].items())
+        record_counts(
+            prisma,
+            {
+                "records_identified": f"PubMed: {per_search}",
+                "duplicates_removed": "PMIDs returned by more than one search",
+            },
+            args.prisma,
+        )
+        print(f"PRISMA identification counts written to {args.prisma}")
+
+
+if __name__ == "__main__":
+    main()
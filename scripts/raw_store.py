@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+
+"""
+Compressed JSON Lines store for raw PubMed articles.
+
+Articles are appended one batch at a time, each batch written as its own
+compressed member (a gzip member, or a zstd frame for .zst paths when the
+optional `zstandard` package is installed), so the store can be produced as
+records arrive and read back as a stream. An optional sidecar index
+(<store>.idx, "pmid<TAB>member offset" lines) gives random access by PMID
+without decompressing the whole file.
+
+The legacy data/pubmed_raw_python.json array is still readable through
+iter_articles(), and can be converted with:
+
+    python scripts/raw_store.py convert data/pubmed_raw_python.json data/pubmed_raw_python.jsonl.gz
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import io
+import json
+import os
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator, Optional, Union
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+RAW_STORE_PATH = PROJECT_ROOT / "data" / "pubmed_raw_python.jsonl.gz"
+LEGACY_RAW_PATH = PROJECT_ROOT / "data" / "pubmed_raw_python.json"
+
+PathLike = Union[str, Path]
+
+
+def default_raw_path() -> Path:
+    """The JSONL store if one has been written, otherwise the legacy JSON array."""
+    return RAW_STORE_PATH if RAW_STORE_PATH.exists() else LEGACY_RAW_PATH
+
+
+def index_path(path: PathLike) -> Path:
+    path = Path(path)
+    return path.with_name(path.name + ".idx")
+
+
+def _require_zstd() -> None:
+    if zstandard is None:
+        raise ImportError("Reading or writing .zst stores requires the 'zstandard' package")
+
+
+def _compress(data: bytes, path: Path) -> bytes:
+    if path.suffix == ".zst":
+        _require_zstd()
+        return zstandard.ZstdCompressor().compress(data)
+    if path.suffix == ".gz":
+        return gzip.compress(data, mtime=0)
+    return data
+
+
+def _open_text(handle: IO[bytes], path: Path, single_member: bool = False) -> IO[str]:
+    """Decompressing text stream over handle from its current position."""
+    if path.suffix == ".zst":
+        _require_zstd()
+        raw = zstandard.ZstdDecompressor().stream_reader(handle, read_across_frames=not single_member)
+    elif path.suffix == ".gz":
+        raw = gzip.GzipFile(fileobj=handle, mode="rb")
+    else:
+        raw = handle
+    return io.TextIOWrapper(raw, encoding="utf-8")
+
+
+class RawStoreWriter:
+    """Appends article batches to a compressed JSONL store.
+
+    Output goes to temporary files that replace the store and its index on
+    close(), so readers never see a half-written store.
+    """
+
+    def __init__(self, path: PathLike, index: bool = True) -> None:
+        self.path = Path(path)
+        if self.path.suffix == ".zst":
+            _require_zstd()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self._handle: IO[bytes] = self._tmp_path.open("wb")
+        self._index: Optional[IO[str]] = None
+        if index:
+            self._tmp_index = index_path(self.path).with_name(index_path(self.path).name + ".tmp")
+            self._index = self._tmp_index.open("w", encoding="utf-8")
+        self.count = 0
+
+    def write_batch(self, articles: Iterable[dict[str, Any]]) -> None:
+        articles = list(articles)
+        if not articles:
+            return
+        offset = self._handle.tell()
+        payload = "".join(json.dumps(article, ensure_ascii=False) + "\n" for article in articles)
+        self._handle.write(_compress(payload.encode("utf-8"), self.path))
+        if self._index is not None:
+            self._index.writelines(f"{article.get('pmid', '')}\t{offset}\n" for article in articles)
+        self.count += len(articles)
+
+    def close(self) -> None:
+        self._handle.close()
+        os.replace(self._tmp_path, self.path)
+        if self._index is not None:
+            self._index.close()
+            os.replace(self._tmp_index, index_path(self.path))
+        elif index_path(self.path).exists():
+            # An index from a previous store would point at the wrong offsets
+            index_path(self.path).unlink()
+
+    def abort(self) -> None:
+        self._handle.close()
+        self._tmp_path.unlink(missing_ok=True)
+        if self._index is not None:
+            self._index.close()
+            self._tmp_index.unlink(missing_ok=True)
+
+    def __enter__(self) -> "RawStoreWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_store(articles: Iterable[dict[str, Any]], path: PathLike, batch_size: int = 100, index: bool = True) -> int:
+    """Write articles to a store in batches of batch_size; returns the record count."""
+    with RawStoreWriter(path, index=index) as writer:
+        batch: list[dict[str, Any]] = []
+        for article in articles:
+            batch.append(article)
+            if len(batch) >= batch_size:
+                writer.write_batch(batch)
+                batch = []
+        writer.write_batch(batch)
+    return writer.count
+
+
+def iter_articles(path: Optional[PathLike] = None) -> Iterator[dict[str, Any]]:
+    """Stream articles from a JSONL store (plain, .gz or .zst) or a legacy JSON array."""
+    path = Path(path) if path is not None else default_raw_path()
+    if path.suffix == ".json":
+        with path.open(encoding="utf-8") as infile:
+            yield from json.load(infile)
+        return
+    with path.open("rb") as handle, _open_text(handle, path) as lines:
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+
+
+def load_articles(path: Optional[PathLike] = None) -> list[dict[str, Any]]:
+    return list(iter_articles(path))
+
+
+class RawStoreReader:
+    """Random access by PMID through the sidecar index, with a scan fallback."""
+
+    def __init__(self, path: PathLike) -> None:
+        self.path = Path(path)
+        self._offsets: Optional[dict[str, int]] = None
+
+    @property
+    def offsets(self) -> dict[str, int]:
+        if self._offsets is None:
+            self._offsets = {}
+            sidecar = index_path(self.path)
+            if sidecar.exists():
+                with sidecar.open(encoding="utf-8") as infile:
+                    for line in infile:
+                        pmid, _, offset = line.rstrip("\n").partition("\t")
+                        self._offsets[pmid] = int(offset)
+        return self._offsets
+
+    def get(self, pmid: str) -> Optional[dict[str, Any]]:
+        offset = self.offsets.get(pmid)
+        if offset is None:
+            if self.offsets:
+                return None
+            # No index (or a legacy JSON array): scan the store
+            return next((article for article in iter_articles(self.path) if article.get("pmid") == pmid), None)
+        with self.path.open("rb") as handle:
+            handle.seek(offset)
+            with _open_text(handle, self.path, single_member=True) as lines:
+                for line in lines:
+                    article = json.loads(line)
+                    if article.get("pmid") == pmid:
+                        return article
+        return None
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        return iter_articles(self.path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    convert = commands.add_parser("convert", help="Rewrite a raw-article file as a JSONL store")
+    convert.add_argument("source", type=Path)
+    convert.add_argument("destination", type=Path)
+    convert.add_argument("--batch-size", type=int, default=100, help="Records per compressed member")
+    convert.add_argument("--no-index", action="store_true", help="Do not write the PMID offset index")
+    get = commands.add_parser("get", help="Print one article by PMID")
+    get.add_argument("store", type=Path)
+    get.add_argument("pmid")
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        count = write_store(iter_articles(args.source), args.destination, args.batch_size, index=not args.no_index)
+        print(f"Wrote {count} articles to {args.destination}")
+    else:
+        article = RawStoreReader(args.store).get(args.pmid)
+        if article is None:
+            raise SystemExit(f"PMID {args.pmid} not found in {args.store}")
+        print(json.dumps(article, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+
+"""
+Reference engine shared by the export scripts.
+
+Article metadata is parsed once (from the master CSV or from PubMed EFetch
+XML) into compact Reference records. Each record is then rendered in any
+number of citation styles in a single streaming pass, with formatted strings
+cached by (pmid, style and formatter version, metadata hash) so unchanged
+references are never reformatted on later runs.
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import json
+import xml.etree.ElementTree as ET
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
+
+
+class Reference(NamedTuple):
+    pmid: str
+    authors: tuple[tuple[str, str], ...]  # (last name, initials); initials empty for collective names
+    title: str
+    journal: str
+    journal_abbrev: str
+    year: str
+    volume: str
+    issue: str
+    pages: str
+    doi: str
+
+
+def metadata_hash(ref: Reference) -> str:
+    return hashlib.blake2b(repr(tuple(ref)).encode("utf-8"), digest_size=8).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Parsers
+# ---------------------------------------------------------------------------
+
+def parse_author_list(value: str) -> tuple[tuple[str, str], ...]:
+    """Split 'Liu J; Han W' (ESummary/CSV form) into (last, initials) pairs."""
+    authors = []
+    for name in value.split(";"):
+        name = name.strip()
+        if not name:
+            continue
+        last, _, initials = name.rpartition(" ")
+        if last and initials.isupper() and initials.isalpha():
+            authors.append((last, initials))
+        else:
+            authors.append((name, ""))
+    return tuple(authors)
+
+
+def records_from_master_csv(path: Path) -> Iterator[Reference]:
+    """Yield one Reference per unique PMID, in first-seen order."""
+    seen: set[str] = set()
+    with path.open(encoding="utf-8") as infile:
+        for row in csv.DictReader(infile):
+            pmid = row.get("pmid", "").strip()
+            if not pmid or pmid in seen:
+                continue
+            seen.add(pmid)
+            journal = row.get("journal", "").strip()
+            yield Reference(
+                pmid=pmid,
+                authors=parse_author_list(row.get("authors", "")),
+                title=row.get("title", "").strip(),
+                journal=journal,
+                journal_abbrev="",
+                year=row.get("year", "").strip(),
+                volume="",
+                issue="",
+                pages="",
+                doi=row.get("doi", "").strip(),
+            )
+
+
+def _text(element: Optional[ET.Element]) -> str:
+    return "".join(element.itertext()).strip() if element is not None else ""
+
+
+def reference_from_article(article: ET.Element) -> Reference:
+    """Build a Reference from a <PubmedArticle> element."""
+    authors = []
+    for author in article.iterfind(".//AuthorList/Author"):
+        last = _text(author.find("LastName"))
+        if last:
+            authors.append((last, _text(author.find("Initials"))))
+        else:
+            collective = _text(author.find("CollectiveName"))
+            if collective:
+                authors.append((collective, ""))
+
+    journal = article.find(".//Journal")
+    pubdate = journal.find("JournalIssue/PubDate") if journal is not None else None
+    year = _text(pubdate.find("Year")) if pubdate is not None else ""
+    if not year and pubdate is not None:
+        year = _text(pubdate.find("MedlineDate"))[:4]
+
+    doi = ""
+    for location in article.iterfind(".//ELocationID"):
+        if location.get("EIdType") == "doi":
+            doi = _text(location)
+            break
+    if not doi:
+        for article_id in article.iterfind(".//ArticleIdList/ArticleId"):
+            if article_id.get("IdType") == "doi":
+                doi = _text(article_id)
+                break
+
+    return Reference(
+        pmid=_text(article.find(".//PMID")),
+        authors=tuple(authors),
+        title=_text(article.find(".//ArticleTitle")),
+        journal=_text(journal.find("Title")) if journal is not None else "",
+        journal_abbrev=_text(journal.find("ISOAbbreviation")) if journal is not None else "",
+        year=year,
+        volume=_text(journal.find("JournalIssue/Volume")) if journal is not None else "",
+        issue=_text(journal.find("JournalIssue/Issue")) if journal is not None else "",
+        pages=_text(article.find(".//Pagination/MedlinePgn")),
+        doi=doi,
+    )
+
+
+def records_from_pubmed_xml(path: Path) -> Iterator[Reference]:
+    """Stream References from an EFetch XML file without building the full tree."""
+    for _, element in ET.iterparse(path, events=("end",)):
+        if element.tag == "PubmedArticle":
+            yield reference_from_article(element)
+            element.clear()
+
+
+# ---------------------------------------------------------------------------
+# Styles
+# ---------------------------------------------------------------------------
+
+def _sentence(text: str) -> str:
+    text = text.strip()
+    return text if not text or text[-1] in ".?!" else f"{text}."
+
+
+def _dotted_initials(initials: str) -> str:
+    return " ".join(f"{letter}." for letter in initials)
+
+
+def _locator(ref: Reference) -> str:
+    """';25(1):1825' style volume/issue/pages suffix used by Vancouver and AMA."""
+    locator = ""
+    if ref.volume:
+        locator += f";{ref.volume}"
+    if ref.issue:
+        locator += f"({ref.issue})"
+    if ref.pages:
+        locator += f":{ref.pages}"
+    return locator
+
+
+def _names(ref: Reference, limit: int, keep: int) -> str:
+    names = [f"{last} {initials}".strip() for last, initials in ref.authors]
+    if len(names) > limit:
+        return ", ".join(names[:keep]) + ", et al"
+    return ", ".join(names)
+
+
+def format_plain(ref: Reference) -> str:
+    authors = ", ".join(f"{last} {initials}".strip() for last, initials in ref.authors)
+    doi_text = ref.doi if ref.doi else "N/A"
+    return (
+        f"{authors} ({ref.year or '2024'}). {ref.title}. {ref.journal or 'Journal not specified'}. "
+        f"DOI: {doi_text}. PMID: {ref.pmid}."
+    )
+
+
+def format_vancouver(ref: Reference) -> str:
+    citation = f"{_names(ref, 6, 6)}. {_sentence(ref.title)} {ref.journal_abbrev or ref.journal}. {ref.year}"
+    return citation + _locator(ref) + "."
+
+
+def format_ama(ref: Reference) -> str:
+    citation = f"{_names(ref, 6, 3)}. {_sentence(ref.title)} {ref.journal_abbrev or ref.journal}. {ref.year}"
+    citation += _locator(ref) + "."
+    if ref.doi:
+        citation += f" doi:{ref.doi}"
+    return citation
+
+
+def format_apa(ref: Reference) -> str:
+    names = [
+        f"{last}, {_dotted_initials(initials)}" if initials else last
+        for last, initials in ref.authors
+    ]
+    if len(names) > 20:
+        authors = ", ".join(names[:19]) + ", . . . " + names[-1]
+    elif len(names) > 1:
+        authors = ", ".join(names[:-1]) + ", & " + names[-1]
+    else:
+        authors = "".join(names)
+    citation = f"{authors} ({ref.year or 'n.d.'}). {_sentence(ref.title)} {ref.journal}"
+    if ref.volume:
+        citation += f", {ref.volume}"
+        if ref.issue:
+            citation += f"({ref.issue})"
+    if ref.pages:
+        citation += f", {ref.pages}"
+    citation += "."
+    if ref.doi:
+        citation += f" https://doi.org/{ref.doi}"
+    return citation
+
+
+_BIBTEX_SPECIALS = str.maketrans({
+    "\\": r"\textbackslash{}",
+    "{": r"\{",
+    "}": r"\}",
+    "&": r"\&",
+    "%": r"\%",
+    "#": r"\#",
+    "_": r"\_",
+})
+
+
+def _bibtex_escape(value: str) -> str:
+    return value.translate(_BIBTEX_SPECIALS)
+
+
+# Already escaped (author) or read verbatim by biblatex and the url package (doi)
+BIBTEX_VERBATIM_FIELDS = ("author", "doi", "pmid")
+
+
+def format_bibtex(ref: Reference) -> str:
+    fields = [
+        ("author", " and ".join(
+            f"{_bibtex_escape(last)}, {_dotted_initials(initials)}" if initials else f"{{{_bibtex_escape(last)}}}"
+            for last, initials in ref.authors
+        )),
+        ("title", ref.title.rstrip(".")),
+        ("journal", ref.journal),
+        ("year", ref.year),
+        ("volume", ref.volume),
+        ("number", ref.issue),
+        ("pages", ref.pages.replace("-", "--")),
+        ("doi", ref.doi),
+        ("pmid", ref.pmid),
+    ]
+    body = ",\n".join(
+        f"  {name} = {{{value if name in BIBTEX_VERBATIM_FIELDS else _bibtex_escape(value)}}}"
+        for name, value in fields
+        if value
+    )
+    return f"@article{{pmid{ref.pmid},\n{body}\n}}\n"
+
+
+def format_ris(ref: Reference) -> str:
+    lines = ["TY  - JOUR"]
+    lines.extend(
+        f"AU  - {last}, {initials}" if initials else f"AU  - {last}"
+        for last, initials in ref.authors
+    )
+    start_page, _, end_page = ref.pages.partition("-")
+    for tag, value in (
+        ("TI", ref.title),
+        ("JO", ref.journal),
+        ("J2", ref.journal_abbrev),
+        ("PY", ref.year),
+        ("VL", ref.volume),
+        ("IS", ref.issue),
+        ("SP", start_page),
+        ("EP", end_page),
+        ("DO", ref.doi),
+        ("AN", ref.pmid),
+    ):
+        if value:
+            lines.append(f"{tag}  - {value}")
+    lines.append("ER  - ")
+    return "\n".join(lines) + "\n"
+
+
+class Style(NamedTuple):
+    render: Callable[[Reference], str]
+    numbered: bool
+    extension: str
+    version: int = 1  # bump whenever render's output changes, so cached strings are not reused
+
+
+STYLES: dict[str, Style] = {
+    "plain": Style(format_plain, True, "txt"),
+    "vancouver": Style(format_vancouver, True, "txt"),
+    "ama": Style(format_ama, True, "txt"),
+    "apa": Style(format_apa, False, "txt"),
+    "bibtex": Style(format_bibtex, False, "bib", version=2),
+    "ris": Style(format_ris, False, "ris"),
+}
+
+
+# ---------------------------------------------------------------------------
+# Cache and export
+# ---------------------------------------------------------------------------
+
+class ReferenceCache:
+    """Formatted strings keyed by (pmid, style and version, metadata hash), optionally persisted as JSON."""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path
+        self.entries: dict[str, str] = {}
+        self.current: dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+        if path is not None and path.exists():
+            try:
+                entries = json.loads(path.read_text(encoding="utf-8"))
+            except ValueError:
+                entries = {}
+            # Strings from another formatter version (or an older key layout) are dropped
+            current_styles = {f"{name}@{style.version}" for name, style in STYLES.items()}
+            self.entries = {
+                key: text for key, text in entries.items()
+                if key.count("|") == 2 and key.split("|")[1] in current_styles
+            }
+
+    def format(self, ref: Reference, style: str, digest: Optional[str] = None) -> str:
+        digest = digest or metadata_hash(ref)
+        self.current[ref.pmid] = digest
+        key = f"{ref.pmid}|{style}@{STYLES[style].version}|{digest}"
+        text = self.entries.get(key)
+        if text is None:
+            text = STYLES[style].render(ref)
+            self.entries[key] = text
+            self.misses += 1
+        else:
+            self.hits += 1
+        return text
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        # Entries for outdated metadata of a PMID seen in this run are dropped
+        kept = {}
+        for key, text in self.entries.items():
+            pmid, _, digest = key.split("|")
+            if self.current.get(pmid, digest) == digest:
+                kept[key] = text
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(kept, ensure_ascii=False), encoding="utf-8")
+        tmp_path.replace(self.path)
+
+
+def export(
+    records: Iterable[Reference],
+    outputs: dict[str, Path],
+    cache: Optional[ReferenceCache] = None,
+) -> int:
+    """Write every record in each requested style (style -> path) in one pass."""
+    unknown = set(outputs) - set(STYLES)
+    if unknown:
+        raise ValueError(f"Unknown citation style(s): {', '.join(sorted(unknown))}")
+    cache = cache or ReferenceCache()
+
+    count = 0
+    with ExitStack() as stack:
+        handles = {}
+        for style, path in outputs.items():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            handles[style] = stack.enter_context(path.open("w", encoding="utf-8"))
+
+        for index, ref in enumerate(records, start=1):
+            digest = metadata_hash(ref)
+            for style, handle in handles.items():
+                text = cache.format(ref, style, digest)
+                if STYLES[style].numbered:
+                    handle.write(f"{index}. {text}\n")
+                else:
+                    handle.write(text if text.endswith("\n") else text + "\n")
+                    if style in ("bibtex", "ris"):
+                        handle.write("\n")
+            count = index
+
+    cache.save()
+    return count
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+
+"""
+Bootstrap confidence intervals and permutation tests for grouped effect sizes.
+
+bootstrap_means() gives a percentile CI for the mean of every group (e.g.
+each exposure type, marker or cancer type). The values are sorted by group
+once; each resample then draws every group's rows with replacement from a
+single uniform matrix, and np.add.reduceat turns the draws into per-group
+means, so all strata are resampled together.
+
+permutation_tests() compares every pair of groups: labels are shuffled
+within the pair and the observed mean difference is ranked against the
+shuffled ones, p = (1 + #{|d*| >= |d|}) / (1 + resamples).
+
+Resamples are split into chunks that run on a process pool. Each chunk has
+its own RNG stream spawned from a SeedSequence keyed by the seed and the
+analysis name, so results are reproducible and do not depend on the number
+of workers or on which other analyses run alongside:
+
+    python scripts/resampling.py --resamples 10000 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import csv
+import json
+import os
+import time
+import zlib
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Hashable, Iterator, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from facet_index import MASTER_DATASET
+from meta_pooling import numeric_column
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+OUTPUT_PATH = PROJECT_ROOT / "output" / "resampling_results.json"
+
+GROUP_FIELDS = ("exposure_type", "epigenetic_marker", "cancer_type")
+CONTRAST_FIELD = "exposure_type"
+VALUE_FIELD = "epigenetic_effect_size"
+
+DEFAULT_RESAMPLES = 10_000
+DEFAULT_SEED = 2025
+MIN_GROUP_SIZE = 2
+# Upper bound on the values drawn by one chunk, which bounds worker memory
+CHUNK_DRAWS = 2_000_000
+
+
+class BootstrapCI(NamedTuple):
+    n: int
+    mean: float
+    ci_lower: Optional[float]
+    ci_upper: Optional[float]
+
+
+class PermutationTest(NamedTuple):
+    group_a: Hashable
+    group_b: Hashable
+    n_a: int
+    n_b: int
+    difference: float
+    p_value: float
+
+
+@contextlib.contextmanager
+def process_pool(workers: Optional[int] = None) -> Iterator[Optional[Executor]]:
+    """A process pool, or None (run inline) for a single worker."""
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        yield None
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield executor
+
+
+def _run(executor: Optional[Executor], func: Callable[..., Any], tasks: list[tuple]) -> list[Any]:
+    if executor is None:
+        return [func(*task) for task in tasks]
+    futures = [executor.submit(func, *task) for task in tasks]
+    return [future.result() for future in futures]
+
+
+def _streams(seed: int, name: str, resamples: int, draws_per_resample: int) -> list[tuple[int, np.random.SeedSequence]]:
+    """(resamples, seed sequence) per chunk for one named analysis."""
+    per_chunk = max(1, CHUNK_DRAWS // max(1, draws_per_resample))
+    sizes = [min(per_chunk, resamples - start) for start in range(0, resamples, per_chunk)]
+    root = np.random.SeedSequence(seed, spawn_key=(zlib.crc32(name.encode("utf-8")),))
+    return list(zip(sizes, root.spawn(len(sizes))))
+
+
+def _group_runs(values: Sequence[float], groups: Sequence[Hashable]) -> tuple[list[Hashable], np.ndarray, np.ndarray, np.ndarray]:
+    """Finite values sorted into contiguous runs per group: labels (first-seen order), values, starts, sizes."""
+    y = np.asarray(values, dtype=float)
+    keep = np.isfinite(y)
+    labels: dict[Hashable, int] = {}
+    codes = np.array(
+        [labels.setdefault(group, len(labels)) for group, kept in zip(groups, keep) if kept],
+        dtype=np.intp,
+    )
+    order = np.argsort(codes, kind="stable")
+    sizes = np.bincount(codes, minlength=len(labels))
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1])).astype(np.intp)
+    return list(labels), y[keep][order], starts, sizes
+
+
+def _bootstrap_chunk(
+    values: np.ndarray, starts: np.ndarray, sizes: np.ndarray, resamples: int, seed: np.random.SeedSequence
+) -> np.ndarray:
+    """Group means of `resamples` bootstrap samples, shape (resamples, groups)."""
+    rng = np.random.default_rng(seed)
+    offsets = np.repeat(starts, sizes)
+    spans = np.repeat(sizes, sizes)
+    draws = offsets + (rng.random((resamples, len(values))) * spans).astype(np.intp)
+    return np.add.reduceat(values[draws], starts, axis=1) / sizes
+
+
+def _permutation_chunk(values: np.ndarray, n_a: int, observed: float, resamples: int, seed: np.random.SeedSequence) -> int:
+    """How many label permutations give a mean difference at least as extreme as observed."""
+    rng = np.random.default_rng(seed)
+    shuffled = rng.permuted(np.broadcast_to(values, (resamples, len(values))), axis=1)
+    total = values.sum()
+    sum_a = shuffled[:, :n_a].sum(axis=1)
+    differences = sum_a / n_a - (total - sum_a) / (len(values) - n_a)
+    # The tolerance keeps permutations that tie with the observed split from being lost to rounding
+    return int(np.count_nonzero(np.abs(differences) >= abs(observed) - 1e-12))
+
+
+def bootstrap_means(
+    values: Sequence[float],
+    groups: Sequence[Hashable],
+    resamples: int = DEFAULT_RESAMPLES,
+    level: float = 0.95,
+    seed: int = DEFAULT_SEED,
+    executor: Optional[Executor] = None,
+    name: str = "bootstrap",
+) -> dict[Hashable, BootstrapCI]:
+    """Percentile bootstrap CI of the mean per group, in first-seen group order.
+
+    NaN values are ignored; groups with fewer than MIN_GROUP_SIZE values get no interval.
+    """
+    labels, y, starts, sizes = _group_runs(values, groups)
+    means = np.add.reduceat(y, starts) / sizes if labels else np.empty(0)
+    resampled = sizes >= MIN_GROUP_SIZE
+    lower = np.full(len(labels), np.nan)
+    upper = np.full(len(labels), np.nan)
+
+    if resampled.any() and resamples > 0:
+        # Only groups that are resampled take part, so their values are one contiguous block each
+        selected = np.concatenate([y[start:start + size] for start, size in zip(starts[resampled], sizes[resampled])])
+        sub_sizes = sizes[resampled]
+        sub_starts = np.concatenate(([0], np.cumsum(sub_sizes)[:-1])).astype(np.intp)
+        tasks = [
+            (selected, sub_starts, sub_sizes, chunk, stream)
+            for chunk, stream in _streams(seed, name, resamples, len(selected))
+        ]
+        draws = np.concatenate(_run(executor, _bootstrap_chunk, tasks))
+        alpha = (1 - level) / 2
+        lower[resampled], upper[resampled] = np.quantile(draws, [alpha, 1 - alpha], axis=0)
+
+    return {
+        label: BootstrapCI(
+            int(sizes[index]),
+            float(means[index]),
+            float(lower[index]) if resampled[index] else None,
+            float(upper[index]) if resampled[index] else None,
+        )
+        for index, label in enumerate(labels)
+    }
+
+
+def permutation_tests(
+    values: Sequence[float],
+    groups: Sequence[Hashable],
+    resamples: int = DEFAULT_RESAMPLES,
+    seed: int = DEFAULT_SEED,
+    executor: Optional[Executor] = None,
+    name: str = "permutation",
+) -> list[PermutationTest]:
+    """Two-sided permutation test of the mean difference for every pair of groups with enough values."""
+    labels, y, starts, sizes = _group_runs(values, groups)
+    eligible = [index for index in range(len(labels)) if sizes[index] >= MIN_GROUP_SIZE]
+    pairs = [(a, b) for position, a in enumerate(eligible) for b in eligible[position + 1:]]
+
+    tasks, owners, observed = [], [], []
+    for pair_index, (a, b) in enumerate(pairs):
+        group_a = y[starts[a]:starts[a] + sizes[a]]
+        group_b = y[starts[b]:starts[b] + sizes[b]]
+        difference = float(group_a.mean() - group_b.mean())
+        observed.append(difference)
+        pooled = np.concatenate((group_a, group_b))
+        pair_name = f"{name}:{labels[a]}|{labels[b]}"
+        for chunk, stream in _streams(seed, pair_name, resamples, len(pooled)):
+            tasks.append((pooled, len(group_a), difference, chunk, stream))
+            owners.append(pair_index)
+
+    extreme = np.zeros(len(pairs), dtype=np.int64)
+    for pair_index, count in zip(owners, _run(executor, _permutation_chunk, tasks)):
+        extreme[pair_index] += count
+
+    return [
+        PermutationTest(
+            labels[a],
+            labels[b],
+            int(sizes[a]),
+            int(sizes[b]),
+            observed[pair_index],
+            float((1 + extreme[pair_index]) / (1 + resamples)),
+        )
+        for pair_index, (a, b) in enumerate(pairs)
+    ]
+
+
+def resample_dataset(
+    rows: Sequence[dict[str, str]],
+    fields: Sequence[str] = GROUP_FIELDS,
+    contrast_field: Optional[str] = CONTRAST_FIELD,
+    resamples: int = DEFAULT_RESAMPLES,
+    level: float = 0.95,
+    seed: int = DEFAULT_SEED,
+    workers: Optional[int] = None,
+) -> dict[str, Any]:
+    """Bootstrap CIs per group of each field and permutation tests between contrast_field groups, JSON-ready."""
+    values = numeric_column(rows, VALUE_FIELD)
+    results: dict[str, Any] = {
+        "value": VALUE_FIELD,
+        "resamples": resamples,
+        "level": level,
+        "seed": seed,
+        "bootstrap": {},
+        "permutation": [],
+    }
+    with process_pool(workers) as executor:
+        for field in fields:
+            groups = [row.get(field, "") for row in rows]
+            intervals = bootstrap_means(values, groups, resamples, level, seed, executor, name=f"bootstrap:{field}")
+            results["bootstrap"][field] = [
+                {
+                    field: label,
+                    "n": ci.n,
+                    "mean": round(ci.mean, 4),
+                    "ci_lower": round(ci.ci_lower, 4) if ci.ci_lower is not None else None,
+                    "ci_upper": round(ci.ci_upper, 4) if ci.ci_upper is not None else None,
+                }
+                for label, ci in sorted(intervals.items(), key=lambda item: (-item[1].n, str(item[0])))
+            ]
+        if contrast_field:
+            groups = [row.get(contrast_field, "") for row in rows]
+            tests = permutation_tests(values, groups, resamples, seed, executor, name=f"permutation:{contrast_field}")
+            results["permutation"] = [
+                {
+                    "group_a": test.group_a,
+                    "group_b": test.group_b,
+                    "n_a": test.n_a,
+                    "n_b": test.n_b,
+                    "mean_difference": round(test.difference, 4),
+                    "p_value": round(test.p_value, 6),
+                }
+                for test in tests
+            ]
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dataset", type=Path, default=MASTER_DATASET)
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH)
+    parser.add_argument("--fields", nargs="+", default=list(GROUP_FIELDS))
+    parser.add_argument("--contrast-field", default=CONTRAST_FIELD, help="Field whose groups are compared pairwise ('' to skip)")
+    parser.add_argument("--resamples", type=int, default=DEFAULT_RESAMPLES)
+    parser.add_argument("--level", type=float, default=0.95)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    if not args.dataset.exists():
+        raise FileNotFoundError(f"Master dataset not found: {args.dataset}")
+    with args.dataset.open(encoding="utf-8") as infile:
+        rows = list(csv.DictReader(infile))
+
+    started = time.perf_counter()
+    results = resample_dataset(
+        rows, args.fields, args.contrast_field or None, args.resamples, args.level, args.seed, args.workers
+    )
+    elapsed = time.perf_counter() - started
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    groups = sum(len(entries) for entries in results["bootstrap"].values())
+    print(
+        f"{args.resamples} resamples: bootstrap CIs for {groups} groups, "
+        f"{len(results['permutation'])} permutation tests in {elapsed:.2f} s"
+    )
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,10 +6,11 @@ Convenience runner for the full living systematic review pipeline.
 The script executes the following steps in sequence from the project root:
 1. Fetch latest PubMed data
 2. Prepare harmonised master dataset
-3. Run R-based descriptive statistics and figure generation
-4. Export formatted references
-5. Build the comprehensive manuscript (Markdown + embedded figures)
-6. Render a DOCX manuscript via pandoc
+3. Draw the PRISMA flow diagram from the counts recorded by steps 1-2
+4. Run exposure summaries, contrasts, SEPT9 pooling and tables (meta_analysis.py)
+5. Render Figures 2-6 from the meta-analysis results (meta_figures.py)
+6. Export formatted references
+7. Build the comprehensive manuscript (Markdown + DOCX with embedded figures)
 """
 
 from __future__ import annotations
@@ -25,10 +26,11 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 RUN_STEPS = [
     ["python", "scripts/fetch_pubmed_data.py"],
     ["python", "scripts/prepare_master_dataset.py"],
-    ["Rscript", "scripts/meta_analysis.R"],
+    ["python", "scripts/prisma_flow.py"],
+    ["python", "scripts/meta_analysis.py"],
+    ["python", "scripts/meta_figures.py"],
     ["python", "scripts/export_references.py"],
     ["python", "scripts/build_comprehensive_manuscript.py"],
-    ["pandoc", "output/Epigenetics_PublicHealth_Manuscript.md", "-o", "output/Epigenetics_PublicHealth_Manuscript.docx"],
 ]
 
 
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+
+"""
+Title and publication-type screening that runs before abstracts are fetched.
+
+Every ESearch hit used to go through EFetch and full extraction. Screener
+looks only at what ESummary already returned (title and publication types).
+The search already matched each record on title and abstract, so the
+screen errs toward inclusion. Only two high-precision rules exclude:
+
+- excluded publication types (reviews, editorials, errata, retractions, ...)
+- animal or in vitro titles that mention no human subjects
+
+Two weaker rules only flag records for review (REVIEW_RULES):
+
+- titles without any epigenetic term that describe a purely genetic study
+  (Mendelian randomisation, polymorphisms, GWAS, ...)
+- titles with neither an epigenetic nor a cancer term
+
+Each rule is one compiled regular expression. An optional local model, a
+logistic regression over hashed word uni- and bigrams trained from
+labelled titles and stored as an .npz file, decides flagged records and
+excludes any record it scores below a conservative threshold. Without
+the model, flagged records are kept and listed for manual review. Every
+exclusion carries its rule and reason, for the PRISMA "records excluded"
+count and the screening log.
+
+    python scripts/screening.py screen data/epigenetic_master_dataset.csv
+    python scripts/screening.py train labelled_titles.csv --model data/screening_model.npz
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import re
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Any, Iterable, NamedTuple, Optional, Sequence
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+MODEL_PATH = PROJECT_ROOT / "data" / "screening_model.npz"
+EXCLUSIONS_PATH = PROJECT_ROOT / "data" / "screening_exclusions.csv"
+REVIEW_PATH = PROJECT_ROOT / "data" / "screening_review.csv"
+
+EXCLUDED_PUBLICATION_TYPES = frozenset({
+    "Review",
+    "Systematic Review",
+    "Meta-Analysis",
+    "Editorial",
+    "Comment",
+    "Letter",
+    "News",
+    "Published Erratum",
+    "Retraction of Publication",
+    "Retracted Publication",
+    "Expression of Concern",
+})
+
+# Marks, RNA species and the enzymes, readers and complexes that write,
+# erase or read them (EHMT2, KDMs, SETDs, Spindlin-1, BET proteins, ...)
+EPIGENETIC_TERMS = re.compile(
+    r"epigen|methyl|histone|chromatin|acetyl|nucleosom|\bm6a\b|\bm5c\b|mirna|microrna|\bmir-?\d|lncrna|lnc-|circrna"
+    r"|circular rna|non-?coding rna|pirna|pir_|\bpiwi|imprint|epimutation|clock|age acceleration|\bdnmt|\btet\d"
+    r"|\bezh[12]|\bhdac|\bsirt\d|sirtuin|polycomb|\bprc[12]\b|\behmt|\bkdm\d|\bkmt\d|\bsetd|\bnsd[123]\b|\bdot1l"
+    r"|\bprmt\d|\bmettl\d|\bfto\b|\balkbh|\bytdf|spindlin|bromodomain|\bbrd\d|\bbet\b|\bp300\b|\bcbp\b"
+    r"|\bsmarc|\barid1|swi/snf|\bctcf\b|\bcpg\b|\btert\b|telomer|one-carbon|\bdamid\b|beckwith|angelman|prader",
+    re.IGNORECASE,
+)
+CANCER_TERMS = re.compile(
+    r"cancer|tumou?r|carcino|neoplas|oncolog|malignan|metasta|leuka?emia|lymphoma|melanoma|sarcoma|glioma"
+    r"|glioblastoma|blastoma|myeloma|adenoma|polyps?\b|\bhcc\b|\bnsclc\b|\bcrc\b|\btnbc\b|\bhpv\b|clonal ha?ematopoiesis"
+    r"|lynch syndrome|myelodysplastic|myeloproliferative|myelofibrosis|mycosis fungoides",
+    re.IGNORECASE,
+)
+NON_HUMAN_TERMS = re.compile(
+    r"\b(mice|mouse|murine|rats?|zebrafish|drosophila|c\. elegans|yeast|arabidopsis|canine|bovine|porcine|xenografts?"
+    r"|in vitro|cell lines?)\b",
+    re.IGNORECASE,
+)
+HUMAN_TERMS = re.compile(
+    r"\b(human|humans|patients?|women|men|adults?|children|participants?|cohort|population|individuals|cases?|volunteers)\b",
+    re.IGNORECASE,
+)
+GENETIC_ONLY_TERMS = re.compile(
+    r"mendelian randomi[sz]ation|polymorphisms?|genome-wide association|\bgwas\b|\bsnps?\b|druggable genes?",
+    re.IGNORECASE,
+)
+
+# Rules that flag a record instead of excluding it: the model decides, or it is kept for manual review
+REVIEW_RULES = frozenset({"genetic_only", "off_topic"})
+
+DEFAULT_THRESHOLD = 0.2
+HASH_BUCKETS = 2 ** 18
+TOKEN = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+
+
+class Decision(NamedTuple):
+    include: bool
+    rule: str  # "publication_type", "non_human", "genetic_only", "off_topic", "model" or "" when kept
+    reason: str
+    score: Optional[float] = None
+
+
+def rule_decision(title: str, publication_types: Iterable[str]) -> Optional[Decision]:
+    """The first rule that applies to the record, or None; REVIEW_RULES decisions keep it (include=True)."""
+    excluded_types = sorted(set(publication_types) & EXCLUDED_PUBLICATION_TYPES)
+    if excluded_types:
+        return Decision(False, "publication_type", f"publication type: {', '.join(excluded_types)}")
+
+    epigenetic = EPIGENETIC_TERMS.search(title)
+    if NON_HUMAN_TERMS.search(title) and not HUMAN_TERMS.search(title):
+        return Decision(False, "non_human", "animal or in vitro study")
+    if not epigenetic and GENETIC_ONLY_TERMS.search(title):
+        return Decision(True, "genetic_only", "genetic association study without an epigenetic term in title")
+    if not epigenetic and not CANCER_TERMS.search(title):
+        return Decision(True, "off_topic", "neither epigenetic nor cancer terms in title")
+    return None
+
+
+def features(title: str, publication_types: Iterable[str] = ()) -> list[int]:
+    """Hashed word unigrams and bigrams of the title plus publication types (CRC32, so stable across runs)."""
+    words = TOKEN.findall(title.lower())
+    grams = words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+    grams.extend(f"pt:{kind.lower()}" for kind in publication_types)
+    return sorted({zlib.crc32(gram.encode("utf-8")) % HASH_BUCKETS for gram in grams})
+
+
+class HashedLogisticModel:
+    """Logistic regression over hashed n-gram indicator features."""
+
+    def __init__(self, weights: Any, bias: float = 0.0) -> None:
+        self.weights = weights
+        self.bias = bias
+
+    @classmethod
+    def train(
+        cls,
+        examples: Sequence[tuple[str, Sequence[str]]],
+        labels: Sequence[int],
+        epochs: int = 200,
+        learning_rate: float = 0.5,
+        l2: float = 1e-4,
+    ) -> "HashedLogisticModel":
+        """Full-batch gradient descent; labels are 1 for in-scope records and 0 for excluded ones."""
+        import numpy as np
+
+        rows = [features(title, types) for title, types in examples]
+        row_index = np.repeat(np.arange(len(rows)), [len(row) for row in rows])
+        columns = np.fromiter((column for row in rows for column in row), dtype=np.int64)
+        y = np.asarray(labels, dtype=float)
+        weights = np.zeros(HASH_BUCKETS)
+        bias = 0.0
+        for _ in range(epochs):
+            logits = np.bincount(row_index, weights[columns], len(rows)) + bias
+            error = 1.0 / (1.0 + np.exp(-logits)) - y
+            gradient = np.bincount(columns, error[row_index], HASH_BUCKETS) / len(rows) + l2 * weights
+            weights -= learning_rate * gradient
+            bias -= learning_rate * float(error.mean())
+        return cls(weights, bias)
+
+    @classmethod
+    def load(cls, path: Path) -> "HashedLogisticModel":
+        import numpy as np
+
+        with np.load(path) as data:
+            return cls(data["weights"], float(data["bias"]))
+
+    def save(self, path: Path) -> None:
+        import numpy as np
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(path, weights=self.weights, bias=self.bias)
+
+    def score(self, title: str, publication_types: Iterable[str] = ()) -> float:
+        """Probability that the record is in scope."""
+        import math
+
+        logit = self.bias + float(sum(self.weights[column] for column in features(title, publication_types)))
+        return 1.0 / (1.0 + math.exp(-logit))
+
+
+class Screener:
+    """Rule screening, with the optional model deciding flagged records and records the rules keep."""
+
+    def __init__(self, model: Optional[HashedLogisticModel] = None, threshold: float = DEFAULT_THRESHOLD) -> None:
+        self.model = model
+        self.threshold = threshold
+
+    @classmethod
+    def load(cls, model_path: Optional[Path] = MODEL_PATH, threshold: float = DEFAULT_THRESHOLD) -> "Screener":
+        """Rules only, plus the model when model_path exists."""
+        model = HashedLogisticModel.load(model_path) if model_path and model_path.exists() else None
+        return cls(model, threshold)
+
+    def decide(self, title: str, publication_types: Iterable[str] = ()) -> Decision:
+        """Excluded, kept, or kept with a REVIEW_RULES flag (include=True and a rule)."""
+        publication_types = list(publication_types)
+        decision = rule_decision(title, publication_types) or Decision(True, "", "")
+        if not decision.include or self.model is None:
+            return decision
+        score = self.model.score(title, publication_types)
+        if score < self.threshold:
+            reason = f"model score {score:.2f} below {self.threshold:.2f}"
+            return Decision(False, "model", f"{decision.reason}; {reason}" if decision.reason else reason, score)
+        # The model keeps flagged records it scores in scope
+        return Decision(True, "", "", score)
+
+    def split(
+        self, articles: Iterable[dict[str, Any]]
+    ) -> tuple[list[dict[str, Any]], list[tuple[dict[str, Any], Decision]], list[tuple[dict[str, Any], Decision]]]:
+        """(kept articles, [(excluded article, decision)], [(kept article flagged for review, decision)]), in input order."""
+        kept, excluded, review = [], [], []
+        for article in articles:
+            decision = self.decide(article.get("title", ""), article.get("publication_types") or [])
+            if not decision.include:
+                excluded.append((article, decision))
+                continue
+            kept.append(article)
+            if decision.rule:
+                review.append((article, decision))
+        return kept, excluded, review
+
+
+def exclusion_summary(excluded: Sequence[tuple[dict[str, Any], Decision]]) -> str:
+    """One-line reason for the PRISMA counts, e.g. "publication type 3; off-topic title 2"."""
+    counts = Counter(decision.rule for _, decision in excluded)
+    return "; ".join(f"{rule.replace('_', ' ')} {count}" for rule, count in counts.most_common())
+
+
+def write_exclusions(excluded: Sequence[tuple[dict[str, Any], Decision]], path: Path = EXCLUSIONS_PATH) -> None:
+    """Screening log: one row per excluded (or, at REVIEW_PATH, flagged) record."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8", newline="") as outfile:
+        writer = csv.writer(outfile, lineterminator="\n")
+        writer.writerow(["pmid", "title", "publication_types", "rule", "reason", "score"])
+        for article, decision in excluded:
+            writer.writerow([
+                article.get("pmid", ""),
+                article.get("title", ""),
+                "; ".join(article.get("publication_types") or []),
+                decision.rule,
+                decision.reason,
+                f"{decision.score:.4f}" if decision.score is not None else "",
+            ])
+
+
+def read_records(path: Path) -> list[dict[str, Any]]:
+    """Records from a CSV with a title column; publication types are "; "-separated."""
+    with path.open(encoding="utf-8", newline="") as infile:
+        return [
+            {
+                **row,
+                "publication_types": [kind.strip() for kind in (row.get("publication_types") or "").split(";") if kind.strip()],
+            }
+            for row in csv.DictReader(infile)
+        ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    screen = commands.add_parser("screen", help="Screen the records in a CSV and report the exclusions")
+    screen.add_argument("path", type=Path)
+    screen.add_argument("--model", type=Path, default=MODEL_PATH)
+    screen.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    screen.add_argument("--output", type=Path, help="Write the exclusion log here")
+    screen.add_argument("--review-output", type=Path, help="Write the records flagged for manual review here")
+
+    train = commands.add_parser("train", help="Train the model from a CSV with title, label (1 = in scope) and optional publication_types")
+    train.add_argument("path", type=Path)
+    train.add_argument("--model", type=Path, default=MODEL_PATH)
+    train.add_argument("--epochs", type=int, default=200)
+    args = parser.parse_args()
+
+    records = read_records(args.path)
+    if args.command == "train":
+        examples = [(record.get("title", ""), record["publication_types"]) for record in records]
+        labels = [int(record["label"]) for record in records]
+        model = HashedLogisticModel.train(examples, labels, epochs=args.epochs)
+        model.save(args.model)
+        correct = sum((model.score(*example) >= 0.5) == bool(label) for example, label in zip(examples, labels))
+        print(f"Trained on {len(records)} titles ({sum(labels)} in scope); training accuracy {correct / len(records):.3f}")
+        print(f"Model written to {args.model}")
+        return
+
+    screener = Screener.load(args.model, args.threshold)
+    kept, excluded, review = screener.split(records)
+    print(f"{len(records)} records: {len(kept)} kept, {len(excluded)} excluded ({exclusion_summary(excluded) or 'none'})")
+    print(f"Model: {args.model if screener.model else 'none (rules only)'}")
+    for article, decision in excluded:
+        print(f"  {article.get('pmid', ''):>9}  {decision.rule:<16} {article.get('title', '')[:90]}")
+    if review:
+        print(f"{len(review)} kept records flagged for manual review ({exclusion_summary(review)})")
+        for article, decision in review:
+            print(f"  {article.get('pmid', ''):>9}  {decision.rule:<16} {article.get('title', '')[:90]}")
+    if args.output:
+        write_exclusions(excluded, args.output)
+        print(f"Exclusion log written to {args.output}")
+    if args.review_output:
+        write_exclusions(review, args.review_output)
+        print(f"Review list written to {args.review_output}")
+
+
+if __name__ == "__main__":
+    main()
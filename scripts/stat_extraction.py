@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+
+"""
+Extract reported statistics from abstract text in a single pass.
+
+Compiled grammars recognise effect estimates (OR, RR, HR, AUC, sensitivity,
+specificity), confidence intervals and p-values. Cheap literal searches
+find the places where a statistic can start and each grammar runs only
+there, so most of the text is never examined by the grammars. Matches are
+consumed left to right and each CI or p-value is linked to the estimate it
+follows, so "HR = 6.22, 95% CI 2.39-16.2, p < 0.001" yields one Estimate
+carrying all three.
+
+    python scripts/stat_extraction.py "adjusted odds ratio, 3.89; 95% confidence interval, 1.61-9.38"
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import Iterable, NamedTuple, Optional
+
+
+NUM = r"(?:\d+(?:\.\d+)?|\.\d+)"
+SIGNED_NUM = rf"[-−]?{NUM}"
+RANGE_SEP = r"\s*(?:[-–—‒]|to|,|;)\s*"
+
+# "sensitivity and specificity of 77.2% and 91.7%"
+PAIR_RE = re.compile(
+    rf"""
+    (?i:sensitivity\s+and\s+specificity)\s*(?:[:=,]|(?i:of|were|was))?\s*
+    (?P<sens>{NUM})\s*%?\s*(?:and|,|/)\s*(?P<spec>{NUM})\s*(?P<pct>%)?
+    """,
+    re.VERBOSE,
+)
+
+# "OR = 1.8", "hazard ratio (HR) 9.4", "AUC of 92%", "OR 1.8 (1.2-2.7)",
+# "the odds ratio for current smoking was 2.3". The bare OR/RR/HR symbols
+# take no word connector, since "OR" is also an upper-case conjunction;
+# next_statistic keeps them only with "="/":", an opening parenthesis
+# before them, or a CI right after the value.
+ESTIMATE_RE = re.compile(
+    rf"""
+    (?<![A-Za-z])
+    (?:
+        (?P<measure>
+            (?i:(?:adjusted\s+)?odds\s+ratio|relative\s+risk|risk\s+ratio|(?:adjusted\s+)?hazard\s+ratio
+              |area\s+under\s+the\s+(?:roc\s+|receiver\s+operating\s+characteristic\s+)?curve|sensitivity|specificity)
+            |AUROC|AUC
+        )\b
+        (?:\s*[\[(](?:a?OR|RR|a?HR|AUROC|AUC)[\])])?
+        (?:\s*[:=,]\s*
+          |\s*(?i:of|was|were|is)\s+
+          |\s+(?i:for)\s+(?:[A-Za-z][\w'/-]*\s+){{1,4}}?(?i:was|were|is|of)\s+
+          |\s+|(?=\d))
+      | (?P<symbol>a?OR|RR|a?HR)\b
+        (?:\s*(?P<separator>[:=])\s*|\s*,\s*|\s*(?i:of|was|were|is)\s+|\s+|(?=\d))
+    )
+    (?P<value>{NUM})\s*(?P<pct>%)?
+    (?:\s*[(\[]\s*(?P<bare_low>{NUM})\s*%?{RANGE_SEP}(?P<bare_high>{NUM})\s*%?\s*[)\]])?
+    """,
+    re.VERBOSE,
+)
+
+# A "95% CI" directly after a bare-symbol estimate
+ADJACENT_CI_RE = re.compile(r"\s*[,;(\[]?\s*\d{2}(?:\.\d+)?\s*%\s*(?i:CI|confidence\s+interval|credible\s+interval)")
+
+# "91.4% sensitivity"
+SUFFIX_RE = re.compile(rf"(?P<value>{NUM})\s*%\s*(?P<measure>(?i:sensitivity|specificity))")
+
+# "95% CI: 1.2-2.7", "95% confidence interval (CI) 1.3 to 70.3"
+CI_RE = re.compile(
+    rf"""
+    (?P<level>\d{{2}}(?:\.\d+)?)\s*%\s*(?i:CI|confidence\s+interval|credible\s+interval)
+    (?:\s*[\[(]CI[\])])?[\s:,=]*[\[(]?\s*
+    (?P<low>{SIGNED_NUM})\s*%?{RANGE_SEP}(?P<high>{SIGNED_NUM})
+    """,
+    re.VERBOSE,
+)
+
+# "p < 0.001", "P-value = 3.07E-16", "P = .02", "p = 2.1 × 10−5"
+P_VALUE_RE = re.compile(
+    rf"""
+    (?<![A-Za-z])(?:[Pp](?:\s*-?\s*values?)?)\s*
+    (?P<op><=|>=|≤|≥|<|>|=)\s*
+    (?P<value>{NUM}(?:\s*[eE]\s*[-−–]?\s*\d+|\s*[x×·]\s*10\s*[-−–]\s*\d+)?)
+    """,
+    re.VERBOSE,
+)
+
+# Backward checks from a "%" or comparison-operator anchor
+NUMBER_BEFORE_RE = re.compile(rf"(?<![\d.]){NUM}\s*$")
+P_BEFORE_RE = re.compile(r"(?<![A-Za-z])[Pp](?:\s*-?\s*values?)?\s*$")
+
+# Words that can start an estimate are located with str.find on the
+# lower-cased text; everything else with a literal-only pattern whose
+# alternatives all start with a plain character, so the regex engine skips
+# text that cannot match in C. The grammars above only run at these anchors.
+MEASURE_WORDS = ("adjusted", "odds", "relative", "risk", "hazard", "area", "sensitivity", "specificity")
+SYMBOL_ANCHORS = {
+    "AUROC": "measure",
+    "AUC": "measure",
+    "OR": "measure",
+    "RR": "measure",
+    "HR": "measure",
+    "%": "percent",
+    "<": "operator",
+    ">": "operator",
+    "=": "operator",
+    "≤": "operator",
+    "≥": "operator",
+}
+SYMBOL_ANCHOR_RE = re.compile("|".join(re.escape(anchor) for anchor in SYMBOL_ANCHORS))
+
+# Characters allowed between an estimate and the CI or p-value reported with it
+LINK_WINDOW = 40
+
+MEASURES = {
+    "odds ratio": "OR",
+    "or": "OR",
+    "aor": "OR",
+    "relative risk": "RR",
+    "risk ratio": "RR",
+    "rr": "RR",
+    "hazard ratio": "HR",
+    "hr": "HR",
+    "ahr": "HR",
+    "auc": "AUC",
+    "auroc": "AUC",
+    "sensitivity": "sensitivity",
+    "specificity": "specificity",
+}
+RATIO_MEASURES = ("OR", "RR", "HR")
+# Reported either as a proportion or as a percentage; stored as a proportion
+PROPORTION_MEASURES = ("AUC", "sensitivity", "specificity")
+
+
+@dataclass
+class Estimate:
+    measure: str
+    value: float
+    ci_lower: Optional[float] = None
+    ci_upper: Optional[float] = None
+    ci_level: Optional[float] = None
+    p_value: Optional[float] = None
+    p_operator: Optional[str] = None
+    start: int = 0
+    end: int = 0
+    scale: float = field(default=1.0, repr=False)
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "measure": self.measure,
+            "value": self.value,
+            "ci_lower": self.ci_lower,
+            "ci_upper": self.ci_upper,
+            "ci_level": self.ci_level,
+            "p_value": self.p_value,
+            "p_operator": self.p_operator,
+        }
+
+
+class PValue(NamedTuple):
+    operator: str
+    value: float
+
+
+class Statistics(NamedTuple):
+    estimates: list[Estimate]
+    p_values: list[PValue]  # every p-value in the text, linked to an estimate or not
+
+
+def canonical_measure(name: str) -> str:
+    key = " ".join(name.lower().split())
+    if key.startswith("adjusted "):
+        key = key[len("adjusted "):]
+    if key.startswith("area under"):
+        return "AUC"
+    return MEASURES[key]
+
+
+def parse_number(text: str) -> float:
+    text = "".join(text.split()).replace("−", "-").replace("–", "-").replace("×", "x").replace("·", "x")
+    if "x10" in text:
+        mantissa, _, exponent = text.partition("x10")
+        return float(mantissa) * 10 ** int(exponent)
+    return float(text)
+
+
+def make_estimate(measure: str, value: str, percent: bool, start: int, end: int) -> Optional[Estimate]:
+    number = parse_number(value)
+    scale = 1.0
+    if measure in PROPORTION_MEASURES and (percent or number > 1):
+        scale = 100.0
+    number = round(number / scale, 6)
+    if measure in PROPORTION_MEASURES:
+        if not 0 < number <= 1:
+            return None
+    elif not 0 < number < 1000:
+        return None
+    return Estimate(measure=measure, value=number, start=start, end=end, scale=scale)
+
+
+def set_interval(estimate: Estimate, low: str, high: str, level: Optional[float]) -> None:
+    lower = round(parse_number(low) / estimate.scale, 6)
+    upper = round(parse_number(high) / estimate.scale, 6)
+    if lower > upper:
+        lower, upper = upper, lower
+    estimate.ci_lower, estimate.ci_upper, estimate.ci_level = lower, upper, level
+
+
+def lower_in_place(text: str) -> str:
+    """text.lower(), except characters that lower-case to several are kept, so positions line up."""
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        lowered = "".join(char if len(char.lower()) != 1 else char.lower() for char in text)
+    return lowered
+
+
+def find_anchors(text: str) -> list[tuple[int, str]]:
+    """Sorted (position, kind) pairs where a statistic may start."""
+    anchors = []
+    for match in SYMBOL_ANCHOR_RE.finditer(text):
+        start = match.start()
+        # "aOR"/"aHR" (adjusted) start one character earlier
+        if start and text[start - 1] == "a" and match.group() in ("OR", "HR"):
+            start -= 1
+        anchors.append((start, SYMBOL_ANCHORS[match.group()]))
+
+    lowered = lower_in_place(text)
+    for word in MEASURE_WORDS:
+        position = lowered.find(word)
+        while position != -1:
+            anchors.append((position, "measure"))
+            position = lowered.find(word, position + 1)
+
+    anchors.sort()
+    return anchors
+
+
+def next_statistic(text: str, start: int, kind: str) -> tuple[str, Optional[re.Match]]:
+    """Match the statistic, if any, that the anchor at start belongs to."""
+    if kind == "measure":
+        match = PAIR_RE.match(text, start)
+        if match:
+            return "pair", match
+        match = ESTIMATE_RE.match(text, start)
+        if match and match.group("symbol") and not (
+            match.group("separator")
+            or match.group("bare_low")
+            or (start and text[start - 1] in "([")
+            or ADJACENT_CI_RE.match(text, match.end())
+        ):
+            return "estimate", None
+        return "estimate", match
+    if kind == "percent":
+        number = NUMBER_BEFORE_RE.search(text, max(0, start - 24), start)
+        if number is None:
+            return "", None
+        match = CI_RE.match(text, number.start())
+        if match:
+            return "ci", match
+        return "suffix", SUFFIX_RE.match(text, number.start())
+    prefix = P_BEFORE_RE.search(text, max(0, start - 16), start)
+    if prefix is None:
+        return "", None
+    return "p", P_VALUE_RE.match(text, prefix.start())
+
+
+def extract_statistics(text: str) -> Statistics:
+    """All effect estimates in text, each linked to the CI and p-value that follow it."""
+    estimates: list[Estimate] = []
+    p_values: list[PValue] = []
+    current: Optional[Estimate] = None
+    consumed = 0
+
+    for start, anchor_kind in find_anchors(text):
+        if start < consumed:
+            continue
+        kind, match = next_statistic(text, start, anchor_kind)
+        if match is None:
+            continue
+        consumed = match.end()
+
+        if kind == "estimate" or kind == "suffix":
+            current = make_estimate(
+                canonical_measure(match.group("measure") or match.group("symbol")),
+                match.group("value"),
+                kind == "suffix" or bool(match.group("pct")),
+                match.start(),
+                match.end(),
+            )
+            if current is not None:
+                if kind == "estimate" and match.group("bare_low"):
+                    set_interval(current, match.group("bare_low"), match.group("bare_high"), None)
+                estimates.append(current)
+        elif kind == "pair":
+            percent = "%" in match.group()
+            pair = [
+                make_estimate("sensitivity", match.group("sens"), percent, match.start(), match.end()),
+                make_estimate("specificity", match.group("spec"), percent, match.start(), match.end()),
+            ]
+            estimates.extend(estimate for estimate in pair if estimate is not None)
+            current = None
+        elif kind == "ci":
+            if current is not None and current.ci_lower is None and match.start() - current.end <= LINK_WINDOW:
+                set_interval(current, match.group("low"), match.group("high"), float(match.group("level")))
+                current.end = match.end()
+        else:
+            try:
+                p_value = PValue(match.group("op"), parse_number(match.group("value")))
+            except ValueError:
+                continue
+            if not 0 <= p_value.value <= 1:
+                continue
+            p_values.append(p_value)
+            if current is not None and current.p_value is None and match.start() - current.end <= LINK_WINDOW:
+                current.p_value, current.p_operator = p_value.value, p_value.operator
+                current.end = match.end()
+
+    return Statistics(estimates, p_values)
+
+
+def first_estimate(estimates: Iterable[Estimate], measures: Iterable[str]) -> Optional[Estimate]:
+    wanted = set(measures)
+    return next((estimate for estimate in estimates if estimate.measure in wanted), None)
+
+
+def primary_estimate(estimates: list[Estimate]) -> Optional[Estimate]:
+    """The first ratio estimate reported with a CI, else the first ratio estimate."""
+    ratios = [estimate for estimate in estimates if estimate.measure in RATIO_MEASURES]
+    return next((estimate for estimate in ratios if estimate.ci_lower is not None), ratios[0] if ratios else None)
+
+
+if __name__ == "__main__":
+    statistics = extract_statistics(" ".join(sys.argv[1:]) or sys.stdin.read())
+    for estimate in statistics.estimates:
+        print(estimate)
+    print(f"p-values: {[f'{p.operator}{p.value:g}' for p in statistics.p_values]}")